@@ -0,0 +1,5 @@
+# Scripts da aula 21 (ISP, CEAPS, Senado e vereadores).
+# Eles importam o pacote ferramentas, que fica na raiz do repositório: rode-os da
+# raiz como módulos, sem mexer no sys.path em cada script, ex.:
+#   python -m aula_21.exemplo3 --lote paineis_regioes
+#   python -m aula_21.testesenadores04
@@ -6,6 +6,8 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from tabulate import tabulate
 
+from ferramentas.moeda import converter_moeda_br
+
 # Subsídio e URLs de Dados Abertos
 SUBSIDIO_MENSAL = 46366.19
 URL_GASTOS = "https://seu_servidor/despesas_institucional.csv"
@@ -31,7 +33,7 @@ def tratar_gastos(df):
     df.columns = df.columns.str.strip().str.lower()
     df.rename(columns={"senador":"nome","valor_despesa":"valor"}, inplace=True)
     df = df[df["valor"].notna()]
-    df["valor"] = df["valor"].astype(str).str.replace(",",".").str.replace("r\\$","",regex=True).astype(float)
+    df["valor"] = converter_moeda_br(df["valor"])
     df["nome"] = df["nome"].str.title().str.strip()
     return df[["nome","valor"]]
 
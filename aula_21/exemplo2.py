@@ -1,23 +1,26 @@
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 
+from ferramentas.cubo_isp import carregar_cubo_cisp
+from ferramentas.estatisticas import descrever_distribuicao
+
 
 # ANÁLISE DE DADOS POR REGIÃO (MUNICÍPIO)
 try:
-    ENDERECO_DADOS = 'https://www.ispdados.rj.gov.br/Arquivos/BaseDPEvolucaoMensalCisp.csv'
-    df_ocorrencias = pd.read_csv(ENDERECO_DADOS, sep=';', encoding='iso-8859-1')
-    # localiza as linhas onde a coluna 'regiao', contém o texto "Grande Niter", 
-    # e seleciona a coluna 'regiao' dessas linhas.
-    df_ocorrencias.loc[df_ocorrencias['regiao'].str.contains('Grande Niter', na=False), 'regiao'] = 'Interior'
-
-    # Delimitando as variáveis - Incluir região ("p/ analisar por região")
-    df_roubo_veiculo = df_ocorrencias[['regiao', 'munic', 'roubo_veiculo']]
-    # df_roubo_veiculo = df_ocorrencias[['cisp', 'regiao', 'munic', 'roubo_veiculo']]
+    # Buscar a base de dados do ISP (Instituto de Segurança Pública)
+    # Ingestão incremental: só os meses novos do CSV são convertidos e somados ao cubo
+    cubo = carregar_cubo_cisp()
 
     # Agrupamento pelas variáveis qualitativas região e município | Totalizando as Var Quantitativas
-    df_roubo_veiculo = df_roubo_veiculo.groupby(['regiao', 'munic']).sum(['roubo_veiculo']).reset_index()
-    # df_roubo_veiculo = df_roubo_veiculo.groupby(['cisp', 'regiao', 'munic']).sum(['roubo_veiculo']).reset_index()
+    # As somas saem do cubo pré-agregado, sem percorrer as linhas mensais
+    df_roubo_veiculo = cubo.agregar(['regiao', 'munic'], 'roubo_veiculo')
+    # df_roubo_veiculo = cubo.agregar(['cisp', 'regiao', 'munic'], 'roubo_veiculo')
+
+    # localiza as linhas onde a coluna 'regiao', contém o texto "Grande Niter", 
+    # e seleciona a coluna 'regiao' dessas linhas.
+    df_roubo_veiculo.loc[df_roubo_veiculo['regiao'].str.contains('Grande Niter', na=False), 'regiao'] = 'Interior'
+    # Depois da troca o mesmo município pode aparecer duas vezes na região: soma de novo
+    df_roubo_veiculo = df_roubo_veiculo.groupby(['regiao', 'munic'], as_index=False)['roubo_veiculo'].sum()
 
     # Filtro por região
     df_regiao = df_roubo_veiculo[df_roubo_veiculo['regiao'] == 'Interior']
@@ -29,23 +32,24 @@ except Exception as e:
 try:
     array_roubo_veiculo = np.array(df_regiao['roubo_veiculo'])
 
-    media_roubo_veiculo = np.mean(array_roubo_veiculo)
-    mediana_roubo_veiculo = np.median(array_roubo_veiculo)
-    distancia_media_mediana = abs(media_roubo_veiculo - mediana_roubo_veiculo) / mediana_roubo_veiculo
+    # Medidas da região num só passe vetorizado (guardadas pela impressão digital dos dados)
+    medidas = descrever_distribuicao(df_regiao['roubo_veiculo'])
+
+    media_roubo_veiculo = medidas['media']
+    mediana_roubo_veiculo = medidas['mediana']
+    distancia_media_mediana = medidas['distancia_media_mediana']
 
     # Quartis
-    q1 = np.quantile(array_roubo_veiculo, 0.25)
-    q2 = np.quantile(array_roubo_veiculo, 0.50)
-    q3 = np.quantile(array_roubo_veiculo, 0.75)
+    q1, q2, q3 = medidas['q1'], medidas['q2'], medidas['q3']
     
     # IQR
-    iqr = q3 - q1
+    iqr = medidas['iqr']
 
     # limite inferior
-    limite_inferior = q1 - (iqr * 1.5)
+    limite_inferior = medidas['limite_inferior']
 
     # limite superior
-    limite_superior = q3 + (iqr * 1.5)
+    limite_superior = medidas['limite_superior']
 
     # menores roubos
     df_roubo_veiculo_menores = df_regiao[df_regiao['roubo_veiculo'] < q1]
@@ -54,17 +58,19 @@ try:
     df_roubo_veiculo_maiores = df_regiao[df_regiao['roubo_veiculo'] > q3]
 
     # Medidas de dispersão
-    maximo = np.max(array_roubo_veiculo)
-    minimo = np.min(array_roubo_veiculo)
-    amplitude_total = maximo - minimo
-
-    variancia = np.var(array_roubo_veiculo)
-    distancia_variancia_media = variancia / (media_roubo_veiculo ** 2)
-    desvio_padrao = np.std(array_roubo_veiculo)
-    coeficiente_variacao = desvio_padrao / media_roubo_veiculo
-
-    assimetria = df_roubo_veiculo['roubo_veiculo'].skew()
-    curtose = df_roubo_veiculo['roubo_veiculo'].kurtosis()
+    maximo = medidas['maximo']
+    minimo = medidas['minimo']
+    amplitude_total = medidas['amplitude_total']
+
+    variancia = medidas['variancia']
+    distancia_variancia_media = medidas['distancia_variancia_media']
+    desvio_padrao = medidas['desvio_padrao']
+    coeficiente_variacao = medidas['coeficiente_variacao']
+
+    # Assimetria e curtose do estado inteiro (todas as regiões), como antes
+    medidas_estado = descrever_distribuicao(df_roubo_veiculo['roubo_veiculo'])
+    assimetria = medidas_estado['assimetria']
+    curtose = medidas_estado['curtose']
     
     # outliers inferiores
     df_roubo_veiculo_outliers_inferiores = df_regiao[df_regiao['roubo_veiculo'] < limite_inferior]
@@ -1,22 +1,21 @@
 import pandas as pd
-import chardet  # Certifique-se de ter instalado com: pip install chardet
 import os
 
+from ferramentas.ceaps import detectar_dialeto, ler_csv_dados
+from ferramentas.moeda import converter_moeda_br
+
 caminho_ceaps = r"C:/Users/User/Documents/PauloSantos/aula_21/codigo/aula_21/gastos_ceaps_2022.csv"
 print("Arquivo CEAPS existe?", os.path.exists(caminho_ceaps))
 # Caminhos dos arquivos - ajuste conforme necessário
 caminho_ceaps = "C:/Users/User/Documents/PauloSantos/aula_21/codigo/aula_21/gastos_ceaps_2022.csv"
 caminho_inst = "C:/Users/User/Documents/PauloSantos/aula_21/codigo/aula_21/despesas_institucional.csv"
 
-def detectar_codificacao(file_path, n_bytes=10000):
-    with open(file_path, 'rb') as f:
-        rawdata = f.read(n_bytes)
-    result = chardet.detect(rawdata)
-    return result['encoding']
-
-def tentar_leitura(file_path, encoding, sep):
+def tentar_leitura(file_path):
+    # Encoding e separador detectados uma vez a partir do início do arquivo
+    dialeto = detectar_dialeto(file_path)
+    sep, encoding = dialeto['sep'], dialeto['encoding']
     try:
-        df = pd.read_csv(file_path, sep=sep, encoding=encoding, decimal=',')
+        df = ler_csv_dados(file_path)
         print(f"\nLeitura com separador '{sep}' e encoding '{encoding}' teve sucesso!")
         print(df.head(3))
         return df
@@ -26,19 +25,13 @@ def tentar_leitura(file_path, encoding, sep):
 
 def main():
     # Ler CEAPS
-    encoding_ceaps = detectar_codificacao(caminho_ceaps)
-    df_ceaps = tentar_leitura(caminho_ceaps, encoding_ceaps, sep=';')
-    if df_ceaps is None:
-        df_ceaps = tentar_leitura(caminho_ceaps, encoding_ceaps, sep=',')
+    df_ceaps = tentar_leitura(caminho_ceaps)
     if df_ceaps is None:
         print("Falha ao ler arquivo gastos_ceaps_2022.csv. Abortando.")
         return
 
     # Ler institucional
-    encoding_inst = detectar_codificacao(caminho_inst)
-    df_inst = tentar_leitura(caminho_inst, encoding_inst, sep=';')
-    if df_inst is None:
-        df_inst = tentar_leitura(caminho_inst, encoding_inst, sep=',')
+    df_inst = tentar_leitura(caminho_inst)
     if df_inst is None:
         print("Falha ao ler arquivo despesas_institucional.csv. Abortando.")
         return
@@ -53,12 +46,7 @@ def main():
     # df_inst.rename(columns={'Autor':'Autor', 'QtdeProposicoes':'QtdeProposicoes'}, inplace=True)
 
     # Tratar coluna VALOR_REEMBOLSADO do CEAPS para numérico
-    df_ceaps['VALOR_REEMBOLSADO'] = (
-        df_ceaps['VALOR_REEMBOLSADO']
-        .astype(str)
-        .str.replace(',', '.')
-        .astype(float)
-    )
+    df_ceaps['VALOR_REEMBOLSADO'] = converter_moeda_br(df_ceaps['VALOR_REEMBOLSADO'])
 
     # Tratar QtdeProposicoes no institucional para numérico
     df_inst['QtdeProposicoes'] = pd.to_numeric(df_inst['QtdeProposicoes'], errors='coerce')
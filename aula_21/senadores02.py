@@ -1,23 +1,17 @@
 import pandas as pd
 import os
-import chardet
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-def detectar_codificacao(file_path, n_bytes=10000):
-    with open(file_path, 'rb') as f:
-        rawdata = f.read(n_bytes)
-    resultado = chardet.detect(rawdata)
-    return resultado['encoding']
-
-def tentar_leitura_csv(caminho, encoding):
-    for sep in [';', ',']:
-        try:
-            df = pd.read_csv(caminho, encoding=encoding, sep=sep, decimal=',')
-            print(f"✔️ Leitura bem-sucedida com separador '{sep}'")
-            return df
-        except Exception as e:
-            print(f"❌ Falha com separador '{sep}': {e}")
+from ferramentas.ceaps import detectar_dialeto, ler_csv_dados
+
+def tentar_leitura_csv(caminho, dialeto):
+    try:
+        df = ler_csv_dados(caminho)
+        print(f"✔️ Leitura bem-sucedida com separador '{dialeto['sep']}'")
+        return df
+    except Exception as e:
+        print(f"❌ Falha com separador '{dialeto['sep']}': {e}")
     return None
 
 def carregar_dados(caminho_arquivo):
@@ -25,9 +19,9 @@ def carregar_dados(caminho_arquivo):
     if not os.path.exists(caminho_arquivo):
         print("❌ Arquivo não encontrado.")
         return None
-    encoding = detectar_codificacao(caminho_arquivo)
-    print(f"-> Detecção de encoding: {encoding}")
-    df = tentar_leitura_csv(caminho_arquivo, encoding)
+    dialeto = detectar_dialeto(caminho_arquivo)
+    print(f"-> Detecção de encoding: {dialeto['encoding']}")
+    df = tentar_leitura_csv(caminho_arquivo, dialeto)
     if df is not None:
         df.columns = df.columns.str.strip().str.lower()
         print(f"📊 {len(df)} linhas carregadas.")
@@ -6,6 +6,8 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from tabulate import tabulate
 
+from ferramentas.moeda import converter_moeda_br
+
 # constantes
 SUBSIDIO_MENSAL = 46366.19
 URL_GASTOS = "https://www12.senado.leg.br/dados-abertos/senadores/ceaps-2022.csv"
@@ -28,12 +30,7 @@ def tratar_gastos(df):
     df.columns = df.columns.str.strip().str.lower()
     df.rename(columns={"senador":"nome","valor_despesa":"valor"}, inplace=True)
     df = df[df["valor"].notna()]
-    df["valor"] = (
-        df["valor"].astype(str)
-        .str.replace(",",".")
-        .str.replace("r\\$","", regex=True)
-        .astype(float)
-    )
+    df["valor"] = converter_moeda_br(df["valor"])
     df["nome"] = df["nome"].str.title().str.strip()
     return df[["nome","valor"]]
 
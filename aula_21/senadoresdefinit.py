@@ -1,20 +1,11 @@
 import pandas as pd
 
+from ferramentas.moeda import converter_moeda_br
+
 # Caminhos dos arquivos
 arquivo_ceaps = r"C:\Users\User\Documents\PauloSantos\aula_21\codigo\aula_21\gastos_ceaps_2022.csv"
 arquivo_inst = r"C:\Users\User\Documents\PauloSantos\aula_21\codigo\aula_21\despesas_institucional.csv"
 
-# Função para converter valores monetários formatados em string (ex: '1.000,50') para float 1000.50
-def converte_valor(valor_str):
-    if pd.isna(valor_str):
-        return 0.0
-    # Remove pontos e troca vírgula por ponto
-    valor_str = str(valor_str).replace('.', '').replace(',', '.')
-    try:
-        return float(valor_str)
-    except:
-        return 0.0
-
 # 1) Carregar gastos_ceaps_2022.csv
 df_ceaps = pd.read_csv(arquivo_ceaps, delimiter=';', encoding='latin1')
 
@@ -22,7 +13,8 @@ df_ceaps = pd.read_csv(arquivo_ceaps, delimiter=';', encoding='latin1')
 df_ceaps['ANO'] = df_ceaps['ANO'].astype(str)
 df_ceaps['MÊS'] = df_ceaps['MÊS'].astype(str).str.zfill(2)  # zfill para garantir mês 01,02,...
 df_ceaps['DATA'] = pd.to_datetime(df_ceaps['DATA'], dayfirst=True, errors='coerce')
-df_ceaps['VALOR_REEMBOLSADO'] = df_ceaps['VALOR_REEMBOLSADO'].apply(converte_valor)
+# Valores monetários formatados em string (ex: '1.000,50') para float 1000.50, a coluna inteira de uma vez
+df_ceaps['VALOR_REEMBOLSADO'] = converter_moeda_br(df_ceaps['VALOR_REEMBOLSADO']).fillna(0.0)
 df_ceaps['SENADOR'] = df_ceaps['SENADOR'].astype(str).str.strip()
 
 # 2) Carregar despesas_institucional.csv
@@ -31,7 +23,7 @@ df_inst = pd.read_csv(arquivo_inst, delimiter=';', encoding='latin1')
 # Converter datas e valores
 df_inst['Data da Carga da Base'] = pd.to_datetime(df_inst['Data da Carga da Base'], dayfirst=True, errors='coerce')
 for col in ['Valor dotaÃ§Ã£o inicial', 'Valor dotaÃ§Ã£o atualizada', 'Valor Total Empenhado', 'Valor Liquidado', 'Valor Pago']:
-    df_inst[col] = df_inst[col].apply(converte_valor)
+    df_inst[col] = converter_moeda_br(df_inst[col]).fillna(0.0)
 
 # --- Análise simples ---
 
@@ -1,20 +1,12 @@
-import chardet
 import pandas as pd
 import os
 
-def detectar_codificacao(file_path, n_bytes=10000):
-    with open(file_path, 'rb') as f:
-        rawdata = f.read(n_bytes)
-    result = chardet.detect(rawdata)
-    return result['encoding']
+from ferramentas.ceaps import ler_csv_dados
+from ferramentas.momentos import Momentos
 
 def ler_arquivo(file_path):
-    encoding = detectar_codificacao(file_path)
-    try:
-        df = pd.read_csv(file_path, sep=';', encoding=encoding, decimal=',')
-    except Exception:
-        df = pd.read_csv(file_path, sep=',', encoding=encoding, decimal=',')
-    return df
+    # Encoding e separador detectados uma vez; o arquivo é lido uma única vez
+    return ler_csv_dados(file_path)
 
 def analisar_despesas_ceaps(df):
     print("\n🔎 Análise de despesas do CEAPS por senador:")
@@ -43,8 +35,9 @@ def analisar_despesas_ceaps(df):
     resumo.columns = ['Total (R$)', 'Média por despesa', 'Desvio padrão', 'Qtd Despesas']
     resumo['Coef. Variação'] = resumo['Desvio padrão'] / resumo['Média por despesa']
 
-    media_geral = resumo['Total (R$)'].mean()
-    desvio_geral = resumo['Total (R$)'].std()
+    momentos = Momentos.de_valores(resumo['Total (R$)'])
+    media_geral = momentos.media
+    desvio_geral = momentos.desvio_padrao(amostral=True)  # ddof=1, como Series.std()
 
     resumo['Acima da média?'] = resumo['Total (R$)'] > media_geral + 2 * desvio_geral
     resumo['Pontuação de Eficiência'] = resumo['Média por despesa'] / resumo['Total (R$)']
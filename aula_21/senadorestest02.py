@@ -1,5 +1,7 @@
 import pandas as pd
 
+from ferramentas.moeda import converter_moeda_br
+
 # Caminhos absolutos dos arquivos
 arquivo_ceaps = r"C:\Users\User\Documents\PauloSantos\aula_21\codigo\aula_21\gastos_ceaps_2022.csv"
 arquivo_institucional = r"C:\Users\User\Documents\PauloSantos\aula_21\codigo\aula_21\despesas_institucional.csv"
@@ -48,13 +50,7 @@ else:
 
 # Tratar coluna VALOR_REEMBOLSADO para float
 if 'VALOR_REEMBOLSADO' in df_ceaps.columns:
-    df_ceaps['VALOR_REEMBOLSADO'] = (
-        df_ceaps['VALOR_REEMBOLSADO']
-        .astype(str)
-        .str.replace('.', '', regex=False)
-        .str.replace(',', '.', regex=False)
-    )
-    df_ceaps['VALOR_REEMBOLSADO'] = pd.to_numeric(df_ceaps['VALOR_REEMBOLSADO'], errors='coerce').fillna(0.0)
+    df_ceaps['VALOR_REEMBOLSADO'] = converter_moeda_br(df_ceaps['VALOR_REEMBOLSADO']).fillna(0.0)
 else:
     print("❌ Coluna 'VALOR_REEMBOLSADO' não encontrada em df_ceaps.")
 
@@ -1,22 +1,29 @@
 import chardet
 import pandas as pd
 import os
-import requests
 import matplotlib.pyplot as plt
 import seaborn as sns
 from tabulate import tabulate
 
+from ferramentas.cache_http import CacheHTTP
+from ferramentas.coletor_http import criar_sessao
+from ferramentas.moeda import converter_moeda_br
+
 # constantes
 SUBSIDIO_MENSAL = 46366.19
 URL_GASTOS = "https://www12.senado.leg.br/dados-abertos/senadores/ceaps-2022.csv"
 URL_PRODUTIVIDADE = "https://www12.senado.leg.br/dados-abertos/senadores/projetos-2022.csv"
 
+# Os CSVs de 2022 não mudam mais: ficam 30 dias no cache antes de revalidar
+CACHE = CacheHTTP(ttl_padrao=30 * 24 * 3600)
+SESSAO = criar_sessao()
+
 def detectar_codificacao_bytes(content_bytes):
     return chardet.detect(content_bytes[:10000])['encoding']
 
 def baixar_csv(url):
     print(f"🔻 Baixando: {url}")
-    r = requests.get(url)
+    r = CACHE.get(SESSAO, url, timeout=120)
     r.raise_for_status()
     return r.content
 
@@ -28,12 +35,7 @@ def tratar_gastos(df):
     df.columns = df.columns.str.strip().str.lower()
     df.rename(columns={"senador":"nome","valor_despesa":"valor"}, inplace=True)
     df = df[df["valor"].notna()]
-    df["valor"] = (
-        df["valor"].astype(str)
-        .str.replace(",",".")
-        .str.replace("r\\$","", regex=True)
-        .astype(float)
-    )
+    df["valor"] = converter_moeda_br(df["valor"])
     df["nome"] = df["nome"].str.title().str.strip()
     return df[["nome","valor"]]
 
@@ -2,19 +2,14 @@
 # e as agrupe por senador e por faça as análises estatísticas necessárias para vermos se os senadores estão sendo eficientes ou não
 # na prestação de seus serviços e se estão gastando de forma correta o dinheiro público e se estão sendo transparentes com a população:
 
-import chardet
-import pandas as pd
 import os
 
-def detectar_codificacao(file_path, n_bytes=10000):
-    with open(file_path, 'rb') as f:
-        rawdata = f.read(n_bytes)
-    result = chardet.detect(rawdata)
-    return result['encoding']
+from ferramentas.ceaps import detectar_dialeto, ler_csv_dados
 
-def tentar_leitura(file_path, encoding, sep):
+def tentar_leitura(file_path, dialeto):
+    sep, encoding = dialeto['sep'], dialeto['encoding']
     try:
-        df = pd.read_csv(file_path, sep=sep, encoding=encoding, decimal=',')
+        df = ler_csv_dados(file_path)
         print(f"\nLeitura com separador '{sep}' e encoding '{encoding}' teve sucesso!")
         print(df.head(3))
         return True
@@ -32,15 +27,13 @@ def main():
         print(f"Caminho completo: {path}")
 
         try:
-            encoding = detectar_codificacao(path)
-            print(f"Detecção automática de encoding: {encoding}")
+            dialeto = detectar_dialeto(path)
+            print(f"Detecção automática de encoding: {dialeto['encoding']} (separador '{dialeto['sep']}')")
         except FileNotFoundError as e:
             print(f"Arquivo não encontrado: {e}")
             continue
 
-        sucesso = tentar_leitura(path, encoding, sep=';')
-        if not sucesso:
-            tentar_leitura(path, encoding, sep=',')
+        tentar_leitura(path, dialeto)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
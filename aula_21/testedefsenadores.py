@@ -1,22 +1,25 @@
-import pandas as pd
+import os
 from tabulate import tabulate
 
+from ferramentas.acervo_ceaps import acervo_existe, consultar_ceaps, ingerir_ceaps
+
 # Caminho do arquivo CEAPS
-arquivo_ceaps = r"C:\Users\User\Documents\PauloSantos\aula_21\codigo\aula_21\gastos_ceaps_2022.csv"
+arquivo_ceaps = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gastos_ceaps_2022.csv")
 
-# Ler CSV - aqui pode precisar ajustar encoding/delimitador se der erro
-df_ceaps = pd.read_csv(arquivo_ceaps, delimiter=';', encoding='latin1')
+# Os CSVs anuais ficam no acervo Parquet (particionado por ANO/MES).
+# Para incluir outros anos: python -m ferramentas.acervo_ceaps ingerir <arquivos.csv>
+if not acervo_existe():
+    ingerir_ceaps([arquivo_ceaps])
 
-# Mostrar colunas para identificar os nomes corretos
-print("Colunas df_ceaps:", df_ceaps.columns.tolist())
+col_senador = 'SENADOR'
+col_valor = 'VALOR_REEMBOLSADO'
+col_ano = 'ANO'
 
-# Ajustar nomes de colunas importantes, caso necessário
-# Exemplo:
-# 'SENADOR', 'VALOR_REEMBOLSADO', 'ANO' podem ter nomes diferentes
-# Você deve substituir os nomes abaixo pelos que aparecem na sua tabela
-col_senador = 'SENADOR'  # ajuste se for diferente
-col_valor = 'VALOR_REEMBOLSADO'  # ajuste se for diferente
-col_ano = 'ANO'  # ajuste se for diferente
+# Lê do acervo só as colunas usadas, de todos os anos ingeridos
+df_ceaps = consultar_ceaps(colunas=[col_senador, col_ano, col_valor])
+
+# Mostrar colunas para conferir
+print("Colunas df_ceaps:", df_ceaps.columns.tolist())
 
 # Verificar se colunas existem
 missing_cols = [c for c in [col_senador, col_valor, col_ano] if c not in df_ceaps.columns]
@@ -24,8 +27,8 @@ if missing_cols:
     print(f"❌ Colunas faltando: {missing_cols}")
     print("Revise os nomes das colunas e ajuste no código.")
 else:
-    # Converter coluna de valor para numérico (retirando possíveis caracteres)
-    df_ceaps[col_valor] = pd.to_numeric(df_ceaps[col_valor].astype(str).str.replace(',', '.').str.replace('[^0-9.]', '', regex=True), errors='coerce').fillna(0)
+    # Valores já chegam numéricos do acervo; despesas sem valor contam como zero
+    df_ceaps[col_valor] = df_ceaps[col_valor].fillna(0)
 
     # Agrupar por senador e ano, somando os valores
     df_gastos = df_ceaps.groupby([col_senador, col_ano])[col_valor].sum().reset_index()
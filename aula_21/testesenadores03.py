@@ -1,23 +1,15 @@
-import chardet
 import pandas as pd
 import os
 import matplotlib.pyplot as plt
 import seaborn as sns
 from tabulate import tabulate
 
-def detectar_codificacao(file_path, n_bytes=10000):
-    with open(file_path, 'rb') as f:
-        rawdata = f.read(n_bytes)
-    result = chardet.detect(rawdata)
-    return result['encoding']
+from ferramentas.ceaps import ler_csv_dados
+from ferramentas.moeda import converter_moeda_br
 
 def ler_csv_com_melhor_separador(file_path):
-    encoding = detectar_codificacao(file_path)
-    try:
-        df = pd.read_csv(file_path, sep=';', encoding=encoding)
-    except:
-        df = pd.read_csv(file_path, sep=',', encoding=encoding)
-    return df
+    # Encoding e separador detectados uma vez; o arquivo é lido uma única vez
+    return ler_csv_dados(file_path, decimal='.')
 
 def limpar_e_padronizar(df, nome_arquivo):
     df.columns = df.columns.str.strip().str.lower()
@@ -40,14 +32,7 @@ def limpar_e_padronizar(df, nome_arquivo):
     df.rename(columns={col_valor: "valor_liquidado"}, inplace=True)
 
     df = df[df["valor_liquidado"].notna()]
-    df["valor_liquidado"] = (
-        df["valor_liquidado"]
-        .astype(str)
-        .str.replace(",", ".")
-        .str.replace("R\\$", "", regex=True)
-        .str.replace(" ", "")
-        .astype(float)
-    )
+    df["valor_liquidado"] = converter_moeda_br(df["valor_liquidado"])
     
     df["nome"] = df["nome"].astype(str).str.strip().str.title()
     return df[["nome", "valor_liquidado"]]
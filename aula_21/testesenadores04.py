@@ -1,25 +1,17 @@
-import chardet
 import pandas as pd
 import os
 import matplotlib.pyplot as plt
 import seaborn as sns
 from tabulate import tabulate
 
-SUBSIDIO_MENSAL = 46366.19
+from ferramentas.ceaps import ler_csv_dados
+from ferramentas.moeda import converter_moeda_br
 
-def detectar_codificacao(file_path, n_bytes=10000):
-    with open(file_path, 'rb') as f:
-        rawdata = f.read(n_bytes)
-    result = chardet.detect(rawdata)
-    return result['encoding']
+SUBSIDIO_MENSAL = 46366.19
 
 def ler_csv_com_melhor_separador(file_path):
-    encoding = detectar_codificacao(file_path)
-    try:
-        df = pd.read_csv(file_path, sep=';', encoding=encoding)
-    except:
-        df = pd.read_csv(file_path, sep=',', encoding=encoding)
-    return df
+    # Encoding e separador detectados uma vez; o arquivo é lido uma única vez
+    return ler_csv_dados(file_path, decimal='.')
 
 def limpar_e_padronizar(df, nome_arquivo):
     df.columns = df.columns.str.strip().str.lower()
@@ -39,14 +31,7 @@ def limpar_e_padronizar(df, nome_arquivo):
 
     # Trata valores
     df = df[df["valor_despesa"].notna()]
-    df["valor_despesa"] = (
-        df["valor_despesa"]
-        .astype(str)
-        .str.replace(",", ".")
-        .str.replace("R\\$", "", regex=True)
-        .str.replace(" ", "")
-        .astype(float)
-    )
+    df["valor_despesa"] = converter_moeda_br(df["valor_despesa"])
     df["nome"] = df["nome"].astype(str).str.strip().str.title()
 
     return df[["nome", "valor_despesa"]]
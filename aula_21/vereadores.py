@@ -7,6 +7,8 @@ from PIL import Image
 import re
 import os
 
+from ferramentas.laudo import linhas_laudo
+
 # === Estilo dos gráficos
 sns.set(style="whitegrid")
 
@@ -52,20 +54,7 @@ def montar_df_completo(produtividade_df, gastos_df):
 # === 3. Laudo
 def gerar_laudo(df):
     print("\n📋 LAUDO DE EFICIÊNCIA PARLAMENTAR - VEREADORES DE NITERÓI:\n")
-    for _, row in df.iterrows():
-        if row['Projetos de Lei'] >= 20 and pd.notnull(row['Custo por Projeto (R$)']) and row['Custo por Projeto (R$)'] < 10000:
-            categoria = '🟢 Altamente Eficiente'
-        elif row['Projetos de Lei'] <= 5 and row['Gastos Totais (R$)'] > 100000:
-            categoria = '🔴 Gastos Elevados, Baixa Produção'
-        elif row['Projetos de Lei'] == 0:
-            categoria = '⚫ Inoperante'
-        else:
-            categoria = '🟡 Regular'
-
-        custo_fmt = f"R$ {row['Custo por Projeto (R$)']:.2f}" if pd.notnull(row['Custo por Projeto (R$)']) else "N/A"
-
-        print(f"{row['Nome']} ({row['Partido']}): {categoria} | Projetos: {row['Projetos de Lei']}, "
-              f"Gasto: R$ {row['Gastos Totais (R$)']:.2f}, Custo/Projeto: {custo_fmt}")
+    print("\n".join(linhas_laudo(df, col_gastos='Gastos Totais (R$)', identificacao=('Partido',))))
 
 # === 4. Análise Estatística
 def analise_estatistica(df):
@@ -0,0 +1,4 @@
+# Benchmarks dos pipelines de análise (carga, agrupamento, estatística, laudo e
+# painéis) sobre dados sintéticos no formato das bases do ISP e do Senado.
+#   python -m benchmarks --linhas 1e5 1e6
+#   python -m benchmarks --comparar
@@ -0,0 +1,168 @@
+# Linha de comando dos benchmarks
+# Os arquivos sintéticos ficam em <cache do ISP>/benchmarks/dados (gerados uma vez
+# por tamanho e semente) e cada execução é acrescentada, como uma linha JSON, em
+# <cache do ISP>/benchmarks/resultados.jsonl, para comparar com as anteriores.
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+
+import numpy as np
+import pandas as pd
+from tabulate import tabulate
+
+from benchmarks.casos import CASOS
+from benchmarks.geradores import GERADORES
+from benchmarks.medicao import medir
+from ferramentas.cache_isp import PASTA_CACHE
+
+PASTA_BENCHMARKS = os.path.join(PASTA_CACHE, "benchmarks")
+ARQUIVO_RESULTADOS = os.path.join(PASTA_BENCHMARKS, "resultados.jsonl")
+
+
+def _inteiro(texto):
+    # Aceita "100000", "1e5" e "100_000"
+    return int(float(texto.replace("_", "")))
+
+
+def preparar_arquivos(linhas, semente=0):
+    """Caminhos dos arquivos sintéticos com `linhas` linhas, gerando os que faltam."""
+    pasta = os.path.join(PASTA_BENCHMARKS, "dados")
+    os.makedirs(pasta, exist_ok=True)
+    arquivos = {}
+    for nome, (gerar, prefixo) in GERADORES.items():
+        caminho = os.path.join(pasta, f"{prefixo}_{linhas}_s{semente}.csv")
+        if not os.path.exists(caminho):
+            print(f"Gerando {os.path.basename(caminho)}...")
+            temporario = caminho + ".tmp"
+            gerar(temporario, linhas, semente=semente)
+            os.replace(temporario, caminho)
+        arquivos[nome] = caminho
+    return arquivos
+
+
+def _commit():
+    try:
+        saida = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                               text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        return saida.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def executar_casos(linhas, nomes, semente=0, repeticoes=3):
+    arquivos = preparar_arquivos(linhas, semente)
+    resultados = {}
+    for nome in nomes:
+        preparar, unidade = CASOS[nome]
+        print(f"  {nome}...", flush=True)
+        resultado = medir(preparar(arquivos, linhas), repeticoes)
+        resultado["unidade"] = unidade
+        resultados[nome] = resultado
+    return {
+        "quando": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "linhas": linhas,
+        "semente": semente,
+        "repeticoes": repeticoes,
+        "casos": resultados,
+    }
+
+
+def gravar_execucao(execucao):
+    os.makedirs(PASTA_BENCHMARKS, exist_ok=True)
+    with open(ARQUIVO_RESULTADOS, "a", encoding="utf-8") as f:
+        f.write(json.dumps(execucao, ensure_ascii=False) + "\n")
+
+
+def ler_execucoes():
+    if not os.path.exists(ARQUIVO_RESULTADOS):
+        return []
+    with open(ARQUIVO_RESULTADOS, encoding="utf-8") as f:
+        return [json.loads(linha) for linha in f if linha.strip()]
+
+
+def exibir_execucao(execucao):
+    print(f"\n{execucao['linhas']:,} linhas (semente {execucao['semente']}, "
+          f"commit {execucao['commit'] or '-'}, {execucao['quando']})")
+    dados = [[nome, r["segundos"], round(r["por_segundo"] or 0), r["unidade"], r["pico_rss_mb"], r["acrescimo_rss_mb"]]
+             for nome, r in execucao["casos"].items()]
+    print(tabulate(dados, headers=["Caso", "Segundos", "Itens/s", "Unidade", "Pico RSS (MB)", "Acréscimo (MB)"],
+                   tablefmt="grid", floatfmt=".3f", intfmt=","))
+    if not all(r["pico_isolado"] for r in execucao["casos"].values()):
+        print("Aviso: o pico de RSS é o do processo inteiro (sistema sem /proc/self/clear_refs).")
+
+
+def _razao(atual, anterior):
+    return atual / anterior if atual is not None and anterior else None
+
+
+def comparar_execucoes(execucoes, linhas=None):
+    """Compara a última execução (com `linhas`, se dado) com a anterior do mesmo tamanho."""
+    if linhas is not None:
+        execucoes = [e for e in execucoes if e["linhas"] == linhas]
+    if not execucoes:
+        print("Nenhuma execução registrada.")
+        return
+    atual = execucoes[-1]
+    anteriores = [e for e in execucoes[:-1] if e["linhas"] == atual["linhas"] and e["semente"] == atual["semente"]]
+    if not anteriores:
+        print(f"Só há uma execução com {atual['linhas']:,} linhas: nada para comparar.")
+        exibir_execucao(atual)
+        return
+    anterior = anteriores[-1]
+    print(f"\n{atual['linhas']:,} linhas: commit {anterior['commit'] or '-'} ({anterior['quando']}) "
+          f"-> {atual['commit'] or '-'} ({atual['quando']})")
+    dados = []
+    for nome, r in atual["casos"].items():
+        antes = anterior["casos"].get(nome)
+        if antes is None:
+            dados.append([nome, None, r["segundos"], None, None, r["pico_rss_mb"], None])
+            continue
+        dados.append([nome, antes["segundos"], r["segundos"], _razao(r["segundos"], antes["segundos"]),
+                      antes["pico_rss_mb"], r["pico_rss_mb"], _razao(r["pico_rss_mb"], antes["pico_rss_mb"])])
+    print(tabulate(dados, headers=["Caso", "Antes (s)", "Agora (s)", "Razão tempo",
+                                   "Antes (MB)", "Agora (MB)", "Razão pico"],
+                   tablefmt="grid", floatfmt=".3f", missingval="-"))
+    print("Razão < 1: a versão atual é mais rápida / usa menos memória.")
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Benchmarks dos pipelines sobre dados sintéticos.")
+    parser.add_argument("--linhas", type=_inteiro, nargs="+",
+                        help="linhas de cada base sintética (ex.: 1e5 1e6 1e7; padrão: 1e5)")
+    parser.add_argument("--casos", nargs="+", choices=sorted(CASOS), metavar="CASO",
+                        help="casos a rodar (padrão: todos)")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--listar", action="store_true", help="lista os casos e sai")
+    parser.add_argument("--comparar", action="store_true",
+                        help="compara a última execução registrada com a anterior, sem rodar nada")
+    opcoes = parser.parse_args(argumentos)
+
+    if opcoes.listar:
+        for nome, (_, unidade) in CASOS.items():
+            print(f"{nome} ({unidade})")
+        return
+    if opcoes.comparar:
+        for tamanho in opcoes.linhas or [None]:
+            comparar_execucoes(ler_execucoes(), tamanho)
+        return
+
+    nomes = opcoes.casos or list(CASOS)
+    for linhas in opcoes.linhas or [100_000]:
+        print(f"\n=== {linhas:,} linhas")
+        execucao = executar_casos(linhas, nomes, opcoes.semente, opcoes.repeticoes)
+        gravar_execucao(execucao)
+        exibir_execucao(execucao)
+    print(f"\nResultados acrescentados em {ARQUIVO_RESULTADOS}")
+
+
+if __name__ == "__main__":
+    main()
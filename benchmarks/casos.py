@@ -0,0 +1,169 @@
+# Casos do benchmark: carga, agrupamento, estatística descritiva, classificação e
+# renderização. Cada caso recebe os arquivos sintéticos e o número de linhas deles,
+# prepara fora da medição o que não faz parte dele (ex.: a base já carregada) e
+# devolve a função medida, que retorna quantos itens processou.
+import io
+
+import numpy as np
+import pandas as pd
+
+from ferramentas.ceaps import ler_csv_dados
+from ferramentas.cubo_isp import CuboISP, construir_cubo
+from ferramentas.esboco_quantis import EsbocoQuantis
+from ferramentas.esquema_isp import ESQUEMA_CISP, ESQUEMA_UPP, aplicar_esquema, tipos_leitura
+from ferramentas.estatisticas import estatisticas_por_grupo, extremos_por_grupo
+from ferramentas.laudo import COL_CUSTO, COL_GASTOS, COL_PROJETOS, classificar, linhas_laudo
+from ferramentas.leitura_em_blocos import somar_upp
+from ferramentas.momentos import Momentos
+
+CASOS = {}
+
+
+def caso(nome, unidade="linhas"):
+    def registrar(funcao):
+        CASOS[nome] = (funcao, unidade)
+        return funcao
+    return registrar
+
+
+def _ler_isp(caminho, esquema):
+    df = pd.read_csv(caminho, sep=";", encoding="iso-8859-1", dtype=tipos_leitura(esquema))
+    return aplicar_esquema(df, esquema)
+
+
+# Bases carregadas uma vez por arquivo, para os casos que não medem a carga
+_bases = {}
+
+
+def _base(arquivos, nome):
+    caminho = arquivos[nome]
+    if caminho not in _bases:
+        _bases.clear()
+        _bases[caminho] = _ler_isp(caminho, ESQUEMA_CISP if nome == "cisp" else ESQUEMA_UPP)
+    return _bases[caminho]
+
+
+# === 1. Carga
+
+@caso("carga_cisp")
+def _carga_cisp(arquivos, linhas):
+    return lambda: len(_ler_isp(arquivos["cisp"], ESQUEMA_CISP))
+
+
+@caso("carga_upp")
+def _carga_upp(arquivos, linhas):
+    return lambda: len(_ler_isp(arquivos["upp"], ESQUEMA_UPP))
+
+
+@caso("carga_upp_em_blocos")
+def _carga_upp_em_blocos(arquivos, linhas):
+    # Soma por UPP lendo o CSV em blocos: o pico de memória não cresce com a base
+    def executar():
+        somar_upp("recuperacao_veiculos", endereco=arquivos["upp"])
+        return linhas
+    return executar
+
+
+@caso("carga_ceaps")
+def _carga_ceaps(arquivos, linhas):
+    return lambda: len(ler_csv_dados(arquivos["ceaps"]))
+
+
+@caso("carga_institucional")
+def _carga_institucional(arquivos, linhas):
+    return lambda: len(ler_csv_dados(arquivos["institucional"], tipos={}))
+
+
+# === 2. Agrupamento
+
+@caso("cubo_cisp")
+def _cubo_cisp(arquivos, linhas):
+    df = _base(arquivos, "cisp")
+
+    def executar():
+        cubo = CuboISP(construir_cubo(df))
+        cubo.agregar(["regiao", "munic"])
+        cubo.agregar("munic", "roubo_veiculo")
+        return len(df)
+    return executar
+
+
+# === 3. Estatística descritiva
+
+@caso("estatisticas_por_regiao")
+def _estatisticas_por_regiao(arquivos, linhas):
+    df = _base(arquivos, "cisp")
+
+    def executar():
+        estatisticas_por_grupo(df, "regiao", "roubo_veiculo")
+        return len(df)
+    return executar
+
+
+@caso("extremos_por_regiao")
+def _extremos_por_regiao(arquivos, linhas):
+    df = _base(arquivos, "cisp")
+    tabela = estatisticas_por_grupo(df, "regiao", "roubo_veiculo")
+
+    def executar():
+        extremos_por_grupo(df, "regiao", "roubo_veiculo", tabela)
+        return len(df)
+    return executar
+
+
+@caso("esboco_e_momentos")
+def _esboco_e_momentos(arquivos, linhas):
+    valores = _base(arquivos, "cisp")["roubo_veiculo"].to_numpy()
+
+    def executar():
+        EsbocoQuantis.de_valores(valores).limites()
+        Momentos.de_valores(valores).resumo()
+        return len(valores)
+    return executar
+
+
+# === 4. Classificação (laudo de eficiência)
+
+@caso("classificacao_laudo")
+def _classificacao_laudo(arquivos, linhas):
+    # Um "parlamentar" por despesa do CEAPS sintético, com projetos sorteados
+    ceaps = ler_csv_dados(arquivos["ceaps"], colunas=["SENADOR", "VALOR_DESPESA"])
+    projetos = np.random.default_rng(0).poisson(8, len(ceaps))
+    gastos = ceaps["VALOR_DESPESA"].fillna(0).to_numpy() * 100
+    df = pd.DataFrame({
+        "Nome": ceaps["SENADOR"].astype(str),
+        "UF": "RJ",
+        "Partido": "P",
+        COL_PROJETOS: projetos,
+        COL_GASTOS: gastos,
+        COL_CUSTO: np.where(projetos > 0, gastos / np.maximum(projetos, 1), np.nan),
+    })
+
+    def executar():
+        classificar(df)
+        return len(linhas_laudo(df))
+    return executar
+
+
+# === 5. Renderização (painéis do aula_21/exemplo3.py, sem janela)
+
+@caso("renderizacao_paineis", unidade="painéis")
+def _renderizacao_paineis(arquivos, linhas):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    from ferramentas.paineis import desenhar_painel
+
+    df = CuboISP(construir_cubo(_base(arquivos, "cisp"))).agregar(["munic", "cisp", "regiao"], "roubo_veiculo")
+    tabela = estatisticas_por_grupo(df, "regiao", "roubo_veiculo")
+    extremos = extremos_por_grupo(df, "regiao", "roubo_veiculo", tabela)
+    regioes = {regiao: parte for regiao, parte in df.groupby("regiao", sort=False)}
+    figura = Figure(figsize=(18, 10), dpi=100)
+    FigureCanvasAgg(figura)
+
+    def executar():
+        for regiao, medidas in tabela.iterrows():
+            desenhar_painel(figura, regiao, regioes[regiao], medidas, extremos=extremos[regiao])
+            figura.savefig(io.BytesIO(), format="png")
+        return len(tabela)
+    return executar
@@ -0,0 +1,272 @@
+# Geradores de dados sintéticos com o mesmo formato das bases usadas nos scripts
+# - BaseDPEvolucaoMensalCisp.csv  (ISP, mensal por delegacia)
+# - UppEvolucaoMensalDetitulos.csv (ISP, mensal por UPP)
+# - gastos_ceaps_2022.csv          (Senado, CEAPS)
+# - despesas_institucional.csv     (Senado, execução orçamentária)
+# Mesmas colunas, separador ';', encoding latin1 e vírgula decimal nos valores em R$.
+# Com a mesma semente (e o mesmo tamanho de bloco) o arquivo gerado é sempre o mesmo. O CSV é escrito em blocos,
+# então 10**8 linhas não precisam caber na memória.
+import math
+
+import numpy as np
+import pandas as pd
+
+TAMANHO_BLOCO = 500_000
+ENCODING = "latin1"
+# Os códigos de CISP/UPP são int16 no esquema do ISP: acima disso, crescem os meses
+MAXIMO_UNIDADES = 30_000
+ANO_INICIAL_CISP = 2003
+ANO_INICIAL_UPP = 2007
+
+MUNICIPIOS_POR_REGIAO = {
+    "Capital": ["Rio de Janeiro"],
+    "Baixada Fluminense": ["Nova Iguaçu", "Duque de Caxias", "Belford Roxo", "São João de Meriti",
+                           "Nilópolis", "Mesquita", "Queimados", "Japeri", "Magé", "Itaguaí"],
+    "Grande Niterói": ["Niterói", "São Gonçalo", "Maricá", "Itaboraí"],
+    "Interior": ["Campos dos Goytacazes", "Macaé", "Petrópolis", "Volta Redonda", "Resende",
+                 "Teresópolis", "Nova Friburgo", "Angra dos Reis", "Cabo Frio", "Barra Mansa"],
+}
+
+# Colunas de ocorrências e média mensal por unidade (Poisson)
+MEDIAS_CISP = {
+    "hom_doloso": 2.0, "lesao_corp_morte": 0.1, "latrocinio": 0.1, "cvli": 2.2,
+    "hom_por_interv_policial": 0.8, "letalidade_violenta": 3.0, "tentat_hom": 2.5,
+    "lesao_corp_dolosa": 40.0, "estupro": 3.0, "hom_culposo": 1.0, "lesao_corp_culposa": 20.0,
+    "roubo_transeunte": 30.0, "roubo_celular": 10.0, "roubo_em_coletivo": 4.0, "roubo_rua": 45.0,
+    "roubo_veiculo": 20.0, "roubo_carga": 4.0, "roubo_comercio": 3.0, "roubo_residencia": 1.0,
+    "roubo_banco": 0.05, "roubo_cx_eletronico": 0.05, "roubo_conducao_saque": 0.2,
+    "roubo_apos_saque": 0.3, "roubo_bicicleta": 0.5, "outros_roubos": 8.0, "total_roubos": 70.0,
+    "furto_veiculos": 10.0, "furto_transeunte": 20.0, "furto_coletivo": 2.0, "furto_celular": 8.0,
+    "furto_bicicleta": 1.5, "outros_furtos": 40.0, "total_furtos": 80.0, "sequestro": 0.05,
+    "extorsao": 1.0, "sequestro_relampago": 0.1, "estelionato": 25.0, "apreensao_drogas": 10.0,
+    "posse_drogas": 4.0, "trafico_drogas": 5.0, "apreensao_drogas_sem_autor": 2.0,
+    "recuperacao_veiculos": 12.0, "apf": 15.0, "aaapai": 2.0, "cmp": 6.0, "cmba": 1.0,
+    "ameaca": 35.0, "pessoas_desaparecidas": 3.0, "encontro_cadaver": 0.3, "encontro_ossada": 0.05,
+    "pol_militares_mortos_serv": 0.01, "pol_civis_mortos_serv": 0.005, "registro_ocorrencias": 600.0,
+}
+# Colunas que só passaram a ser registradas depois (ficam vazias antes deste ano)
+INICIO_REGISTRO_CISP = {"furto_celular": 2006, "roubo_bicicleta": 2015, "furto_bicicleta": 2015}
+
+UPPS = ["Santa Marta", "Cidade de Deus", "Batam", "Chapéu Mangueira / Babilônia", "Pavão-Pavãozinho",
+        "Tabajaras", "Providência", "Borel", "Formiga", "Andaraí", "Salgueiro", "Turano",
+        "São João / Matriz / Queto", "Coroa / Fallet / Fogueteiro", "Escondidinho / Prazeres",
+        "São Carlos", "Mangueira", "Macacos", "Vidigal", "Nova Brasília", "Fazendinha",
+        "Adeus / Baiana", "Alemão", "Chatuba", "Fé / Sereno", "Parque Proletário", "Vila Cruzeiro",
+        "Rocinha", "Jacarezinho", "Manguinhos", "Barreira do Vasco / Tuiuti", "Caju", "Cerro-Corá",
+        "Ararê / Mandela", "Lins", "Camarista Méier", "Mangueirinha", "Vila Kennedy"]
+MEDIAS_UPP = {
+    "hom_doloso": 0.2, "lesao_corp_morte": 0.02, "latrocinio": 0.02, "hom_por_interv_policial": 0.2,
+    "tentat_hom": 0.9, "lesao_corp_dolosa": 4.3, "estupro": 0.3, "hom_culposo": 0.05,
+    "lesao_corp_culposa": 1.0, "roubo_comercio": 0.1, "roubo_residencia": 0.05, "roubo_veiculo": 0.8,
+    "roubo_carga": 0.3, "roubo_transeunte": 1.4, "roubo_em_coletivo": 0.3, "roubo_banco": 0.01,
+    "roubo_cx_eletronico": 0.01, "roubo_celular": 0.4, "roubo_conducao_saque": 0.02,
+    "total_roubos": 4.0, "furto_veiculos": 0.4, "total_furtos": 3.9, "sequestro": 0.01,
+    "extorsao": 0.1, "sequestro_relampago": 0.01, "estelionato": 1.4, "apreensao_drogas": 2.4,
+    "recuperacao_veiculos": 1.4, "armas_apreendidas": 0.7, "cump_mandado_prisao": 0.5,
+    "ocorr_flagrante": 1.9, "ameaca": 2.9, "pessoas_desaparecidas": 0.4, "encontro_cadaver": 0.03,
+    "encontro_ossada": 0.01, "pol_militares_mortos_serv": 0.01, "pol_civis_mortos_serv": 0.005,
+    "registro_ocorrencias": 28.3,
+}
+
+COLUNAS_CEAPS = ["ANO", "MES", "SENADOR", "TIPO_DESPESA", "CNPJ_CPF", "FORNECEDOR", "DOCUMENTO",
+                 "DATA", "DETALHAMENTO", "VALOR_DESPESA", "COD_DOCUMENTO"]
+# Tipos de despesa do CEAPS e a proporção aproximada de cada um na base de 2022
+TIPOS_DESPESA_CEAPS = {
+    "Locomoção, hospedagem, alimentação, combustíveis e lubrificantes": 0.43,
+    "Aluguel de imóveis para escritório político, compreendendo despesas concernentes a eles.": 0.19,
+    "Passagens aéreas, aquáticas e terrestres nacionais": 0.19,
+    "Aquisição de material de consumo para uso no escritório político, inclusive aquisição ou locação de software, despesas postais, aquisição de publicações, locação de móveis e de equipamentos. ": 0.08,
+    "Contratação de consultorias, assessorias, pesquisas, trabalhos técnicos e outros serviços de apoio ao exercício do mandato parlamentar": 0.06,
+    "Divulgação da atividade parlamentar": 0.05,
+}
+PROPORCAO_NULOS_CEAPS = 0.05
+
+# Cabeçalho do arquivo do Senado, com a mistura de latin1 e UTF-8 do original
+COLUNAS_INSTITUCIONAL = [
+    "Data da Carga da Base", "Exercício_Financeiro (Lan-Ef)", "ação (código)", "Ação (nome)",
+    "Plano Orçamentário (código)", "Plano Orçamentário (nome)", "Grupo de Despesa ",
+    "Grupo de Despesa (nome)", "Resultado Lei (cÃ³digo)", "Resultado Lei (nome)",
+    "Modalidade de AplicaÃ§Ã£o (cÃ³digo)", "Modalidade de AplicaÃ§Ã£o (nome)", "Fonte (cÃ³digo)",
+    "Fonte (nome)", "Valor dotaÃ§Ã£o inicial", "Valor dotaÃ§Ã£o atualizada", "Valor Total Empenhado",
+    "Valor Liquidado", "Valor Pago",
+]
+GRUPOS_DESPESA = {1: "PESSOAL E ENCARGOS SOCIAIS", 3: "OUTRAS DESPESAS CORRENTES", 4: "INVESTIMENTOS",
+                  2: "JUROS E ENCARGOS DA DIVIDA", 5: "INVERSOES FINANCEIRAS", 6: "AMORTIZACAO DA DIVIDA"}
+RESULTADOS_LEI = {1: "PRIMARIO OBRIGATORIO", 2: "PRIMARIO DISCRICIONARIO", 0: "FINANCEIRO"}
+MODALIDADES = {90: "APLICACOES DIRETAS", 50: "TRANSFERENCIA INSTITUICOES PRIVADAS SEM FINS LUCRATIVOS",
+               91: "APLICACAO DIRETA DECORRENTE DE OPERACAO ENTRE ORGAOS", 80: "TRANSFERENCIAS AO EXTERIOR",
+               40: "TRANSFERENCIAS A MUNICIPIOS", 30: "TRANSFERENCIAS A ESTADOS E AO DISTRITO FEDERAL"}
+
+
+def _escrever_em_blocos(caminho, linhas, gerar_bloco, tamanho_bloco):
+    # gerar_bloco(inicio, fim) devolve o DataFrame das linhas [inicio, fim)
+    with open(caminho, "w", encoding=ENCODING, errors="replace", newline="") as f:
+        for inicio in range(0, max(linhas, 1), tamanho_bloco):
+            fim = min(inicio + tamanho_bloco, linhas)
+            bloco = gerar_bloco(inicio, fim)
+            bloco.to_csv(f, sep=";", index=False, header=inicio == 0, decimal=",")
+    return caminho
+
+
+def _rng(semente, inicio):
+    # Um gerador por bloco, derivado da semente e da posição do bloco: mesma semente
+    # e mesmo tamanho de bloco geram o mesmo arquivo
+    return np.random.default_rng([semente, inicio])
+
+
+def _contagens(rng, medias, n, fator):
+    return {coluna: rng.poisson(media * fator, n) for coluna, media in medias.items()}
+
+
+def _unidades(linhas, minimo, meses_tipicos):
+    # Quantas delegacias/UPPs: o número real para bases pequenas e mais unidades
+    # (até o limite do int16) quando o histórico ficaria longo demais
+    return int(min(MAXIMO_UNIDADES, max(minimo, math.ceil(linhas / meses_tipicos))))
+
+
+def gerar_cisp(caminho, linhas, semente=0, tamanho_bloco=TAMANHO_BLOCO):
+    """BaseDPEvolucaoMensalCisp.csv sintético com `linhas` linhas (delegacia × mês)."""
+    unidades = _unidades(linhas, 137, 12 * 22)
+    municipios = [(regiao, munic) for regiao, lista in MUNICIPIOS_POR_REGIAO.items() for munic in lista]
+    # A capital fica com metade das delegacias, como na base real
+    codigos = np.arange(1, unidades + 1)
+    indice_munic = np.where(codigos % 2 == 0, 0, 1 + codigos % (len(municipios) - 1))
+    regiao_cisp = np.array([municipios[i][0] for i in indice_munic], dtype=object)
+    munic_cisp = np.array([municipios[i][1] for i in indice_munic], dtype=object)
+    # Cada delegacia tem um "tamanho" fixo que multiplica todas as médias
+    fator_cisp = np.random.default_rng(semente).gamma(2.0, 0.5, unidades)
+
+    def bloco(inicio, fim):
+        rng = _rng(semente, inicio)
+        linha = np.arange(inicio, fim)
+        unidade, periodo = linha % unidades, linha // unidades
+        ano, mes = ANO_INICIAL_CISP + periodo // 12, periodo % 12 + 1
+        fator = fator_cisp[unidade]
+        df = pd.DataFrame({
+            "cisp": unidade + 1,
+            "mes": mes,
+            "ano": ano,
+            "mes_ano": pd.Series(ano).astype(str) + "m" + pd.Series(mes).astype(str).str.zfill(2),
+            "aisp": unidade % 41 + 1,
+            "risp": unidade % 7 + 1,
+            "munic": munic_cisp[unidade],
+            "mcirc": 3300000 + indice_munic[unidade] * 100,
+            "regiao": regiao_cisp[unidade],
+            **_contagens(rng, MEDIAS_CISP, len(linha), fator),
+            "fase": 3,
+        })
+        for coluna, ano_inicio in INICIO_REGISTRO_CISP.items():
+            # Int64 mantém a contagem inteira e escreve a célula vazia, como no original
+            df[coluna] = df[coluna].where(ano >= ano_inicio).astype("Int64")
+        return df
+
+    return _escrever_em_blocos(caminho, linhas, bloco, tamanho_bloco)
+
+
+def gerar_upp(caminho, linhas, semente=0, tamanho_bloco=TAMANHO_BLOCO):
+    """UppEvolucaoMensalDetitulos.csv sintético com `linhas` linhas (UPP × mês)."""
+    unidades = _unidades(linhas, len(UPPS), 12 * 18)
+    nomes = np.array(UPPS + [f"UPP {i}" for i in range(len(UPPS) + 1, unidades + 1)], dtype=object)
+    fator_upp = np.random.default_rng(semente).gamma(2.0, 0.5, unidades)
+
+    def bloco(inicio, fim):
+        rng = _rng(semente, inicio)
+        linha = np.arange(inicio, fim)
+        unidade, periodo = linha % unidades, linha // unidades
+        return pd.DataFrame({
+            "cod_upp": unidade + 1,
+            "upp": nomes[unidade],
+            "ano": ANO_INICIAL_UPP + periodo // 12,
+            "mes": periodo % 12 + 1,
+            **_contagens(rng, MEDIAS_UPP, len(linha), fator_upp[unidade]),
+        })
+
+    return _escrever_em_blocos(caminho, linhas, bloco, tamanho_bloco)
+
+
+def _reais_texto(valores):
+    # "1500", "342,5": formato dos valores do CEAPS
+    texto = pd.Series(np.round(valores, 2)).map("{:.2f}".format).str.replace(".", ",", regex=False)
+    return texto.str.replace(r",?0+$", "", regex=True).where(texto != "0,00", "0")
+
+
+def gerar_ceaps(caminho, linhas, semente=0, tamanho_bloco=TAMANHO_BLOCO, senadores=81, ano=2022):
+    """gastos_ceaps_2022.csv sintético: uma linha por despesa de senador."""
+    tipos = np.array(list(TIPOS_DESPESA_CEAPS), dtype=object)
+    pesos = np.array(list(TIPOS_DESPESA_CEAPS.values()))
+    pesos = pesos / pesos.sum()
+    nomes = np.array([f"SENADOR {i:03d}" for i in range(1, senadores + 1)], dtype=object)
+
+    def bloco(inicio, fim):
+        rng = _rng(semente, inicio)
+        n = fim - inicio
+        mes = rng.integers(1, 13, n)
+        dia = rng.integers(1, 29, n)
+        nulo = rng.random(n) < PROPORCAO_NULOS_CEAPS
+        valor = rng.lognormal(6.5, 1.2, n)
+        cnpj = rng.integers(10**13, 10**14, n).astype(str)
+        df = pd.DataFrame({
+            "ANO": ano,
+            "MES": mes,
+            "SENADOR": nomes[rng.integers(0, senadores, n)],
+            "TIPO_DESPESA": tipos[rng.choice(len(tipos), n, p=pesos)],
+            "CNPJ_CPF": pd.Series(cnpj).str.replace(r"(\d{2})(\d{3})(\d{3})(\d{4})(\d{2})",
+                                                    r"\1.\2.\3/\4-\5", regex=True),
+            "FORNECEDOR": pd.Series(rng.integers(1, 5000, n)).map("FORNECEDOR {} LTDA".format),
+            "DOCUMENTO": rng.integers(1, 10**6, n).astype(str),
+            "DATA": pd.Series(dia).astype(str).str.zfill(2) + "/" + pd.Series(mes).astype(str).str.zfill(2) + f"/{ano}",
+            "DETALHAMENTO": "Despesa sintética",
+            "VALOR_DESPESA": _reais_texto(valor),
+            "COD_DOCUMENTO": (np.arange(inicio, fim) + 2_000_000).astype(str),
+        })
+        # Linhas "null" como as do arquivo original (tipo de despesa sem lançamento)
+        df.loc[nulo, COLUNAS_CEAPS[4:]] = "null"
+        return df
+
+    return _escrever_em_blocos(caminho, linhas, bloco, tamanho_bloco)
+
+
+def gerar_institucional(caminho, linhas, semente=0, tamanho_bloco=TAMANHO_BLOCO):
+    """despesas_institucional.csv sintético: uma linha por ação/plano/fonte orçamentária."""
+    grupos, resultados, modalidades = (np.array(list(d)) for d in (GRUPOS_DESPESA, RESULTADOS_LEI, MODALIDADES))
+
+    def bloco(inicio, fim):
+        rng = _rng(semente, inicio)
+        n = fim - inicio
+        acao = rng.integers(0, 60, n)
+        grupo = grupos[rng.integers(0, len(grupos), n)]
+        resultado = resultados[rng.integers(0, len(resultados), n)]
+        modalidade = modalidades[rng.integers(0, len(modalidades), n)]
+        fonte = rng.integers(0, 16, n)
+        inicial = np.round(rng.lognormal(11, 2, n))
+        atualizada = np.round(inicial * rng.uniform(0.8, 1.2, n))
+        empenhado = np.round(atualizada * rng.uniform(0.5, 1.0, n), 2)
+        liquidado = np.round(empenhado * rng.uniform(0.7, 1.0, n), 2)
+        pago = np.round(liquidado * rng.uniform(0.9, 1.0, n), 2)
+        return pd.DataFrame(dict(zip(COLUNAS_INSTITUCIONAL, [
+            "26/06/2025",
+            rng.integers(2013, 2026, n),
+            pd.Series(acao).map("{:02d}PW".format),
+            pd.Series(acao).map("ACAO ORCAMENTARIA {}".format),
+            rng.integers(0, 30, n),
+            pd.Series(acao).map("PLANO ORCAMENTARIO {}".format),
+            grupo,
+            pd.Series(grupo).map(GRUPOS_DESPESA),
+            resultado,
+            pd.Series(resultado).map(RESULTADOS_LEI),
+            modalidade,
+            pd.Series(modalidade).map(MODALIDADES),
+            fonte,
+            pd.Series(fonte).map("FONTE DE RECURSOS {}".format),
+            inicial, atualizada, empenhado, liquidado, pago,
+        ])))
+
+    return _escrever_em_blocos(caminho, linhas, bloco, tamanho_bloco)
+
+
+GERADORES = {
+    "cisp": (gerar_cisp, "BaseDPEvolucaoMensalCisp"),
+    "upp": (gerar_upp, "UppEvolucaoMensalDetitulos"),
+    "ceaps": (gerar_ceaps, "gastos_ceaps_2022"),
+    "institucional": (gerar_institucional, "despesas_institucional"),
+}
@@ -0,0 +1,40 @@
+# Tempo e pico de memória (RSS) de um trecho de código
+# No Linux o pico é zerado antes de cada medição (/proc/self/clear_refs) e lido em
+# VmHWM, então vale só para o trecho medido. Onde isso não existe (macOS, Windows),
+# fica o pico do processo inteiro, via resource ou psutil, e a medição avisa.
+import gc
+import time
+
+from ferramentas.instrumentacao import pico_rss, rss_atual, zerar_pico_rss
+
+
+def medir(executar, repeticoes=3):
+    """Roda `executar()` `repeticoes` vezes e devolve o melhor tempo e o maior pico.
+
+    `executar` devolve quantos itens (linhas, painéis...) processou.
+    """
+    tempos, picos = [], []
+    pico_isolado = True
+    quantidade = 0
+    for _ in range(max(1, repeticoes)):
+        gc.collect()
+        pico_isolado = zerar_pico_rss() and pico_isolado
+        base = rss_atual()
+        inicio = time.perf_counter()
+        quantidade = executar()
+        tempos.append(time.perf_counter() - inicio)
+        pico = pico_rss()
+        if pico is not None:
+            picos.append((pico, base))
+
+    segundos = min(tempos)
+    pico, base = max(picos, key=lambda p: p[0]) if picos else (None, None)
+    return {
+        "quantidade": quantidade,
+        "segundos": segundos,
+        "por_segundo": quantidade / segundos if segundos > 0 else None,
+        "pico_rss_mb": pico / 2**20 if pico is not None else None,
+        # Quanto o trecho subiu além do que o processo já ocupava antes dele
+        "acrescimo_rss_mb": (pico - base) / 2**20 if pico is not None and base is not None else None,
+        "pico_isolado": pico_isolado,
+    }
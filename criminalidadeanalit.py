@@ -2,6 +2,8 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from tabulate import tabulate
+from ferramentas.cubo_isp import CuboISP, construir_cubo
+from ferramentas.series_mensais import INDICADORES_CRIMES, SeriesMensais
 
 # === 1. Leitura do arquivo ===
 arquivo_csv = "dados_criminais_rj.csv"  # renomeie conforme seu arquivo real
@@ -12,23 +14,30 @@ df.columns = df.columns.str.strip().str.lower()
 df['mes_ano'] = pd.to_datetime(df['mes_ano'], format='%Y%m')
 
 # === 3. Estatísticas descritivas por tipo de crime ===
-col_crimes = [
-    'hom_doloso', 'lesao_corp_morte', 'latrocinio', 'cvli', 'hom_por_interv_policial',
-    'letalidade_violenta', 'roubo_veiculo', 'roubo_celular', 'roubo_transeunte',
-    'furto_veiculos', 'furto_celular', 'estupro', 'sequestro', 'extorsao', 'estelionato'
-]
+col_crimes = INDICADORES_CRIMES
+
+# Cubo CISP × mês com a soma de todos os crimes; os agrupamentos abaixo saem dele
+cubo = CuboISP(construir_cubo(df, dimensoes=['cisp', 'mes_ano'], medidas=col_crimes),
+               dimensoes=['cisp', 'mes_ano'])
 
 # Agrupamento por CISP
-df_cisp = df.groupby('cisp')[col_crimes].sum().reset_index()
+df_cisp = cubo.agregar('cisp', col_crimes)
 
 # === 4. Exibe resumo por CISP ===
 print("\nResumo por CISP (Total de crimes):")
 print(tabulate(df_cisp, headers='keys', tablefmt='github', showindex=False))
 
 # === 5. Tendência temporal de letalidade violenta ===
+# Séries CISP × mês de todos os crimes num array só: médias móveis, variação anual
+# e tendência de todas as CISPs saem de operações sobre o array inteiro
+series = SeriesMensais.de_tabela(cubo.cubo, col_crimes, data='mes_ano')
+total_estado = series.total()
+
 plt.figure(figsize=(10, 5))
-df_mensal = df.groupby('mes_ano')['letalidade_violenta'].sum()
-df_mensal.plot()
+series.serie('letalidade_violenta').to_timestamp().plot(label='Mensal')
+series.serie('letalidade_violenta', array=series.movel(12, media=True, array=total_estado)).to_timestamp().plot(
+    label='Média móvel 12 meses')
+plt.legend()
 plt.title("Letalidade Violenta - Rio de Janeiro")
 plt.xlabel("Mês/Ano")
 plt.ylabel("Casos")
@@ -37,9 +46,21 @@ plt.tight_layout()
 plt.savefig("letalidade_violenta_temporal.png")
 plt.close()
 
+# Variação em relação ao mesmo mês do ano anterior (último mês da base), todos os crimes
+variacao = series.variacao_anual(array=total_estado)[:, -1]
+print(f"\nVariação anual ({series.meses[-1]} x {series.meses[-1] - 12}):")
+print(tabulate(zip(col_crimes, total_estado[:, -1], variacao), headers=['Crime', 'Casos no mês', 'Variação'],
+               tablefmt='github', floatfmt=".0f"))
+
+# Tendência dos últimos 24 meses (casos/mês) de cada crime em cada CISP
+tendencias = series.tendencias_por_unidade(ultimos=24)
+print("\nCISPs com maior alta de letalidade violenta (últimos 24 meses, casos/mês):")
+print(tabulate(tendencias['letalidade_violenta'].nlargest(10).reset_index(), headers=['CISP', 'Tendência'],
+               tablefmt='github', showindex=False, floatfmt=".2f"))
+
 # === 6. Gráfico de barras: Total de roubos por CISP ===
 plt.figure(figsize=(12, 6))
-df_cisp_sorted = df.groupby('cisp')['roubo_veiculo'].sum().sort_values(ascending=False)
+df_cisp_sorted = df_cisp.set_index('cisp')['roubo_veiculo'].sort_values(ascending=False)
 df_cisp_sorted.plot(kind='bar', color='tomato')
 plt.title("Total de Roubos de Veículos por CISP")
 plt.xlabel("CISP")
@@ -64,6 +85,7 @@ print(tabulate(desc[['mean', 'std', 'min', 'max', 'coef_var']], headers='keys',
 
 # === 9. Exporta tabelas para CSV ===
 df_cisp.to_csv("resumo_crimes_por_cisp.csv", index=False)
+tendencias.to_csv("tendencias_crimes_por_cisp.csv", index_label='cisp')
 desc.to_csv("estatisticas_crimes_geral.csv")
 
 print("\n✅ Análises concluídas. Gráficos e tabelas salvos no diretório.")
\ No newline at end of file
@@ -1,9 +1,13 @@
-# import streamlit as st
-# import pandas as pd
-# import plotly.express as px
-# import folium
-# from folium.plugins import MarkerCluster
-# from streamlit_folium import st_folium
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import streamlit.components.v1 as components
+
+from ferramentas.geo_cisp import IndiceEspacial, carregar_geodados
+from ferramentas.indice_filtros import IndiceFiltros
+from ferramentas.mapa_cisp import camada_cisp, renderizar_mapa
+
+COLUNAS_PAINEL = ['letalidade_violenta', 'roubo_veiculo', 'registro_ocorrencias']
 
 # ===== TÍTULO =====
 st.set_page_config(layout='wide')
@@ -17,71 +21,78 @@ def carregar_dados():
     df['mes_ano'] = pd.to_datetime(df['mes_ano'], format='%Ym%m', errors='coerce')
     return df
 
-df = carregar_dados()
+# Montado uma vez por sessão do servidor: linhas ordenadas por (ano, cisp) com o intervalo
+# de cada par e as somas por (ano, cisp, mês). Cada clique nos filtros só soma esse array
+# pequeno, sem filtrar nem agrupar a base inteira de novo
+@st.cache_resource
+def carregar_indice():
+    return IndiceFiltros(carregar_dados(), COLUNAS_PAINEL)
+
+indice = carregar_indice()
 
 # ===== SIDEBAR =====
 st.sidebar.header("🎛️ Filtros")
-ano = st.sidebar.multiselect("Ano", df['ano'].sort_values().unique(), default=df['ano'].max())
-cisp = st.sidebar.multiselect("CISP", df['cisp'].sort_values().unique(), default=df['cisp'].unique())
-
-# Aplicar filtros
-df_filtrado = df[(df['ano'].isin(ano)) & (df['cisp'].isin(cisp))]
+ano = st.sidebar.multiselect("Ano", indice.anos, default=indice.anos.max())
+cisp = st.sidebar.multiselect("CISP", indice.unidades, default=indice.unidades)
 
 # ===== MÉTRICAS AGREGADAS =====
+totais = indice.totais(ano, cisp)
 col1, col2, col3 = st.columns(3)
-col1.metric("Letalidade Violenta", int(df_filtrado["letalidade_violenta"].sum()))
-col2.metric("Roubos de Veículos", int(df_filtrado["roubo_veiculo"].sum()))
-col3.metric("Total de Ocorrências", int(df_filtrado["registro_ocorrencias"].sum()))
+col1.metric("Letalidade Violenta", int(totais["letalidade_violenta"]))
+col2.metric("Roubos de Veículos", int(totais["roubo_veiculo"]))
+col3.metric("Total de Ocorrências", int(totais["registro_ocorrencias"]))
 
 # ===== GRÁFICO DE TENDÊNCIA =====
 st.subheader("📈 Evolução Temporal - Letalidade Violenta")
-grafico_tendencia = df_filtrado.groupby('mes_ano')['letalidade_violenta'].sum().reset_index()
+grafico_tendencia = indice.serie_mensal(ano, cisp, 'mes_ano')[['mes_ano', 'letalidade_violenta']]
 fig = px.line(grafico_tendencia, x='mes_ano', y='letalidade_violenta', title='Letalidade Violenta ao longo do tempo')
 st.plotly_chart(fig, use_container_width=True)
 
 # ===== RANKING DE CISPs =====
 st.subheader("🏆 Ranking de CISPs por Ocorrências")
-ranking = df_filtrado.groupby("cisp")[['roubo_veiculo', 'letalidade_violenta', 'registro_ocorrencias']].sum().reset_index()
-ranking = ranking.sort_values(by="registro_ocorrencias", ascending=False)
+ranking = indice.ranking(ano, cisp, ordenar_por="registro_ocorrencias")
+ranking = ranking[['cisp', 'roubo_veiculo', 'letalidade_violenta', 'registro_ocorrencias']].reset_index(drop=True)
 st.dataframe(ranking, use_container_width=True)
 
 # ===== MAPA COM FOLIUM (opcional com coordenadas reais) =====
 st.subheader("🗺️ Mapa Interativo por CISP")
 
-# Exemplo com dados simulados de latitude e longitude
-# Substitua pelos dados reais
-coordenadas_cisp = {
-    1: [-22.9035, -43.2096],
-    2: [-22.9121, -43.2003],
-    4: [-22.9125, -43.1767],
-    5: [-22.8950, -43.2450],
-    6: [-22.8617, -43.2795],
-    7: [-22.8772, -43.3167],
-    9: [-22.8625, -43.2789],
-    10: [-22.8389, -43.3008],
-    12: [-22.8431, -43.3653],
-    19: [-22.9608, -43.2244]
-}
-
-m = folium.Map(location=[-22.9, -43.2], zoom_start=11)
-marker_cluster = MarkerCluster().add_to(m)
-
-for _, row in df_filtrado.iterrows():
-    cisp_id = row['cisp']
-    coord = coordenadas_cisp.get(cisp_id)
-    if coord:
-        folium.Marker(
-            location=coord,
-            popup=(
-                f"CISP: {cisp_id}<br>"
-                f"Letalidade: {row['letalidade_violenta']}<br>"
-                f"Roubos de Veículo: {row['roubo_veiculo']}<br>"
-                f"Ocorrências: {row['registro_ocorrencias']}"
-            ),
-            icon=folium.Icon(color="red", icon="info-sign")
-        ).add_to(marker_cluster)
-
-st_folium(m, width=1000, height=600)
+# Coordenadas do arquivo local de geodados (ferramentas/dados/cisp_geodados.csv), com
+# AISP, município e região de todas as CISPs da base e índice espacial em grade
+@st.cache_resource
+def carregar_geo():
+    geodados = carregar_geodados(base=carregar_dados())
+    return geodados, IndiceEspacial(geodados)
+
+geodados, indice_espacial = carregar_geo()
+
+ROTULOS_MAPA = {'cisp': 'CISP', 'letalidade_violenta': 'Letalidade',
+                'roubo_veiculo': 'Roubos de Veículo', 'registro_ocorrencias': 'Ocorrências'}
+
+# Um marcador por CISP com os totais do filtro (não um por linha mensal); o HTML de cada
+# combinação de filtros fica em cache e volta pronto quando ela se repete
+@st.cache_data(max_entries=64)
+def mapa_filtro(anos, cisps):
+    totais_cisp = indice.ranking(list(anos), list(cisps))
+    colecao = camada_cisp(totais_cisp, indice_espacial.tabela, COLUNAS_PAINEL)
+    return renderizar_mapa(colecao, rotulos=ROTULOS_MAPA), colecao['ausentes'], len(totais_cisp)
+
+html_mapa, ausentes, total_mapa = mapa_filtro(tuple(sorted(ano)), tuple(sorted(cisp)))
+if ausentes:
+    st.caption(f"{len(ausentes)} de {total_mapa} CISPs do filtro ainda sem coordenada no arquivo de "
+               f"geodados não aparecem no mapa: " + ", ".join(map(str, ausentes)))
+components.html(html_mapa, width=1000, height=600)
+
+# ===== CISP MAIS PRÓXIMA =====
+with st.sidebar.expander("📍 CISP mais próxima de um ponto"):
+    latitude = st.number_input("Latitude", value=-22.9068, format="%.4f")
+    longitude = st.number_input("Longitude", value=-43.1729, format="%.4f")
+    proxima = indice_espacial.mais_proximo(latitude, longitude)
+    if proxima is None:
+        st.write("Nenhuma CISP com coordenada.")
+    else:
+        linha, distancia = proxima
+        st.write(f"CISP {linha['cisp']} ({linha.get('munic', '')}) a {distancia:.1f} km")
 
 # ===== OBSERVAÇÕES =====
 st.info("📌 Este dashboard usa dados criminais agregados por CISP. Você pode adaptar para mostrar bairros, AISP ou meses específicos.")
@@ -1,133 +1,168 @@
 # fazer esse mesmo código só que agora para os vereadores da Câmara Municipal de Niterói:
+import os
 import requests
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from tabulate import tabulate
-import time
-
-# Estilo visual
-sns.set(style="whitegrid")
-BASE_URL = "https://dadosabertos.camara.leg.br/api/v2"
+from ferramentas.cache_http import CacheHTTP
+from ferramentas.coletor_http import ColetorHTTP, iterar_paginas
+from ferramentas.instrumentacao import etapa, instrumentar
+from ferramentas.laudo import linhas_laudo, salvar_laudo
+
+# A URL base pode ser trocada (ex.: servidor local de testes) pela variável CAMARA_BASE_URL
+BASE_URL = os.environ.get("CAMARA_BASE_URL", "https://dadosabertos.camara.leg.br/api/v2")
+
+# Validade (em segundos) das respostas guardadas no cache, por endpoint
+TTL_CAMARA = {
+    r"/deputados$": 24 * 3600,                 # lista de deputados
+    r"/proposicoes": 12 * 3600,                # projetos de lei
+    r"/deputados/\d+/despesas": 12 * 3600,     # cota parlamentar
+}
+
+# === 0. Coletor HTTP compartilhado (keep-alive, limite de taxa, novas tentativas e cache em disco)
+def criar_coletor(base_url=BASE_URL, max_workers=8, requisicoes_por_segundo=5, usar_cache=True):
+    cache = CacheHTTP(ttl_por_endpoint=TTL_CAMARA) if usar_cache else None
+    return ColetorHTTP(base_url, max_workers=max_workers, requisicoes_por_segundo=requisicoes_por_segundo, cache=cache)
 
 # === 1. Obter lista de deputados federais em exercício
-def get_deputados():
-    url = f"{BASE_URL}/deputados?itens=100&ordem=ASC&ordenarPor=nome"
-    r = requests.get(url)
-    data = r.json()
-    deputados = pd.DataFrame(data['dados'])
+def get_deputados(coletor):
+    r = coletor.get("deputados", params={"itens": 100, "ordem": "ASC", "ordenarPor": "nome"})
+    r.raise_for_status()
+    deputados = pd.DataFrame(r.json()['dados'])
     return deputados[['id', 'nome', 'siglaPartido', 'siglaUf', 'email']]
 
 # === 2. Obter quantidade de projetos de lei apresentados por cada deputado
-def get_projetos_por_deputado(deputado_id):
-    url = f"{BASE_URL}/proposicoes?autor={deputado_id}&siglaTipo=PL"
-    r = requests.get(url)
+def get_projetos_por_deputado(coletor, deputado_id):
+    r = coletor.get("proposicoes", params={"autor": deputado_id, "siglaTipo": "PL"})
     if r.status_code == 200:
         return len(r.json().get('dados', []))
     return 0
 
 # === 3. Obter gastos da cota parlamentar
-def get_gastos_por_deputado(deputado_id):
-    url = f"{BASE_URL}/deputados/{deputado_id}/despesas?itens=100"
-    r = requests.get(url)
-    if r.status_code == 200:
-        despesas = pd.DataFrame(r.json()['dados'])
-        return despesas['valorDocumento'].sum()
-    return 0
+# As despesas vêm paginadas (100 por página). Cada página é somada ao agregado
+# e descartada, então a memória não cresce com o número de despesas.
+class AgregadoDespesas:
+    def __init__(self):
+        self.soma = 0.0
+        self.quantidade = 0
+        self.por_tipo = {}
+
+    def adicionar(self, despesas):
+        for despesa in despesas:
+            valor = despesa.get('valorDocumento') or 0
+            tipo = despesa.get('tipoDespesa') or 'Não informado'
+            self.soma += valor
+            self.quantidade += 1
+            self.por_tipo[tipo] = self.por_tipo.get(tipo, 0.0) + valor
+
+def agregar_despesas_deputado(coletor, deputado_id, paralelo=False):
+    agregado = AgregadoDespesas()
+    paginas = iterar_paginas(coletor, f"deputados/{deputado_id}/despesas", params={"itens": 100}, paralelo=paralelo)
+    for despesas in paginas:
+        agregado.adicionar(despesas)
+    return agregado
+
+def get_gastos_por_deputado(coletor, deputado_id, paralelo=False):
+    try:
+        return agregar_despesas_deputado(coletor, deputado_id, paralelo=paralelo).soma
+    except requests.HTTPError:
+        return 0
 
 # === 4. Monta DataFrame com todas as informações
-def montar_df_completo(limite=30):
-    deputados = get_deputados().head(limite)
-    lista = []
-
-    for _, row in deputados.iterrows():
-        print(f"Processando: {row['nome']}")
-        time.sleep(0.5)
-        projetos = get_projetos_por_deputado(row['id'])
-        gastos = get_gastos_por_deputado(row['id'])
-
-        lista.append({
-            'Nome': row['nome'],
-            'Partido': row['siglaPartido'],
-            'UF': row['siglaUf'],
-            'Projetos de Lei': projetos,
-            'Gastos Cota Parlamentar (R$)': gastos,
-            'Custo por Projeto (R$)': gastos / projetos if projetos else None
+@instrumentar("download", pipeline="deputados")
+def montar_df_completo(limite=30, coletor=None, max_workers=8, requisicoes_por_segundo=5):
+    proprio = coletor is None
+    if proprio:
+        coletor = criar_coletor(max_workers=max_workers, requisicoes_por_segundo=requisicoes_por_segundo)
+
+    try:
+        deputados = get_deputados(coletor).head(limite).reset_index(drop=True)
+
+        # O DataFrame final já nasce com uma linha por deputado;
+        # as colunas de projetos e gastos são preenchidas conforme as respostas chegam
+        df_final = pd.DataFrame({
+            'Nome': deputados['nome'],
+            'Partido': deputados['siglaPartido'],
+            'UF': deputados['siglaUf'],
+            'Projetos de Lei': 0,
+            'Gastos Cota Parlamentar (R$)': 0.0,
         })
 
-    df_final = pd.DataFrame(lista)
+        def buscar(i):
+            deputado_id = deputados.at[i, 'id']
+            return get_projetos_por_deputado(coletor, deputado_id), get_gastos_por_deputado(coletor, deputado_id)
+
+        for i, (projetos, gastos) in coletor.mapear(buscar, deputados.index):
+            print(f"Processado: {deputados.at[i, 'nome']}")
+            df_final.at[i, 'Projetos de Lei'] = projetos
+            df_final.at[i, 'Gastos Cota Parlamentar (R$)'] = gastos
+    finally:
+        if proprio:
+            coletor.fechar()
+
+    projetos = df_final['Projetos de Lei']
+    df_final['Custo por Projeto (R$)'] = (df_final['Gastos Cota Parlamentar (R$)'] / projetos).where(projetos > 0)
     return df_final
 
 # === 5. Gera Laudo/Parecer
 def gerar_laudo(df):
     print("\n📋 LAUDO DE EFICIÊNCIA PARLAMENTAR:\n")
-    for _, row in df.iterrows():
-        if row['Projetos de Lei'] >= 20 and (row['Custo por Projeto (R$)'] is not None and row['Custo por Projeto (R$)'] < 10000):
-            categoria = '🟢 Altamente Eficiente'
-        elif row['Projetos de Lei'] <= 5 and row['Gastos Cota Parlamentar (R$)'] > 100000:
-            categoria = '🔴 Gastos Elevados, Baixa Produção'
-        elif row['Projetos de Lei'] == 0:
-            categoria = '⚫ Inoperante'
-        else:
-            categoria = '🟡 Regular'
-
-        custo = row['Custo por Projeto (R$)']
-        custo_fmt = f"R$ {custo:.2f}" if pd.notnull(custo) else "N/A"
-
-        print(f"{row['Nome']} ({row['UF']}/{row['Partido']}): {categoria} | Projetos: {row['Projetos de Lei']}, "
-              f"Gasto: R$ {row['Gastos Cota Parlamentar (R$)']:.2f}, Custo/Projeto: {custo_fmt}")
+    print("\n".join(linhas_laudo(df)))
 
 # === 6. Visualizações e estatísticas
-def analise_estatistica(df):
+# matplotlib e seaborn só são importados quando há gráfico (relatórios só em texto começam mais rápido)
+def analise_estatistica(df, graficos=True):
+    with etapa("calculo", "deputados", linhas=len(df)):
+        resumo = df.describe(include='all')
+        mais_gastam = df.sort_values(by='Gastos Cota Parlamentar (R$)', ascending=False).head(5)
+        mais_projetos = df.sort_values(by='Projetos de Lei', ascending=False).head(5)
+
     print("\n📊 Resumo Estatístico:")
-    print(tabulate(df.describe(include='all'), headers='keys', tablefmt='github'))
+    print(tabulate(resumo, headers='keys', tablefmt='github'))
 
     print("\n💰 Top 5 - Mais Gastam:")
-    print(tabulate(df.sort_values(by='Gastos Cota Parlamentar (R$)', ascending=False).head(5), headers='keys', tablefmt='github'))
+    print(tabulate(mais_gastam, headers='keys', tablefmt='github'))
 
     print("\n📜 Top 5 - Mais Projetos de Lei:")
-    print(tabulate(df.sort_values(by='Projetos de Lei', ascending=False).head(5), headers='keys', tablefmt='github'))
-
-    # Gráfico: Gastos vs Projetos
-    plt.figure(figsize=(10, 6))
-    sns.scatterplot(data=df, x='Projetos de Lei', y='Gastos Cota Parlamentar (R$)', hue='UF')
-    plt.title('Gastos x Projetos de Lei por Deputado')
-    plt.xlabel('Projetos de Lei')
-    plt.ylabel('Gastos (R$)')
-    plt.tight_layout()
+    print(tabulate(mais_projetos, headers='keys', tablefmt='github'))
+
+    if graficos:
+        graficos_deputados(df)
+
+def graficos_deputados(df):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # Estilo visual
+    sns.set(style="whitegrid")
+
+    # Gráfico: Gastos vs Projetos (a espera na janela do plt.show não entra na medição)
+    with etapa("renderizacao", "deputados", linhas=len(df), grafico="gastos x projetos"):
+        plt.figure(figsize=(10, 6))
+        sns.scatterplot(data=df, x='Projetos de Lei', y='Gastos Cota Parlamentar (R$)', hue='UF')
+        plt.title('Gastos x Projetos de Lei por Deputado')
+        plt.xlabel('Projetos de Lei')
+        plt.ylabel('Gastos (R$)')
+        plt.tight_layout()
     plt.show()
 
     # Gráfico: Custo por Projeto
-    plt.figure(figsize=(10, 6))
-    sns.histplot(df['Custo por Projeto (R$)'].dropna(), kde=True, bins=20)
-    plt.title('Distribuição do Custo por Projeto de Lei')
-    plt.xlabel('Custo por Projeto (R$)')
-    plt.tight_layout()
+    with etapa("renderizacao", "deputados", linhas=len(df), grafico="custo por projeto"):
+        plt.figure(figsize=(10, 6))
+        sns.histplot(df['Custo por Projeto (R$)'].dropna(), kde=True, bins=20)
+        plt.title('Distribuição do Custo por Projeto de Lei')
+        plt.xlabel('Custo por Projeto (R$)')
+        plt.tight_layout()
     plt.show()
 
 # === 7. Salvar o laudo em arquivo texto
 def salvar_laudo_em_txt(df, caminho="laudo_deputados.txt"):
-    with open(caminho, "w", encoding="utf-8") as f:
-        for _, row in df.iterrows():
-            if row['Projetos de Lei'] >= 20 and (row['Custo por Projeto (R$)'] is not None and row['Custo por Projeto (R$)'] < 10000):
-                categoria = '🟢 Altamente Eficiente'
-            elif row['Projetos de Lei'] <= 5 and row['Gastos Cota Parlamentar (R$)'] > 100000:
-                categoria = '🔴 Gastos Elevados, Baixa Produção'
-            elif row['Projetos de Lei'] == 0:
-                categoria = '⚫ Inoperante'
-            else:
-                categoria = '🟡 Regular'
-
-            custo = row['Custo por Projeto (R$)']
-            custo_fmt = f"R$ {custo:.2f}" if pd.notnull(custo) else "N/A"
-
-            f.write(f"{row['Nome']} ({row['UF']}/{row['Partido']}): {categoria} | Projetos: {row['Projetos de Lei']}, "
-                    f"Gasto: R$ {row['Gastos Cota Parlamentar (R$)']:.2f}, Custo/Projeto: {custo_fmt}\n")
+    salvar_laudo(linhas_laudo(df), caminho)
 
 # === 8. Separação e relatórios filtrados
 def gerar_relatorios_filtrados(df):
-    inoperantes = df[df['Projetos de Lei'] == 0]
-    alto_custo_baixa_producao = df[(df['Projetos de Lei'] <= 5) & (df['Gastos Cota Parlamentar (R$)'] > 100000)]
+    with etapa("calculo", "deputados", linhas=len(df)):
+        inoperantes = df[df['Projetos de Lei'] == 0]
+        alto_custo_baixa_producao = df[(df['Projetos de Lei'] <= 5) & (df['Gastos Cota Parlamentar (R$)'] > 100000)]
 
     print("\n🔎 RELATÓRIO - DEPUTADOS INOPERANTES (0 projetos):")
     print(tabulate(inoperantes, headers='keys', tablefmt='fancy_grid', showindex=False))
@@ -148,6 +183,7 @@ def gerar_relatorios_filtrados(df):
 
 # === Execução Principal
 if __name__ == "__main__":
+    # ISP_INSTRUMENTACAO=etapas.jsonl python deputadosfed.py  grava tempo/memória de cada etapa
     df = montar_df_completo(limite=30)  # Ajuste o limite conforme desejado
     analise_estatistica(df)
     gerar_laudo(df)
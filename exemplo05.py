@@ -1,25 +1,21 @@
 import matplotlib.pyplot as plt
-import pandas as pd
 import numpy as np
+from ferramentas.cubo_isp import carregar_cubo_cisp
+from ferramentas.estatisticas import descrever_distribuicao
 
 try:
     print("Obtendo dados...")
-    ENDERECO_DADOS = "https://www.ispdados.rj.gov.br/Arquivos/BaseDPEvolucaoMensalCisp.csv"
+    # Buscar a base de dados do ISP (Instituto de Segurança Pública)
+    # Ingestão incremental: só os meses novos do CSV são convertidos e somados ao cubo
+    cubo = carregar_cubo_cisp()
 
-    # Buscar a base de dados CSV online do site ISP (Instituto de Segurança Pública)
-    df_ocorrencias = pd.read_csv(ENDERECO_DADOS, sep=';', encoding='iso-8859-1')
+    # agrupando (a soma por região e município sai pronta do cubo)
+    df_roubo_veiculo = cubo.agregar(['regiao', 'munic'], 'roubo_veiculo')
 
-    df_ocorrencias.loc[df_ocorrencias['regiao'].str.contains('Grande Niter', na=False), 'regiao'] = 'Grande Niterói'
-    print(df_ocorrencias)
-
-    # delimitando as variáveis
-    
-    # df_roubo_veiculo = df_ocorrencias[['regiao', 'munic', 'roubo_veiculo']]
-    df_roubo_veiculo = df_ocorrencias[['regiao', 'munic', 'roubo_veiculo']]
-    
-    # agrupando
-
-    df_roubo_veiculo = df_roubo_veiculo.groupby(['regiao', 'munic']).sum(['roubo_veiculo']).reset_index()
+    df_roubo_veiculo.loc[df_roubo_veiculo['regiao'].str.contains('Grande Niter', na=False), 'regiao'] = 'Grande Niterói'
+    # As grafias diferentes da região viraram uma só: soma de novo os municípios repetidos
+    df_roubo_veiculo = df_roubo_veiculo.groupby(['regiao', 'munic'], as_index=False)['roubo_veiculo'].sum()
+    print(df_roubo_veiculo)
 
     df_regiao = df_roubo_veiculo[df_roubo_veiculo['regiao'] == 'Interior' ]
 
@@ -34,23 +30,25 @@ try:
     
     array_roubo_veiculo = np.array(df_regiao['roubo_veiculo'])
 
-    media_roubo_veiculo = np.mean(array_roubo_veiculo)
-    mediana_roubo_veiculo = np.median(array_roubo_veiculo)
-    distancia_media_mediana = abs(media_roubo_veiculo - mediana_roubo_veiculo) / mediana_roubo_veiculo
+    # Quartis exatos sobre os valores ordenados e momentos pelo Momentos, guardados
+    # pela impressão digital dos dados (variância/desvio populacionais, assimetria/curtose sem viés)
+    medidas = descrever_distribuicao(df_regiao['roubo_veiculo'])
+
+    media_roubo_veiculo = medidas['media']
+    mediana_roubo_veiculo = medidas['mediana']
+    distancia_media_mediana = medidas['distancia_media_mediana']
 
     # Quartis
-    q1 = np.quantile(array_roubo_veiculo, 0.25)
-    q2 = np.quantile(array_roubo_veiculo, 0.50)
-    q3 = np.quantile(array_roubo_veiculo, 0.75)
+    q1, q2, q3 = medidas['q1'], medidas['q2'], medidas['q3']
     
     # IQR
-    iqr = q3 - q1
+    iqr = medidas['iqr']
 
     # limite inferior
-    limite_inferior = q1 - (iqr * 1.5)
+    limite_inferior = medidas['limite_inferior']
 
     # limite superior
-    limite_superior = q3 + (iqr * 1.5)
+    limite_superior = medidas['limite_superior']
 
 
     # ***** IMPLEMENTAR AS LINHAS (ROUBOS MAIS E MENOS) *****
@@ -61,17 +59,17 @@ try:
     df_roubo_veiculo_maiores = df_regiao[df_regiao['roubo_veiculo'] > q3]
 
     # Medidas de dispersão
-    maximo = np.max(array_roubo_veiculo)
-    minimo = np.min(array_roubo_veiculo)
-    amplitude_total = maximo - minimo
+    maximo = medidas['maximo']
+    minimo = medidas['minimo']
+    amplitude_total = medidas['amplitude_total']
 
-    variancia = np.var(array_roubo_veiculo)
-    distancia_variancia_media = variancia / (media_roubo_veiculo ** 2)
-    desvio_padrao = np.std(array_roubo_veiculo)
-    coeficiente_variacao = desvio_padrao / media_roubo_veiculo
+    variancia = medidas['variancia']
+    distancia_variancia_media = medidas['distancia_variancia_media']
+    desvio_padrao = medidas['desvio_padrao']
+    coeficiente_variacao = medidas['coeficiente_variacao']
 
-    assimetria = df_regiao['roubo_veiculo'].skew()
-    curtose = df_regiao['roubo_veiculo'].kurtosis()
+    assimetria = medidas['assimetria']
+    curtose = medidas['curtose']
     
     # ***** IMPLEMENTAR AS LINHAS (OUTLIERS MAIORES E MENORES) *****
     # outliers inferiores
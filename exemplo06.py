@@ -1,22 +1,20 @@
 # Importa a biblioteca Matplotlib para criar os gráficos
 # pip install matplotlib
 import matplotlib.pyplot as plt
-import pandas as pd
 import numpy as np
+from ferramentas.cubo_isp import carregar_cubo_cisp
+from ferramentas.estatisticas import descrever_distribuicao
 
 
 try:
     print("Obtendo dados...")
-    ENDERECO_DADOS = "https://www.ispdados.rj.gov.br/Arquivos/BaseDPEvolucaoMensalCisp.csv"
+    # Buscar a base de dados do ISP (Instituto de Segurança Pública)
+    # Ingestão incremental: só os meses novos do CSV são convertidos e somados ao cubo
+    # de região/município/CISP/mês já guardado (ferramentas/cubo_isp.py)
+    cubo = carregar_cubo_cisp()
 
-    # Buscar a base de dados CSV online do site ISP (Instituto de Segurança Pública)
-    df_ocorrencias = pd.read_csv(ENDERECO_DADOS, sep=';', encoding='iso-8859-1')
-
-    # Demilitando somente as variáveis do Exemplo01: munic e roubo_veiculo
-    df_ocorrencias = df_ocorrencias[['munic', 'roubo_veiculo']]
-
-    # Totalizar roubo de veiculo por municipio (agrupar e somar)
-    df_roubo_veiculo = df_ocorrencias.groupby('munic').sum(['roubo_veiculo']).reset_index()
+    # Totalizar roubo de veiculo por municipio (agrupar e somar), direto do cubo
+    df_roubo_veiculo = cubo.agregar('munic', 'roubo_veiculo')
     print(df_roubo_veiculo.head())
 
 except Exception as e:
@@ -30,25 +28,29 @@ try:
 
     array_roubo_veiculo = np.array(df_roubo_veiculo['roubo_veiculo'])
 
+    # Quartis e limites exatos sobre os valores ordenados e média, variância,
+    # assimetria e curtose dos Momentos, num só passe (ferramentas/estatisticas.py).
+    # O resultado fica guardado pela impressão digital dos dados: o texto e o gráfico
+    # abaixo reaproveitam as mesmas medidas sem recalcular nada.
+    # Quartis pelo método 'weibull' (podemos usar o 'linear' também)
+    medidas = descrever_distribuicao(df_roubo_veiculo['roubo_veiculo'], metodo='weibull')
+
     # Obtendo média de roubo_veiculo
-    media_roubo_veiculo = np.mean(array_roubo_veiculo)
+    media_roubo_veiculo = medidas['media']
     # Obtendo mediana de roubo_veiculo
-    mediana_roubo_veiculo = np.median(array_roubo_veiculo)
+    mediana_roubo_veiculo = medidas['mediana']
     # Distânicia entre média e mediana
-    distancia = abs((media_roubo_veiculo-mediana_roubo_veiculo) / mediana_roubo_veiculo)
+    distancia = medidas['distancia_media_mediana']
 
 
     # QUARITIS
-    # Podemos emos usar o método 'linear' ou 'hazen' também.
-    q1 = np.quantile(array_roubo_veiculo, 0.25, method='weibull') # Q1 é 25% 
-    q2 = np.quantile(array_roubo_veiculo, 0.50, method='weibull') # Q2 é 50% (mediana)
-    q3 = np.quantile(array_roubo_veiculo, 0.75, method='weibull') # Q3 é 75%
+    q1, q2, q3 = medidas['q1'], medidas['q2'], medidas['q3'] # Q1 é 25%, Q2 é 50% (mediana), Q3 é 75%
 
 
     # A amplitude total é a diferença entre o maior e o menor valor de
-    maximo = np.max(array_roubo_veiculo)
-    minimo = np.min(array_roubo_veiculo)
-    amplitude_total = maximo - minimo
+    maximo = medidas['maximo']
+    minimo = medidas['minimo']
+    amplitude_total = medidas['amplitude_total']
 
     # OBTENDO OS MUNÍCIPIOS COM MAIORES E MONORES NÚMEROS DE ROUBOS DE VEÍCULOS
     # Filtramos os registros do DataFrame df_roubo_veiculo para achar os municípios com menores e maiores números de roubos de veículos.
@@ -58,27 +60,27 @@ try:
 
     # IQR (Intervalo interquartil)
     # É a amplitude do intervalo dos 50% dos dados centrais
-    iqr = q3 - q1
+    iqr = medidas['iqr']
 
-    # Limite superior: Vai identificar os outliers acima de q3
-    limite_superior = q3 + (1.5 * iqr)
+    # Limite superior: Vai identificar os outliers acima de q3 (q3 + 1.5 * iqr)
+    limite_superior = medidas['limite_superior']
 
-    # Limite inferior:  Vai identificar os outliers abaixo de q1
-    limite_inferior = q1 - (1.5 * iqr)
+    # Limite inferior:  Vai identificar os outliers abaixo de q1 (q1 - 1.5 * iqr)
+    limite_inferior = medidas['limite_inferior']
 
     # MEDIDAS DE DISPERSÃO
     # Indicam a variabilidade de um conjunto de dados em relação à média aritmética
-    # VARIÂNCIA: É a média dos quadrados das diferenças entre cada valor e a média
-    variancia = np.var(array_roubo_veiculo)
+    # VARIÂNCIA: É a média dos quadrados das diferenças entre cada valor e a média (populacional, como np.var)
+    variancia = medidas['variancia']
 
     # Distância da variância p/ média
-    distancia_var_media = variancia / (media_roubo_veiculo ** 2)
+    distancia_var_media = medidas['distancia_variancia_media']
 
     # Desvio padrão: Quanto os dados estão afastados da média (p/ mais ou p/ menos)
-    desvio_padrao = np.std(array_roubo_veiculo)
+    desvio_padrao = medidas['desvio_padrao']
 
     # Coeficiente de Variação: É a magnitude do desvio padrão
-    coef_variacao = desvio_padrao / media_roubo_veiculo
+    coef_variacao = medidas['coeficiente_variacao']
 
 
 
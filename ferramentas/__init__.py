@@ -0,0 +1,5 @@
+# Funções compartilhadas pelos scripts de análise (ISP, CEAPS, Câmara).
+# Os módulos são importados individualmente, ex.:
+#   from ferramentas.cache_isp import carregar_cisp
+# Relatórios pela linha de comando (início rápido, imports sob demanda):
+#   python -m ferramentas {cisp,upp,ceaps,deputados} --help
@@ -0,0 +1,225 @@
+# Linha de comando única para os relatórios (ISP, CEAPS e Câmara)
+#   python -m ferramentas cisp --coluna roubo_veiculo --ano 2023 --top 10
+#   python -m ferramentas upp --coluna recuperacao_veiculos --grafico upp.png
+#   python -m ferramentas ceaps aula_21/gastos_ceaps_2022.csv --por TIPO_DESPESA
+#   python -m ferramentas deputados --limite 30 --laudo laudo_deputados.txt
+#   python -m ferramentas atualizar cisp upp     (ingestão incremental, só os meses novos)
+#
+# Início rápido: aqui só se importa a biblioteca padrão. pandas e as ferramentas
+# entram quando o subcomando roda; matplotlib e seaborn só quando um gráfico é
+# pedido (--grafico, --paineis, --graficos). scipy não é usado. Um relatório só em
+# texto custa praticamente só o import do pandas.
+import argparse
+import os
+import sys
+
+# deputadosfed.py fica na raiz do repositório
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CEAPS_PADRAO = os.path.join(RAIZ, "aula_21", "gastos_ceaps_2022.csv")
+
+
+def _tabela(dados, titulo=None, **opcoes):
+    from tabulate import tabulate
+    if titulo:
+        print(f"\n{titulo}")
+    print(tabulate(dados, headers="keys", tablefmt="grid", floatfmt=".2f", **opcoes))
+
+
+def _medidas(medidas, titulo):
+    # Series de descrever_distribuicao -> tabela Medida | Valor
+    _tabela({"Medida": list(medidas.index), "Valor": list(medidas.to_numpy())}, titulo)
+
+
+def _figura(tamanho=(12, 5)):
+    # Figure sem pyplot: nenhuma janela, grava direto no arquivo
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    figura = Figure(figsize=tamanho, dpi=100)
+    FigureCanvasAgg(figura)
+    return figura
+
+
+# === cisp: totais por delegacia e medidas por região
+def cmd_cisp(args):
+    from ferramentas.cache_isp import carregar_csv_isp
+    from ferramentas.esquema_isp import ESQUEMA_CISP
+    from ferramentas.estatisticas import descrever_distribuicao
+    from ferramentas.incremental_isp import atualizar, carregar_base
+
+    colunas = list(dict.fromkeys(["cisp", "munic", args.por, args.coluna] + (["ano"] if args.ano else [])))
+    if args.endereco:
+        df = carregar_csv_isp(args.endereco, colunas=colunas, esquema=ESQUEMA_CISP)
+    else:
+        # Base do ISP pela ingestão incremental: só os meses novos são baixados e convertidos
+        atualizar("cisp")
+        df = carregar_base("cisp", colunas=colunas)
+    if args.ano:
+        df = df[df["ano"].isin(args.ano)]
+    grupos = list(dict.fromkeys(["cisp", "munic", args.por]))
+    totais = df.groupby(grupos, observed=True, sort=False)[args.coluna].sum().reset_index()
+    # Nomes (município, região) como texto comum, sem as categorias vazias do filtro
+    texto = [c for c in grupos if c != "cisp"]
+    totais[texto] = totais[texto].astype(str)
+
+    tabela = descrever_distribuicao(totais[args.coluna], por=totais[args.por])
+    _tabela(tabela[["n", "media", "mediana", "q1", "q3", "minimo", "maximo", "desvio_padrao",
+                    "qtd_outliers_superiores"]],
+            f"{args.coluna}: medidas dos totais por CISP, por {args.por}")
+    _tabela(totais.nlargest(args.top, args.coluna), f"Top {args.top} CISPs", showindex=False)
+
+    if args.mensal:
+        # Mesmas medidas sobre as linhas mensais: quartis exatos sobre os valores ordenados
+        mensal = descrever_distribuicao(df[args.coluna], por=df[args.por].astype(str))
+        _tabela(mensal[["n", "media", "mediana", "q1", "q3", "limite_superior", "desvio_padrao",
+                        "qtd_outliers_superiores"]],
+                f"{args.coluna}: medidas das linhas mensais (CISP × mês), por {args.por}")
+
+    if args.paineis:
+        from ferramentas.paineis import renderizar_paineis
+        renderizar_paineis(totais, tabela, args.paineis, grupo=args.por, valor=args.coluna,
+                           formatos=args.formatos)
+
+
+# === upp: soma por UPP (ingestão incremental, ou o CSV de --endereco lido em blocos)
+def cmd_upp(args):
+    from ferramentas.estatisticas import descrever_distribuicao
+    from ferramentas.esquema_isp import ESQUEMA_UPP
+    from ferramentas.incremental_isp import carregar_base, totais_atualizados
+    from ferramentas.leitura_em_blocos import descrever_em_blocos, somar_upp
+
+    # Sem --endereco, os totais por UPP vêm da ingestão incremental (somados mês a mês)
+    totais = somar_upp(args.coluna, endereco=args.endereco) if args.endereco \
+        else totais_atualizados("upp", args.coluna)
+    medidas = descrever_distribuicao(totais[args.coluna])
+    _medidas(medidas, f"{args.coluna}: medidas por UPP")
+    _tabela(totais.nlargest(args.top, args.coluna), f"Top {args.top} UPPs", showindex=False)
+
+    if args.mensal:
+        # Quartis exatos sobre as linhas da ingestão; o CSV de --endereco é lido em blocos,
+        # sem juntar as linhas, e aí os quartis saem do esboço de quantis
+        if args.endereco:
+            mensal = descrever_em_blocos(args.endereco, args.coluna, esquema=ESQUEMA_UPP)
+        else:
+            mensal = descrever_distribuicao(carregar_base("upp", colunas=[args.coluna])[args.coluna])
+        _medidas(mensal, f"{args.coluna}: medidas das linhas mensais (UPP × mês)")
+
+    if args.grafico:
+        figura = _figura()
+        ax1, ax2 = figura.subplots(1, 2)
+        ax1.hist(totais[args.coluna], bins=20, color="steelblue", edgecolor="black")
+        ax1.set_title(f"Histograma - {args.coluna}")
+        ax2.boxplot(totais[args.coluna], orientation="horizontal", showmeans=True)
+        ax2.set_title(f"Boxplot - {args.coluna}")
+        figura.tight_layout()
+        figura.savefig(args.grafico)
+        print(f"\nGráfico gravado em {args.grafico}")
+
+
+# === ceaps: total reembolsado por senador (ou tipo de despesa)
+def cmd_ceaps(args):
+    from ferramentas.ceaps import detectar_dialeto, ler_csv_dados
+    from ferramentas.estatisticas import descrever_distribuicao
+
+    # Os arquivos antigos do Senado trazem VALOR_DESPESA no lugar de VALOR_REEMBOLSADO
+    coluna = args.coluna
+    if coluna is None:
+        presentes = detectar_dialeto(args.arquivo)["colunas"]
+        coluna = "VALOR_REEMBOLSADO" if "VALOR_REEMBOLSADO" in presentes else "VALOR_DESPESA"
+
+    df = ler_csv_dados(args.arquivo, colunas=[args.por, coluna])
+    totais = (df.groupby(args.por, observed=True)[coluna].sum()
+              .sort_values(ascending=False).reset_index())
+    totais[args.por] = totais[args.por].astype(str)
+    _medidas(descrever_distribuicao(totais[coluna]), f"{coluna}: medidas por {args.por}")
+    _tabela(totais.head(args.top), f"Top {args.top} - {args.por}", showindex=False)
+
+
+# === deputados: coleta na API da Câmara e laudo de eficiência
+def cmd_deputados(args):
+    sys.path.insert(0, RAIZ)
+    import deputadosfed
+
+    df = deputadosfed.montar_df_completo(limite=args.limite)
+    deputadosfed.analise_estatistica(df, graficos=args.graficos)
+    deputadosfed.gerar_laudo(df)
+    if args.laudo:
+        deputadosfed.salvar_laudo_em_txt(df, args.laudo)
+        print(f"\nLaudo gravado em {args.laudo}")
+
+
+# === atualizar: ingestão incremental das bases do ISP (só os meses novos)
+def cmd_atualizar(args):
+    from ferramentas.incremental_isp import BASES, atualizar
+
+    if args.endereco and len(args.bases) != 1:
+        raise ValueError("--endereco só pode ser usado com uma base")
+    for nome in args.bases or sorted(BASES):
+        if nome not in BASES:
+            raise ValueError(f"base desconhecida: {nome} (use {', '.join(sorted(BASES))})")
+        resumo = atualizar(nome, args.endereco)
+        print(f"{nome}: {resumo['modo']} (marca {resumo['marca']}, {resumo['linhas_novas']} linhas novas)"
+              + (f" - {resumo['motivo']}" if resumo.get("motivo") else ""))
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(prog="python -m ferramentas",
+                                     description="Relatórios das bases do ISP, do CEAPS e da Câmara")
+    parser.add_argument("--instrumentar", metavar="ARQUIVO",
+                        help="grava tempo/memória de cada etapa (.jsonl ou .csv; '-' para a saída de erro)")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser("cisp", help="totais por delegacia e medidas por região")
+    p.add_argument("--coluna", default="roubo_veiculo")
+    p.add_argument("--por", default="regiao", help="regiao, munic, aisp...")
+    p.add_argument("--ano", type=int, nargs="+")
+    p.add_argument("--top", type=int, default=10)
+    p.add_argument("--endereco", help="URL ou caminho do CSV (padrão: base do ISP)")
+    p.add_argument("--mensal", action="store_true", help="medidas também sobre as linhas mensais")
+    p.add_argument("--paineis", metavar="PASTA", help="grava o painel de cada grupo (usa matplotlib)")
+    p.add_argument("--formatos", nargs="+", default=["png"])
+    p.set_defaults(executar=cmd_cisp)
+
+    p = sub.add_parser("upp", help="soma por UPP e medidas descritivas")
+    p.add_argument("--coluna", default="recuperacao_veiculos")
+    p.add_argument("--top", type=int, default=10)
+    p.add_argument("--endereco", help="URL ou caminho do CSV (padrão: base do ISP)")
+    p.add_argument("--mensal", action="store_true",
+                   help="medidas também sobre as linhas mensais (com --endereco, lidas em blocos e quartis pelo esboço)")
+    p.add_argument("--grafico", metavar="ARQUIVO", help="histograma e boxplot (usa matplotlib)")
+    p.set_defaults(executar=cmd_upp)
+
+    p = sub.add_parser("ceaps", help="total reembolsado por senador ou tipo de despesa")
+    p.add_argument("arquivo", nargs="?", default=CEAPS_PADRAO)
+    p.add_argument("--por", default="SENADOR")
+    p.add_argument("--coluna", help="padrão: VALOR_REEMBOLSADO (ou VALOR_DESPESA)")
+    p.add_argument("--top", type=int, default=10)
+    p.set_defaults(executar=cmd_ceaps)
+
+    p = sub.add_parser("deputados", help="coleta na API da Câmara e laudo de eficiência")
+    p.add_argument("--limite", type=int, default=30)
+    p.add_argument("--laudo", metavar="ARQUIVO", help="grava o laudo completo em texto")
+    p.add_argument("--graficos", action="store_true", help="mostra os gráficos (usa matplotlib/seaborn)")
+    p.set_defaults(executar=cmd_deputados)
+
+    p = sub.add_parser("atualizar", help="ingere só os meses novos das bases do ISP")
+    p.add_argument("bases", nargs="*", metavar="BASE", help="cisp, upp (padrão: as duas)")
+    p.add_argument("--endereco", help="URL ou caminho do CSV (só com uma base)")
+    p.set_defaults(executar=cmd_atualizar)
+    return parser
+
+
+def main(argumentos=None):
+    args = criar_parser().parse_args(argumentos)
+    if args.instrumentar:
+        from ferramentas.instrumentacao import configurar
+        configurar(saida=args.instrumentar, pipeline=args.comando)
+    try:
+        args.executar(args)
+    except Exception as e:
+        print(f"Erro no relatório {args.comando}: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+# Acervo multi-anual do CEAPS em Parquet particionado por ANO/MES
+# Os CSVs anuais do Senado são lidos uma vez e gravados em
+#   .cache_isp/acervo_ceaps/ANO=2022/MES=1/....parquet
+# As consultas leem só as partições (anos) e colunas pedidas.
+#
+# Uso pela linha de comando:
+#   python -m ferramentas.acervo_ceaps ingerir aula_21/gastos_ceaps_2022.csv outros/ceaps_2023.csv
+#   python -m ferramentas.acervo_ceaps consultar --de 2019 --ate 2023 SENADOR TIPO_DESPESA VALOR_REEMBOLSADO
+# pip install pyarrow
+import argparse
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from ferramentas.cache_isp import PASTA_CACHE
+from ferramentas.ceaps import ler_csv_dados
+from ferramentas.instrumentacao import instrumentar
+
+PASTA_ACERVO = os.path.join(PASTA_CACHE, "acervo_ceaps")
+PARTICOES = ["ANO", "MES"]
+
+# Nomes que mudaram ao longo dos anos nos arquivos do Senado (nome antigo -> atual);
+# só valem quando o arquivo ainda não traz a coluna com o nome atual
+RENOMEAR = {
+    "MÊS": "MES",
+    "VALOR_DESPESA": "VALOR_REEMBOLSADO",
+}
+
+
+def _padronizar(df):
+    df.columns = df.columns.str.strip().str.upper()
+    df = df.rename(columns={antigo: atual for antigo, atual in RENOMEAR.items() if atual not in df.columns})
+    df = df[df["ANO"].notna() & df["MES"].notna()]
+    df["ANO"] = df["ANO"].astype("int16")
+    df["MES"] = df["MES"].astype("int8")
+    for coluna in ("SENADOR", "TIPO_DESPESA"):
+        if coluna in df.columns:
+            df[coluna] = df[coluna].astype("string")
+    return df
+
+
+def ingerir_ceaps(arquivos, destino=PASTA_ACERVO):
+    """Converte CSVs anuais do CEAPS para o acervo Parquet. Reingerir um ano substitui as partições dele."""
+    total = 0
+    for arquivo in arquivos:
+        df = _padronizar(ler_csv_dados(arquivo))
+        tabela = pa.Table.from_pandas(df, preserve_index=False)
+        ds.write_dataset(
+            tabela,
+            destino,
+            format="parquet",
+            partitioning=PARTICOES,
+            partitioning_flavor="hive",
+            existing_data_behavior="delete_matching",
+            basename_template=f"{os.path.splitext(os.path.basename(arquivo))[0]}-{{i}}.parquet",
+        )
+        print(f"✔ {arquivo}: {len(df)} linhas, anos {sorted(df['ANO'].unique().tolist())}")
+        total += len(df)
+    return total
+
+
+def acervo_existe(destino=PASTA_ACERVO):
+    return os.path.isdir(destino) and any(n.startswith("ANO=") for n in os.listdir(destino))
+
+
+@instrumentar("leitura", pipeline="ceaps")
+def consultar_ceaps(de=None, ate=None, colunas=None, destino=PASTA_ACERVO):
+    """Lê do acervo só os anos entre `de` e `ate` (inclusive) e só as `colunas` pedidas."""
+    filtros = []
+    if de is not None:
+        filtros.append(("ANO", ">=", de))
+    if ate is not None:
+        filtros.append(("ANO", "<=", ate))
+    df = pd.read_parquet(destino, columns=colunas, filters=filtros or None,
+                         partitioning="hive")
+    # Colunas de partição voltam como categoria; devolve como inteiros
+    for coluna in PARTICOES:
+        if coluna in df.columns:
+            df[coluna] = df[coluna].astype(str).astype("int16" if coluna == "ANO" else "int8")
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Acervo Parquet multi-anual do CEAPS")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_ingerir = sub.add_parser("ingerir", help="converte CSVs anuais do CEAPS para o acervo")
+    p_ingerir.add_argument("arquivos", nargs="+")
+
+    p_consultar = sub.add_parser("consultar", help="total por senador e ano no intervalo pedido")
+    p_consultar.add_argument("--de", type=int)
+    p_consultar.add_argument("--ate", type=int)
+    p_consultar.add_argument("colunas", nargs="*")
+
+    args = parser.parse_args()
+    if args.comando == "ingerir":
+        ingerir_ceaps(args.arquivos)
+    else:
+        colunas = args.colunas or ["SENADOR", "ANO", "VALOR_REEMBOLSADO"]
+        df = consultar_ceaps(args.de, args.ate, colunas)
+        print(df)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# Cache em disco das respostas HTTP das APIs e arquivos de dados abertos
+# - chave: URL + parâmetros da consulta (em ordem alfabética)
+# - corpo guardado comprimido (gzip) e metadados em JSON
+# - TTL por endpoint: dentro do prazo a resposta sai do disco sem acessar a rede
+# - depois do prazo, GET condicional com If-None-Match / If-Modified-Since
+# - modo offline (DADOS_OFFLINE=1): só responde o que já está no cache
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from urllib.parse import urlencode
+
+import requests
+
+PASTA_CACHE_HTTP = os.environ.get(
+    "HTTP_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache_http"),
+)
+
+
+def modo_offline():
+    return os.environ.get("DADOS_OFFLINE", "").lower() in ("1", "true", "sim")
+
+
+class RespostaForaDoCache(requests.RequestException):
+    """Modo offline ativo e a URL pedida nunca foi baixada."""
+
+
+class CacheHTTP:
+    def __init__(self, pasta=PASTA_CACHE_HTTP, ttl_padrao=0, ttl_por_endpoint=None, offline=None):
+        # ttl_por_endpoint: {regex da URL: segundos}; vale o primeiro padrão que casar
+        self.pasta = pasta
+        self.ttl_padrao = ttl_padrao
+        self.ttl_por_endpoint = [(re.compile(p), ttl) for p, ttl in (ttl_por_endpoint or {}).items()]
+        self.offline = modo_offline() if offline is None else offline
+
+    def _ttl(self, url):
+        for padrao, ttl in self.ttl_por_endpoint:
+            if padrao.search(url):
+                return ttl
+        return self.ttl_padrao
+
+    def _caminhos(self, url, params):
+        chave_texto = url + ("?" + urlencode(sorted(params.items()), doseq=True) if params else "")
+        chave = hashlib.sha256(chave_texto.encode("utf-8")).hexdigest()
+        pasta = os.path.join(self.pasta, chave[:2])
+        return os.path.join(pasta, chave + ".json"), os.path.join(pasta, chave + ".gz")
+
+    def _ler(self, caminho_meta, caminho_corpo):
+        if not (os.path.exists(caminho_meta) and os.path.exists(caminho_corpo)):
+            return None
+        with open(caminho_meta, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _substituir(self, caminho, escrever):
+        # Temporário com nome único na mesma pasta: threads do mapear que baixam a mesma
+        # URL não escrevem no mesmo arquivo, e o os.replace final é atômico
+        descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(caminho), suffix=".tmp")
+        try:
+            with os.fdopen(descritor, "wb") as f:
+                escrever(f)
+            os.replace(temporario, caminho)
+        except BaseException:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+
+    def _gravar_meta(self, caminho_meta, meta):
+        self._substituir(caminho_meta, lambda f: f.write(json.dumps(meta).encode("utf-8")))
+
+    def _gravar(self, caminho_meta, caminho_corpo, resposta):
+        os.makedirs(os.path.dirname(caminho_meta), exist_ok=True)
+
+        def comprimir(f):
+            with gzip.GzipFile(fileobj=f, mode="wb", compresslevel=6) as g:
+                g.write(resposta.content)
+
+        self._substituir(caminho_corpo, comprimir)
+        self._gravar_meta(caminho_meta, {
+            "url": resposta.url,
+            "salvo_em": time.time(),
+            "etag": resposta.headers.get("ETag"),
+            "last_modified": resposta.headers.get("Last-Modified"),
+            "content_type": resposta.headers.get("Content-Type"),
+            "encoding": resposta.encoding,
+        })
+
+    def _resposta_do_cache(self, meta, caminho_corpo):
+        resposta = requests.Response()
+        with gzip.open(caminho_corpo, "rb") as f:
+            resposta._content = f.read()
+        resposta.status_code = 200
+        resposta.url = meta["url"]
+        resposta.encoding = meta.get("encoding")
+        if meta.get("content_type"):
+            resposta.headers["Content-Type"] = meta["content_type"]
+        resposta.headers["X-Cache"] = "HIT"
+        return resposta
+
+    def get(self, sessao, url, params=None, timeout=30, limitador=None):
+        params = params or {}
+        caminho_meta, caminho_corpo = self._caminhos(url, params)
+        meta = self._ler(caminho_meta, caminho_corpo)
+
+        if self.offline:
+            if meta is None:
+                raise RespostaForaDoCache(f"Modo offline: {url} não está no cache")
+            return self._resposta_do_cache(meta, caminho_corpo)
+
+        if meta is not None and time.time() - meta["salvo_em"] < self._ttl(url):
+            return self._resposta_do_cache(meta, caminho_corpo)
+
+        cabecalhos = {}
+        if meta is not None:
+            if meta.get("etag"):
+                cabecalhos["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                cabecalhos["If-Modified-Since"] = meta["last_modified"]
+
+        if limitador is not None:
+            limitador.aguardar()
+        resposta = sessao.get(url, params=params or None, headers=cabecalhos, timeout=timeout)
+
+        if resposta.status_code == 304 and meta is not None:
+            # Conteúdo não mudou: renova o prazo do TTL e serve o corpo guardado
+            meta["salvo_em"] = time.time()
+            meta["etag"] = resposta.headers.get("ETag", meta.get("etag"))
+            self._gravar_meta(caminho_meta, meta)
+            return self._resposta_do_cache(meta, caminho_corpo)
+
+        if resposta.status_code == 200:
+            self._gravar(caminho_meta, caminho_corpo, resposta)
+        return resposta
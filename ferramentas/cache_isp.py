@@ -0,0 +1,163 @@
+# Cache local das bases do ISP (Instituto de Segurança Pública - RJ)
+# O CSV é baixado e convertido uma única vez para Parquet (formato colunar).
+# As próximas execuções leem só as colunas pedidas direto do Parquet.
+# Com esquema (carregar_cisp/carregar_upp), os tipos compactos de esquema_isp.py
+# são aplicados e validados na conversão e já ficam gravados no Parquet.
+# pip install pyarrow requests
+import hashlib
+import io
+import json
+import os
+
+import pandas as pd
+import requests
+
+from ferramentas.cache_http import modo_offline
+from ferramentas.esquema_isp import (ESQUEMA_CISP, ESQUEMA_UPP, VERSAO_ESQUEMA, aplicar_esquema,
+                                     esquema_valido, tipos_leitura)
+from ferramentas.instrumentacao import etapa
+
+URL_CISP = "https://www.ispdados.rj.gov.br/Arquivos/BaseDPEvolucaoMensalCisp.csv"
+URL_UPP = "https://www.ispdados.rj.gov.br/Arquivos/UppEvolucaoMensalDetitulos.csv"
+
+# Pasta do cache: pode ser trocada pela variável de ambiente ISP_CACHE_DIR
+PASTA_CACHE = os.environ.get(
+    "ISP_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache_isp"),
+)
+ARQUIVO_INDICE = "indice.json"
+
+
+def _ler_indice():
+    caminho = os.path.join(PASTA_CACHE, ARQUIVO_INDICE)
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _gravar_indice(indice):
+    caminho = os.path.join(PASTA_CACHE, ARQUIVO_INDICE)
+    temporario = caminho + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(indice, f, indent=2)
+    os.replace(temporario, caminho)
+
+
+def _hash_conteudo(conteudo):
+    return hashlib.sha256(conteudo).hexdigest()[:16]
+
+
+def _caminho_parquet(chave):
+    return os.path.join(PASTA_CACHE, f"{chave}.parquet")
+
+
+def _baixar(endereco, entrada):
+    # Os validadores só valem se o Parquet daquela versão ainda existe
+    if entrada and os.path.exists(_caminho_parquet(entrada["hash"])):
+        return baixar_se_mudou(endereco, entrada.get("etag"), entrada.get("last_modified"))
+    return baixar_se_mudou(endereco)
+
+
+def baixar_se_mudou(endereco, etag=None, last_modified=None, destino=None):
+    """Bytes do CSV e os novos validadores; (None, {}) se o servidor responder 304.
+
+    Com `destino`, o corpo é gravado em blocos nesse arquivo e o primeiro valor
+    devolvido é o caminho do CSV (o próprio `endereco`, se for um arquivo local).
+    """
+    # Arquivo local: não há download, só a leitura dos bytes
+    if os.path.exists(endereco):
+        if destino is not None:
+            return endereco, {}
+        with open(endereco, "rb") as f:
+            return f.read(), {}
+
+    # Download condicional: se o servidor responder 304, o CSV não mudou
+    cabecalhos = {}
+    if etag:
+        cabecalhos["If-None-Match"] = etag
+    if last_modified:
+        cabecalhos["If-Modified-Since"] = last_modified
+
+    r = requests.get(endereco, headers=cabecalhos, timeout=120, stream=destino is not None)
+    if r.status_code == 304:
+        return None, {}
+    r.raise_for_status()
+    validadores = {
+        "etag": r.headers.get("ETag"),
+        "last_modified": r.headers.get("Last-Modified"),
+    }
+    if destino is None:
+        return r.content, validadores
+    with r, open(destino, "wb") as f:
+        for bloco in r.iter_content(chunk_size=1 << 20):
+            f.write(bloco)
+    return destino, validadores
+
+
+def _csv_para_parquet(conteudo, destino, sep, encoding, esquema=None):
+    dtype = tipos_leitura(esquema) if esquema else None
+    df = pd.read_csv(io.BytesIO(conteudo), sep=sep, encoding=encoding, dtype=dtype, low_memory=False)
+    if esquema:
+        aplicar_esquema(df, esquema)
+    # Colunas de texto com tipos misturados não são aceitas pelo Parquet
+    for coluna in df.columns[df.dtypes == object]:
+        df[coluna] = df[coluna].astype("string")
+    temporario = destino + ".tmp"
+    df.to_parquet(temporario, index=False)
+    os.replace(temporario, destino)
+    return len(df)
+
+
+def carregar_csv_isp(endereco, colunas=None, sep=";", encoding="iso-8859-1", esquema=None):
+    """Lê um CSV do ISP usando o cache em Parquet, retornando só as colunas pedidas."""
+    os.makedirs(PASTA_CACHE, exist_ok=True)
+    indice = _ler_indice()
+    entrada = indice.get(endereco)
+    versao = VERSAO_ESQUEMA if esquema else None
+    pipeline = esquema.get("nome") if esquema else None
+
+    # Modo offline (DADOS_OFFLINE=1): usa o Parquet já convertido, sem acessar a rede
+    if modo_offline() and entrada and os.path.exists(_caminho_parquet(entrada["hash"])):
+        with etapa("leitura", pipeline, origem="parquet") as registro:
+            df = pd.read_parquet(_caminho_parquet(entrada["hash"]), columns=colunas)
+            if esquema and not esquema_valido(df, esquema):
+                df = aplicar_esquema(df, {**esquema, "obrigatorias": []})
+            registro["linhas"] = len(df)
+        return df
+
+    # Parquet gravado com outra versão do esquema: baixa de novo para reconverter
+    if entrada and entrada.get("esquema") != versao:
+        entrada = None
+
+    with etapa("download", pipeline, endereco=endereco) as registro:
+        conteudo, validadores = _baixar(endereco, entrada)
+        registro["bytes"] = len(conteudo) if conteudo is not None else 0
+    if conteudo is None:
+        chave = entrada["hash"]
+    else:
+        chave = _hash_conteudo(conteudo) + (f"-e{versao}" if versao else "")
+        if not os.path.exists(_caminho_parquet(chave)):
+            with etapa("leitura", pipeline, origem="csv") as registro:
+                registro["linhas"] = _csv_para_parquet(conteudo, _caminho_parquet(chave), sep, encoding, esquema)
+        indice[endereco] = {"hash": chave, "esquema": versao, **validadores}
+        _gravar_indice(indice)
+
+    with etapa("leitura", pipeline, origem="parquet") as registro:
+        df = pd.read_parquet(_caminho_parquet(chave), columns=colunas)
+        registro["linhas"] = len(df)
+    return df
+
+
+def chave_cache(endereco):
+    """Hash do conteúdo da versão em cache de `endereco` (None se ainda não foi baixado)."""
+    entrada = _ler_indice().get(endereco)
+    return entrada["hash"] if entrada else None
+
+
+def carregar_cisp(colunas=None):
+    return carregar_csv_isp(URL_CISP, colunas=colunas, esquema=ESQUEMA_CISP)
+
+
+def carregar_upp(colunas=None):
+    return carregar_csv_isp(URL_UPP, colunas=colunas, esquema=ESQUEMA_UPP)
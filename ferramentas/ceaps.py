@@ -0,0 +1,133 @@
+# Leitura rápida dos CSVs de despesas do Senado (CEAPS e despesas institucionais)
+# - encoding e separador detectados uma única vez, a partir de uma amostra do início do arquivo
+# - o dialeto detectado fica guardado por "impressão digital" do arquivo (caminho, tamanho, data)
+# - o CSV é lido uma única vez, com o engine pyarrow e tipos declarados
+# pip install pyarrow
+import csv
+import json
+import os
+
+import pandas as pd
+
+from ferramentas.cache_isp import PASTA_CACHE
+from ferramentas.instrumentacao import instrumentar
+from ferramentas.moeda import converter_moeda_br
+
+try:
+    import pyarrow  # noqa: F401
+    ENGINE = "pyarrow"
+except ImportError:
+    ENGINE = "c"
+
+TAMANHO_AMOSTRA = 64 * 1024
+SEPARADORES = ";,\t|"
+ARQUIVO_DIALETOS = os.path.join(PASTA_CACHE, "dialetos.json")
+
+# Tipos das colunas conhecidas do CEAPS. As colunas de valor são lidas como texto
+# e convertidas por converter_moeda_br (formato brasileiro, "null", "R$"...).
+TIPOS_CEAPS = {
+    "ANO": "int16",
+    "MES": "int8",
+    "SENADOR": "category",
+    "TIPO_DESPESA": "category",
+    "CNPJ_CPF": "string",
+    "FORNECEDOR": "string",
+    "DOCUMENTO": "string",
+    "DATA": "string",
+    "DETALHAMENTO": "string",
+    "COD_DOCUMENTO": "string",
+    "VALOR_DESPESA": "string",
+    "VALOR_REEMBOLSADO": "string",
+}
+COLUNAS_MOEDA_CEAPS = ["VALOR_DESPESA", "VALOR_REEMBOLSADO"]
+
+
+def _impressao_digital(caminho):
+    info = os.stat(caminho)
+    return f"{os.path.abspath(caminho)}|{info.st_size}|{info.st_mtime_ns}"
+
+
+def _ler_dialetos():
+    if not os.path.exists(ARQUIVO_DIALETOS):
+        return {}
+    with open(ARQUIVO_DIALETOS, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _gravar_dialetos(dialetos):
+    os.makedirs(os.path.dirname(ARQUIVO_DIALETOS), exist_ok=True)
+    temporario = ARQUIVO_DIALETOS + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(dialetos, f, indent=2)
+    os.replace(temporario, ARQUIVO_DIALETOS)
+
+
+def _detectar_encoding(amostra):
+    # UTF-8 válido é quase sempre UTF-8; caso contrário os arquivos do Senado são latin1
+    try:
+        amostra.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError as e:
+        # Caractere multibyte cortado no fim da amostra não conta como erro
+        if e.start >= len(amostra) - 3 and e.reason == "unexpected end of data":
+            return "utf-8"
+        return "latin1"
+
+
+def _detectar_separador(linhas):
+    linhas = linhas[:20]
+    try:
+        return csv.Sniffer().sniff("\n".join(linhas), delimiters=SEPARADORES).delimiter
+    except csv.Error:
+        cabecalho = linhas[0] if linhas else ""
+        return max(SEPARADORES, key=cabecalho.count)
+
+
+def detectar_dialeto(caminho):
+    """Retorna {'encoding', 'sep', 'pular_linhas', 'colunas'} do CSV, usando o cache quando possível."""
+    chave = _impressao_digital(caminho)
+    dialetos = _ler_dialetos()
+    if chave in dialetos:
+        return dialetos[chave]
+
+    with open(caminho, "rb") as f:
+        amostra = f.read(TAMANHO_AMOSTRA)
+    encoding = _detectar_encoding(amostra)
+    linhas = amostra.decode(encoding, errors="ignore").splitlines()
+
+    # Os CSVs anuais do CEAPS começam com uma linha "ULTIMA ATUALIZACAO" antes do cabeçalho
+    pular = 1 if linhas and linhas[0].strip('"').upper().startswith("ULTIMA ATUALIZA") else 0
+    linhas = linhas[pular:]
+    sep = _detectar_separador(linhas)
+    cabecalho = next(csv.reader([linhas[0]], delimiter=sep)) if linhas else []
+
+    # Entradas de versões antigas do mesmo arquivo não servem mais
+    caminho_abs = os.path.abspath(caminho)
+    dialetos = {k: v for k, v in dialetos.items() if not k.startswith(caminho_abs + "|")}
+    dialetos[chave] = {"encoding": encoding, "sep": sep, "pular_linhas": pular, "colunas": cabecalho}
+    _gravar_dialetos(dialetos)
+    return dialetos[chave]
+
+
+@instrumentar("leitura", pipeline="ceaps")
+def ler_csv_dados(caminho, tipos=None, colunas=None, decimal=","):
+    """Lê o CSV uma única vez, com o dialeto detectado e os tipos declarados."""
+    dialeto = detectar_dialeto(caminho)
+    tipos = TIPOS_CEAPS if tipos is None else tipos
+    presentes = set(dialeto["colunas"])
+    dtype = {c: t for c, t in tipos.items() if c in presentes and (colunas is None or c in colunas)}
+
+    opcoes = dict(sep=dialeto["sep"], encoding=dialeto["encoding"], decimal=decimal,
+                  skiprows=dialeto.get("pular_linhas", 0), dtype=dtype or None, usecols=colunas)
+    try:
+        df = pd.read_csv(caminho, engine=ENGINE, **opcoes)
+    except Exception:
+        # Arquivos com linhas irregulares que o pyarrow não aceita
+        if ENGINE == "c":
+            raise
+        df = pd.read_csv(caminho, engine="c", low_memory=False, **opcoes)
+
+    for coluna in COLUNAS_MOEDA_CEAPS:
+        if coluna in df.columns and dtype.get(coluna) == "string":
+            df[coluna] = converter_moeda_br(df[coluna])
+    return df
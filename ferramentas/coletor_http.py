@@ -0,0 +1,183 @@
+# Coletor HTTP concorrente para as APIs de dados abertos
+# - uma única requests.Session com pool de conexões keep-alive
+# - limitador de taxa global (compartilhado por todas as threads)
+# - novas tentativas com espera exponencial em erros 429/5xx e falhas de conexão;
+#   cada nova tentativa também passa pelo limitador de taxa (RetryLimitado)
+# - ThreadPoolExecutor limitado, devolvendo os resultados conforme chegam; um mapear
+#   chamado de dentro de outro roda em sequência (um pool só, do tamanho da sessão)
+# - iteração página a página seguindo os links da API (rel="next"/"last")
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class LimitadorTaxa:
+    """Garante no máximo `por_segundo` requisições por segundo entre todas as threads."""
+
+    def __init__(self, por_segundo):
+        self.intervalo = 1.0 / por_segundo if por_segundo else 0.0
+        self._proximo = 0.0
+        self._trava = threading.Lock()
+
+    def aguardar(self):
+        if not self.intervalo:
+            return
+        with self._trava:
+            agora = time.monotonic()
+            espera = max(0.0, self._proximo - agora)
+            self._proximo = max(agora, self._proximo) + self.intervalo
+        if espera:
+            time.sleep(espera)
+
+
+class RetryLimitado(Retry):
+    """Retry do urllib3 que espera a vez no limitador de taxa antes de cada nova tentativa."""
+
+    def __init__(self, *args, limitador=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.limitador = limitador
+
+    def new(self, **kwargs):
+        # O urllib3 cria um Retry novo a cada tentativa: o limitador vai junto
+        novo = super().new(**kwargs)
+        novo.limitador = self.limitador
+        return novo
+
+    def sleep(self, response=None):
+        super().sleep(response)
+        if self.limitador is not None:
+            self.limitador.aguardar()
+
+
+def criar_sessao(conexoes=8, tentativas=3, fator_espera=0.5, limitador=None):
+    sessao = requests.Session()
+    retry = RetryLimitado(
+        total=tentativas,
+        backoff_factor=fator_espera,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET", "HEAD"),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+        limitador=limitador,
+    )
+    adaptador = HTTPAdapter(pool_connections=conexoes, pool_maxsize=conexoes, max_retries=retry)
+    sessao.mount("http://", adaptador)
+    sessao.mount("https://", adaptador)
+    return sessao
+
+
+class ColetorHTTP:
+    """Faz GETs em `base_url` com sessão compartilhada, limite de taxa e paralelismo limitado."""
+
+    def __init__(self, base_url, max_workers=8, requisicoes_por_segundo=5,
+                 tentativas=3, fator_espera=0.5, timeout=30, cache=None):
+        # cache: um ferramentas.cache_http.CacheHTTP (opcional)
+        self.base_url = base_url.rstrip("/")
+        self.cache = cache
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.limitador = LimitadorTaxa(requisicoes_por_segundo)
+        # Marca as threads do pool do mapear (para não abrir um pool dentro de outro)
+        self._local = threading.local()
+        self.sessao = criar_sessao(max_workers, tentativas, fator_espera, self.limitador)
+
+    def url(self, caminho):
+        if caminho.startswith("http://") or caminho.startswith("https://"):
+            return caminho
+        return f"{self.base_url}/{caminho.lstrip('/')}"
+
+    def get(self, caminho, params=None):
+        if self.cache is not None:
+            # O limitador só é usado quando a resposta não sai do cache
+            return self.cache.get(self.sessao, self.url(caminho), params=params,
+                                  timeout=self.timeout, limitador=self.limitador)
+        self.limitador.aguardar()
+        return self.sessao.get(self.url(caminho), params=params, timeout=self.timeout)
+
+    def mapear(self, funcao, itens):
+        """Executa `funcao(item)` em paralelo e devolve (item, resultado) na ordem de chegada.
+
+        Dentro de uma função que já roda no mapear (ex.: as páginas de cada deputado),
+        os itens são executados em sequência na própria thread: as conexões da sessão
+        são do tamanho do pool de fora e um segundo pool ficaria esperando por elas.
+        """
+        if getattr(self._local, "no_pool", False):
+            for item in itens:
+                yield item, funcao(item)
+            return
+
+        def executar(item):
+            self._local.no_pool = True
+            try:
+                return funcao(item)
+            finally:
+                self._local.no_pool = False
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futuros = {executor.submit(executar, item): item for item in itens}
+            for futuro in as_completed(futuros):
+                # Remove a referência para que o resultado possa ser liberado depois de consumido
+                item = futuros.pop(futuro)
+                yield item, futuro.result()
+
+    def fechar(self):
+        self.sessao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+# === Paginação no padrão da API de Dados Abertos da Câmara
+# Cada resposta traz {"dados": [...], "links": [{"rel": "next", "href": ...}, ...]}
+def _link(corpo, rel):
+    for link in corpo.get("links") or []:
+        if link.get("rel") == rel:
+            return link.get("href")
+    return None
+
+
+def _numero_pagina(href):
+    consulta = parse_qs(urlparse(href).query)
+    return int(consulta["pagina"][0]) if "pagina" in consulta else None
+
+
+def iterar_paginas(coletor, caminho, params=None, paralelo=False):
+    """Gera a lista "dados" de cada página, uma página por vez.
+
+    Sem `paralelo`, segue o link "next" até a última página. Com `paralelo`,
+    lê o número da última página no link "last" da primeira resposta e busca
+    as demais ao mesmo tempo (a ordem das páginas deixa de ser garantida); dentro
+    de um coletor.mapear, as páginas são buscadas em sequência na mesma thread.
+    """
+    params = dict(params or {})
+    r = coletor.get(caminho, params=params)
+    r.raise_for_status()
+    corpo = r.json()
+    yield corpo.get("dados", [])
+
+    ultima = _link(corpo, "last")
+    if paralelo and ultima and _numero_pagina(ultima):
+        def buscar(pagina):
+            resposta = coletor.get(caminho, params={**params, "pagina": pagina})
+            resposta.raise_for_status()
+            return resposta.json().get("dados", [])
+
+        for _, dados in coletor.mapear(buscar, range(2, _numero_pagina(ultima) + 1)):
+            yield dados
+        return
+
+    proxima = _link(corpo, "next")
+    while proxima:
+        r = coletor.get(proxima)
+        r.raise_for_status()
+        corpo = r.json()
+        yield corpo.get("dados", [])
+        proxima = _link(corpo, "next")
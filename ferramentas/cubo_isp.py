@@ -0,0 +1,82 @@
+# Cubo pré-agregado da base mensal por CISP do ISP
+# Todas as colunas de ocorrências são somadas uma única vez no grão mais fino
+# (região × município × CISP × ano × mês) e o cubo fica guardado em Parquet, com as
+# dimensões como categorias. Agregações mais grossas (por município, por região e
+# município, por mês...) saem do cubo, não das linhas brutas, e cada uma fica
+# guardada em memória depois da primeira vez.
+# carregar_cubo_cisp() lê o cubo da ingestão incremental (incremental_isp.py), que
+# soma ao cubo guardado só as linhas dos meses novos.
+import numpy as np
+import pandas as pd
+
+from ferramentas.instrumentacao import instrumentar
+
+DIMENSOES_CISP = ["regiao", "munic", "cisp", "ano", "mes"]
+# Colunas numéricas da base que são códigos, não contagens
+NAO_MEDIDAS = {"mes_ano", "aisp", "risp", "mcirc", "fase", "cod_upp"}
+
+
+def _medidas(df, dimensoes):
+    return [c for c in df.columns
+            if c not in dimensoes and c not in NAO_MEDIDAS and pd.api.types.is_numeric_dtype(df[c])]
+
+
+@instrumentar("agregacao", pipeline="cisp", linhas="entrada")
+def construir_cubo(df, dimensoes=DIMENSOES_CISP, medidas=None):
+    """Soma as `medidas` (por padrão, todas as contagens) no grão de `dimensoes`."""
+    dimensoes = [d for d in dimensoes if d in df.columns]
+    medidas = _medidas(df, dimensoes) if medidas is None else list(medidas)
+    cubo = df.groupby(dimensoes, observed=True, sort=True)[medidas].sum().reset_index()
+
+    for coluna in dimensoes:
+        if pd.api.types.is_object_dtype(cubo[coluna]) or pd.api.types.is_string_dtype(cubo[coluna]):
+            cubo[coluna] = cubo[coluna].astype("category")
+    for coluna in medidas:
+        # Somas dos tipos compactos (inclusive UInt* com nulos) voltam como o menor inteiro
+        valores = cubo[coluna].to_numpy(dtype=np.float64, na_value=np.nan)
+        if np.all(np.mod(valores, 1) == 0):
+            cubo[coluna] = pd.to_numeric(valores.astype(np.int64), downcast="integer")
+        else:
+            cubo[coluna] = valores
+    return cubo
+
+
+class CuboISP:
+    def __init__(self, cubo, dimensoes=DIMENSOES_CISP):
+        self.cubo = cubo
+        self.dimensoes = [d for d in dimensoes if d in cubo.columns]
+        self.medidas = _medidas(cubo, self.dimensoes)
+        self._agregados = {}
+
+    def agregar(self, por, medidas=None):
+        """Equivale a df.groupby(por)[medidas].sum().reset_index() sobre a base original."""
+        por = [por] if isinstance(por, str) else list(por)
+        fora = [d for d in por if d not in self.dimensoes]
+        if fora:
+            raise ValueError(f"Dimensões fora do cubo: {fora} (disponíveis: {self.dimensoes})")
+
+        chave = tuple(por)
+        if chave not in self._agregados:
+            # Somas em int64 para não estourar os tipos compactos do cubo
+            tabela = self.cubo.groupby(por, observed=True, sort=True)[self.medidas].sum()
+            self._agregados[chave] = tabela.astype({m: "int64" for m in self.medidas
+                                                    if np.issubdtype(tabela[m].dtype, np.integer)})
+
+        tabela = self._agregados[chave]
+        if medidas is not None:
+            tabela = tabela[[medidas] if isinstance(medidas, str) else list(medidas)]
+        resultado = tabela.reset_index()
+        # Dimensões voltam com o tipo original (texto), para poderem ser editadas
+        for coluna in por:
+            if isinstance(resultado[coluna].dtype, pd.CategoricalDtype):
+                resultado[coluna] = resultado[coluna].astype(resultado[coluna].cat.categories.dtype)
+        return resultado
+
+
+def carregar_cubo_cisp():
+    """Cubo da base por CISP, mantido pela ingestão incremental (só os meses novos são somados)."""
+    # incremental_isp importa este módulo: a importação fica aqui dentro
+    from ferramentas.incremental_isp import atualizar, carregar_cubo
+
+    atualizar("cisp")
+    return carregar_cubo("cisp")
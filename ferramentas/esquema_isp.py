@@ -0,0 +1,139 @@
+# Esquema de tipos das bases mensais do ISP (por CISP e por UPP)
+# - dimensões de texto (município, região, UPP...) como category
+# - códigos numéricos com o menor tipo inteiro declarado (cisp int16, mes uint8...)
+# - contagens de ocorrências com o menor inteiro sem sinal que comporta a coluna
+#   (UInt* com nulos quando a coluna tem meses sem registro)
+# O esquema é aplicado logo na leitura do CSV e validado: coluna obrigatória ausente
+# ou código que não cabe no tipo declarado gera ErroEsquema; coluna numérica que não é
+# contagem (taxa, índice...) fica como está, com um aviso (warnings.warn).
+#
+# Atenção à aritmética com as contagens: somas (sum, groupby().sum()) já saem em 64 bits,
+# mas a diferença entre duas colunas fica no tipo estreito e dá a volta em vez de ficar
+# negativa (uint8: 3 - 5 = 254). Converta antes de subtrair, ex.:
+#   df["a"].astype("int64") - df["b"].astype("int64")
+# CuboISP.agregar (cubo_isp.py) já devolve as somas em int64.
+import warnings
+
+import numpy as np
+import pandas as pd
+
+VERSAO_ESQUEMA = 1
+
+ESQUEMA_CISP = {
+    "nome": "cisp",
+    "obrigatorias": ["cisp", "mes", "ano", "munic", "regiao"],
+    "tipos": {
+        "cisp": "int16",
+        "mes": "uint8",
+        "ano": "uint16",
+        "mes_ano": "category",
+        "aisp": "uint8",
+        "risp": "uint8",
+        "munic": "category",
+        "mcirc": "uint32",
+        "regiao": "category",
+        "fase": "uint8",
+    },
+}
+
+ESQUEMA_UPP = {
+    "nome": "upp",
+    "obrigatorias": ["upp", "ano", "mes"],
+    "tipos": {
+        "cod_upp": "int16",
+        "upp": "category",
+        "ano": "uint16",
+        "mes": "uint8",
+        "fase": "uint8",
+    },
+}
+
+_TIPOS_SEM_SINAL = [np.uint8, np.uint16, np.uint32, np.uint64]
+
+
+class ErroEsquema(ValueError):
+    """A base do ISP não segue o esquema declarado."""
+
+
+def tipos_leitura(esquema, colunas=None):
+    """dtype para o read_csv: as dimensões de texto já são lidas como category."""
+    return {c: t for c, t in esquema["tipos"].items()
+            if t == "category" and (colunas is None or c in colunas)}
+
+
+def tipo_com_nulos(tipo):
+    # "uint8" -> "UInt8", "int16" -> "Int16" (inteiros do pandas que aceitam <NA>)
+    return "UInt" + tipo[4:] if tipo.startswith("uint") else "Int" + tipo[3:]
+
+
+def _valores_inteiros(serie):
+    valores = serie.to_numpy(dtype=np.float64, na_value=np.nan)
+    presentes = valores[~np.isnan(valores)]
+    return valores, presentes, bool(np.all(np.mod(presentes, 1) == 0))
+
+
+def _converter_codigo(serie, tipo):
+    numerica = pd.to_numeric(serie, errors="coerce")
+    if numerica.isna().sum() > serie.isna().sum():
+        raise ErroEsquema(f"Coluna '{serie.name}' tem valores não numéricos (esperado {tipo})")
+    serie = numerica
+    valores, presentes, inteiros = _valores_inteiros(serie)
+    info = np.iinfo(tipo)
+    if not inteiros or (presentes.size and (presentes.min() < info.min or presentes.max() > info.max)):
+        raise ErroEsquema(f"Coluna '{serie.name}' não cabe em {tipo} "
+                          f"(mín {presentes.min() if presentes.size else '-'}, máx {presentes.max() if presentes.size else '-'})")
+    if presentes.size < valores.size:
+        return serie.astype(tipo_com_nulos(tipo))
+    return serie.astype(tipo)
+
+
+def _converter_contagem(serie):
+    valores, presentes, inteiros = _valores_inteiros(serie)
+    if not inteiros or (presentes.size and presentes.min() < 0):
+        # Não é contagem (taxa, índice...): fica como número comum
+        warnings.warn(f"Coluna '{serie.name}' não é contagem inteira não negativa; mantida como {serie.dtype}",
+                      stacklevel=3)
+        return serie
+    maximo = presentes.max() if presentes.size else 0
+    tipo = next(t for t in _TIPOS_SEM_SINAL if maximo <= np.iinfo(t).max)
+    nome = np.dtype(tipo).name
+    if presentes.size < valores.size:
+        return pd.array(valores, dtype="Float64").astype(tipo_com_nulos(nome))
+    return valores.astype(tipo)
+
+
+def aplicar_esquema(df, esquema):
+    """Converte e valida as colunas de `df` conforme o esquema (devolve o próprio df)."""
+    faltando = [c for c in esquema["obrigatorias"] if c not in df.columns]
+    if faltando:
+        raise ErroEsquema(f"Colunas obrigatórias ausentes: {faltando}")
+
+    tipos = esquema["tipos"]
+    for coluna in df.columns:
+        tipo = tipos.get(coluna)
+        serie = df[coluna]
+        if tipo == "category":
+            if not isinstance(serie.dtype, pd.CategoricalDtype):
+                df[coluna] = serie.astype("category")
+        elif tipo is not None:
+            df[coluna] = _converter_codigo(serie, tipo)
+        elif pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+            df[coluna] = _converter_contagem(serie)
+        elif not isinstance(serie.dtype, pd.CategoricalDtype):
+            # Texto fora do esquema (colunas novas da base): também vira category
+            df[coluna] = serie.astype("category")
+    return df
+
+
+def esquema_valido(df, esquema):
+    """True se os tipos de `df` já são os do esquema (ex.: Parquet gravado por esta versão)."""
+    for coluna, tipo in esquema["tipos"].items():
+        if coluna not in df.columns:
+            continue
+        atual = df[coluna].dtype
+        if tipo == "category":
+            if not isinstance(atual, pd.CategoricalDtype):
+                return False
+        elif str(atual) not in (tipo, tipo_com_nulos(tipo)):
+            return False
+    return True
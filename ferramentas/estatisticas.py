@@ -0,0 +1,270 @@
+# Estatística descritiva por grupo (região, município, UPP...)
+# As linhas são ordenadas uma vez por (grupo, valor) e cada grupo vira um segmento
+# contíguo e já ordenado do array; tudo sai de operações sobre o array inteiro:
+#   Momentos.de_segmentos (ferramentas/momentos.py)   média, variância, assimetria,
+#                                                      curtose e extremos de todos os grupos
+#   _quantil_segmentos                                 quartis exatos (interpolação como no
+#                                                      np.quantile), IQR e limites de outliers
+# Os relatórios em blocos (leitura_em_blocos.descrever_em_blocos), em que as linhas
+# nunca ficam todas na memória, montam a mesma tabela com medidas_de_resumos a partir
+# de um Momentos e de um EsbocoQuantis alimentados bloco a bloco.
+# descrever_distribuicao() guarda o resultado pela impressão digital dos dados:
+# gerar de novo o texto, a tabela ou o gráfico com os mesmos dados não recalcula nada.
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from ferramentas.instrumentacao import instrumentar
+from ferramentas.momentos import Momentos
+
+COLUNAS_ESTATISTICAS = [
+    'n', 'media', 'mediana', 'distancia_media_mediana',
+    'q1', 'q2', 'q3', 'iqr', 'limite_inferior', 'limite_superior',
+    'minimo', 'maximo', 'amplitude_total',
+    'variancia', 'distancia_variancia_media', 'desvio_padrao', 'coeficiente_variacao',
+    'assimetria', 'curtose',
+    'qtd_outliers_inferiores', 'qtd_outliers_superiores',
+]
+
+MAXIMO_RESULTADOS = 64
+_resultados = OrderedDict()
+
+
+def _quantil_segmentos(ordenados, inicio, tamanho, p, metodo='linear'):
+    # Mesmos métodos do np.quantile ('linear' ou 'weibull'), aplicados a todos os segmentos de uma vez
+    if metodo == 'linear':
+        h = (tamanho - 1) * p
+    elif metodo == 'weibull':
+        h = np.clip((tamanho + 1) * p - 1, 0, tamanho - 1)
+    else:
+        raise ValueError(f"Método de quantil não suportado: {metodo}")
+    baixo = np.floor(h).astype(np.int64)
+    alto = np.minimum(baixo + 1, tamanho - 1)
+    fracao = h - baixo
+    v_baixo = ordenados[inicio + baixo]
+    v_alto = ordenados[inicio + alto]
+    return v_baixo + fracao * (v_alto - v_baixo)
+
+
+def _segmentar(df, grupo, valor):
+    # Códigos inteiros para os grupos (uma coluna ou várias) e os valores ordenados dentro de cada um
+    agrupado = df.groupby(grupo, sort=True, observed=True)
+    codigos = agrupado.ngroup().to_numpy()
+    rotulos = agrupado.size().index
+    valores = df[valor].to_numpy(dtype=np.float64)
+
+    validos = (codigos >= 0) & ~np.isnan(valores)
+    codigos, valores = codigos[validos], valores[validos]
+    if len(valores) == 0:
+        return valores, np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), rotulos[:0]
+
+    ordem = np.lexsort((valores, codigos))
+    codigos, ordenados = codigos[ordem], valores[ordem]
+
+    inicio = np.flatnonzero(np.r_[True, codigos[1:] != codigos[:-1]])
+    tamanho = np.diff(np.r_[inicio, len(codigos)])
+    presentes = codigos[inicio]
+    return ordenados, inicio, tamanho, rotulos.take(presentes)
+
+
+def _tabela_medidas(momentos, limites, outliers_inferiores, outliers_superiores, corrigida, inteiros, indice):
+    # Tabela no formato de COLUNAS_ESTATISTICAS a partir dos Momentos e dos quartis/limites
+    media, q2 = momentos.media, limites['q2']
+    variancia = momentos.variancia()
+    minimo, maximo = momentos.minimo, momentos.maximo
+    if inteiros:
+        # Contagens: extremos e amplitude continuam inteiros
+        minimo, maximo = np.asarray(minimo).astype(np.int64)[()], np.asarray(maximo).astype(np.int64)[()]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return pd.DataFrame({
+            'n': momentos.n,
+            'media': media,
+            'mediana': q2,
+            'distancia_media_mediana': np.abs(media - q2) / q2,
+            'q1': limites['q1'],
+            'q2': q2,
+            'q3': limites['q3'],
+            'iqr': limites['iqr'],
+            'limite_inferior': limites['limite_inferior'],
+            'limite_superior': limites['limite_superior'],
+            'minimo': minimo,
+            'maximo': maximo,
+            'amplitude_total': maximo - minimo,
+            'variancia': variancia,
+            'distancia_variancia_media': variancia / media ** 2,
+            'desvio_padrao': momentos.desvio_padrao(),
+            'coeficiente_variacao': momentos.coeficiente_variacao(),
+            # Assimetria e curtose com correção de viés, como Series.skew() e Series.kurtosis(),
+            # ou com viés, como scipy.stats.skew() e scipy.stats.kurtosis()
+            'assimetria': momentos.assimetria(corrigida=corrigida),
+            'curtose': momentos.curtose(corrigida=corrigida),
+            'qtd_outliers_inferiores': outliers_inferiores,
+            'qtd_outliers_superiores': outliers_superiores,
+        }, index=indice)
+
+
+@instrumentar("calculo", linhas="entrada")
+def estatisticas_por_grupo(df, grupo, valor, metodo='linear', corrigida=True):
+    """Tabela com todas as medidas descritivas de `valor`, uma linha por grupo.
+
+    `metodo` é o método dos quartis ('linear' ou 'weibull', como no np.quantile) e
+    `corrigida` escolhe assimetria/curtose sem viés (Series.skew) ou com viés (scipy.stats).
+    """
+    ordenados, inicio, tamanho, rotulos = _segmentar(df, grupo, valor)
+    if len(ordenados) == 0:
+        return pd.DataFrame(columns=COLUNAS_ESTATISTICAS)
+
+    momentos = Momentos.de_segmentos(ordenados, inicio, tamanho)
+    q1 = _quantil_segmentos(ordenados, inicio, tamanho, 0.25, metodo)
+    q2 = _quantil_segmentos(ordenados, inicio, tamanho, 0.50, metodo)
+    q3 = _quantil_segmentos(ordenados, inicio, tamanho, 0.75, metodo)
+    iqr = q3 - q1
+    limites = {'q1': q1, 'q2': q2, 'q3': q3, 'iqr': iqr,
+               'limite_inferior': q1 - 1.5 * iqr, 'limite_superior': q3 + 1.5 * iqr}
+
+    # Outliers: contagem por grupo usando os limites do próprio grupo
+    segmento = np.repeat(np.arange(len(inicio)), tamanho)
+    inferiores = (ordenados < limites['limite_inferior'][segmento]).astype(np.int64)
+    superiores = (ordenados > limites['limite_superior'][segmento]).astype(np.int64)
+
+    return _tabela_medidas(momentos, limites, np.add.reduceat(inferiores, inicio),
+                           np.add.reduceat(superiores, inicio), corrigida,
+                           pd.api.types.is_integer_dtype(df[valor]), rotulos)
+
+
+def medidas_de_resumos(momentos, esboco, metodo='linear', corrigida=True, inteiros=False, nome=None):
+    """Medidas de COLUNAS_ESTATISTICAS (Series) a partir de Momentos e EsbocoQuantis já alimentados.
+
+    Serve para os dados lidos em blocos, que nunca ficam inteiros na memória: as
+    quantidades de outliers são estimadas pelo esboço (exatas enquanto ele for exato).
+    """
+    if momentos.n == 0:
+        return pd.Series(np.nan, index=COLUNAS_ESTATISTICAS, name=nome)
+    limites = esboco.limites(metodo=metodo)
+    inferiores = esboco.contagem(limites['limite_inferior'])
+    superiores = esboco.n - esboco.contagem(limites['limite_superior'], inclusive=True)
+    tabela = _tabela_medidas(momentos, limites, inferiores, superiores, corrigida, inteiros, [nome])
+    return tabela.astype(object).iloc[0]
+
+
+def _impressao(*series):
+    # Impressão digital dos valores (e dos rótulos de grupo), independente do índice
+    h = hashlib.sha256()
+    for serie in series:
+        serie = pd.Series(serie)
+        h.update(str(serie.dtype).encode())
+        h.update(pd.util.hash_pandas_object(serie, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+@instrumentar("calculo", linhas="entrada")
+def descrever_distribuicao(serie, por=None, metodo='linear', corrigida=True):
+    """Todas as medidas descritivas de `serie` num só passe vetorizado.
+
+    Média, variância, assimetria e curtose vêm do Momentos; quartis, limites e
+    outliers são exatos, interpolados sobre os valores ordenados (como np.quantile).
+
+    Sem `por`, devolve uma Series com as medidas (mesmos nomes de COLUNAS_ESTATISTICAS);
+    com `por` (Series/array de rótulos alinhado a `serie`, ou lista deles), devolve a
+    tabela de estatisticas_por_grupo. O resultado é guardado pela impressão digital
+    dos dados, então chamadas repetidas com os mesmos valores não recalculam nada.
+    """
+    serie = pd.Series(serie)
+    grupos = [] if por is None else por if isinstance(por, list) else [por]
+    nomes = [getattr(g, 'name', None) for g in grupos]
+    grupos = [pd.Series(np.asarray(g), name=nome if nome is not None and nomes.count(nome) == 1 else f'grupo_{i}')
+              for i, (g, nome) in enumerate(zip(grupos, nomes))]
+
+    chave = (_impressao(serie, *grupos), metodo, corrigida)
+    if chave in _resultados:
+        _resultados.move_to_end(chave)
+    else:
+        colunas = {g.name: g.to_numpy() for g in grupos} or {'_todos': np.zeros(len(serie), dtype=np.int8)}
+        df = pd.DataFrame({**colunas, '_valor': serie.to_numpy()})
+        grupo = list(colunas) if len(colunas) > 1 else next(iter(colunas))
+        _resultados[chave] = estatisticas_por_grupo(df, grupo, '_valor', metodo, corrigida)
+        if len(_resultados) > MAXIMO_RESULTADOS:
+            _resultados.popitem(last=False)
+
+    tabela = _resultados[chave]
+    if por is None:
+        if tabela.empty:
+            return pd.Series(np.nan, index=COLUNAS_ESTATISTICAS, name=serie.name)
+        # object preserva os inteiros (n, extremos, contagens de outliers) numa linha só
+        return tabela.astype(object).iloc[0].rename(serie.name)
+    return tabela.copy()
+
+
+def marcar_outliers(df, grupo, valor, tabela):
+    """Série alinhada a `df` com 'inferior', 'superior' ou '' conforme os limites do grupo."""
+    limites = tabela[['limite_inferior', 'limite_superior']]
+    chaves = pd.MultiIndex.from_frame(df[grupo]) if isinstance(grupo, list) else df[grupo]
+    inferior = limites['limite_inferior'].reindex(chaves).to_numpy()
+    superior = limites['limite_superior'].reindex(chaves).to_numpy()
+    valores = df[valor].to_numpy(dtype=np.float64)
+    return pd.Series(
+        np.select([valores < inferior, valores > superior], ['inferior', 'superior'], ''),
+        index=df.index, name='outlier',
+    )
+
+
+def _k_extremos(valores, posicoes, k):
+    # Seleção O(n) com argpartition; só os k escolhidos são ordenados (decrescente/crescente)
+    if len(posicoes) > k:
+        maiores = posicoes[np.argpartition(valores[posicoes], -k)[-k:]]
+        menores = posicoes[np.argpartition(valores[posicoes], k - 1)[:k]]
+    else:
+        maiores = menores = posicoes
+    maiores = maiores[np.argsort(-valores[maiores], kind='stable')]
+    menores = menores[np.argsort(valores[menores], kind='stable')]
+    return maiores, menores
+
+
+def _separar_extremos(df_grupo, valores, medidas):
+    # Máscaras sobre os valores do grupo: as listas saem na ordem das linhas
+    return {
+        'menores': df_grupo[valores < medidas['q1']],
+        'maiores': df_grupo[valores > medidas['q3']],
+        'outliers_inferiores': df_grupo[valores < medidas['limite_inferior']],
+        'outliers_superiores': df_grupo[valores > medidas['limite_superior']],
+    }
+
+
+@instrumentar("calculo", linhas="entrada")
+def extremos_por_grupo(df, grupo, valor, tabela, k=5):
+    """Menores (< Q1), maiores (> Q3), outliers e os k maiores/menores de todos os grupos.
+
+    Os limites vêm de `tabela` (estatisticas_por_grupo/descrever_distribuicao). As
+    listas de menores, maiores e outliers saem de máscaras, na ordem das linhas, sem
+    ordenar nada; só os k extremos (seleção O(n) por grupo) vêm ordenados: 'k_maiores'
+    decrescente e 'k_menores' crescente.
+    Devolve {grupo: {'menores', 'maiores', 'outliers_inferiores', 'outliers_superiores',
+    'k_maiores', 'k_menores'}}.
+    """
+    valores = df[valor].to_numpy(dtype=np.float64)
+    resultado = {}
+    for chave, posicoes in df.groupby(grupo, sort=False, observed=True).indices.items():
+        if chave not in tabela.index:
+            continue
+        df_grupo = df.iloc[posicoes]
+        maiores, menores = _k_extremos(valores, posicoes[~np.isnan(valores[posicoes])], k)
+        resultado[chave] = {
+            **_separar_extremos(df_grupo, valores[posicoes], tabela.loc[chave]),
+            'k_maiores': df.iloc[maiores],
+            'k_menores': df.iloc[menores],
+        }
+    return resultado
+
+
+def extremos_do_grupo(df_grupo, valor, medidas, k=5):
+    """Mesmo resultado de extremos_por_grupo para um único grupo (`medidas` de uma linha)."""
+    valores = df_grupo[valor].to_numpy(dtype=np.float64)
+    maiores, menores = _k_extremos(valores, np.flatnonzero(~np.isnan(valores)), k)
+    return {
+        **_separar_extremos(df_grupo, valores, medidas),
+        'k_maiores': df_grupo.iloc[maiores],
+        'k_menores': df_grupo.iloc[menores],
+    }
@@ -0,0 +1,122 @@
+# Tabela geográfica das delegacias (CISP, AISP, RISP, município, região e coordenadas)
+# com índice espacial em grade.
+# As coordenadas vêm de um arquivo local (ferramentas/dados/cisp_geodados.csv, ou o de
+# ISP_GEODADOS) e a identificação de cada CISP vem da própria base do ISP, então a
+# tabela tem uma linha por delegacia da base; as que ainda não têm coordenada ficam com
+# latitude/longitude vazias (e são contadas, não descartadas em silêncio).
+# Pendência: o arquivo distribuído só tem as coordenadas de 10 CISPs (amostra); falta
+# completá-lo com todas as delegacias da base (mapa_cisp lista as que ficam de fora).
+#
+# IndiceEspacial projeta os pontos num plano em km e os ordena pela célula da grade;
+# cada célula é um intervalo contíguo do array ordenado, achado por busca binária:
+#   na_janela(sul, norte, oeste, leste)   delegacias dentro do retângulo (viewport do mapa)
+#   mais_proximo(latitude, longitude)     delegacia mais perto do ponto e distância em km
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+ARQUIVO_GEODADOS = os.environ.get(
+    "ISP_GEODADOS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "dados", "cisp_geodados.csv"))
+COLUNAS_IDENTIFICACAO = ["cisp", "aisp", "risp", "munic", "regiao"]
+RAIO_TERRA_KM = 6371.0
+
+
+def carregar_geodados(caminho=ARQUIVO_GEODADOS, base=None):
+    """Uma linha por CISP com as coordenadas do arquivo local.
+
+    Com `base` (linhas da base do ISP), a tabela traz todas as CISPs dela, com AISP,
+    RISP, município e região do registro mais recente de cada uma.
+    """
+    coordenadas = pd.read_csv(caminho, sep=";")
+    if base is None:
+        return coordenadas.sort_values("cisp", ignore_index=True)
+
+    colunas = [c for c in COLUNAS_IDENTIFICACAO if c in base.columns]
+    ordem = [c for c in ("ano", "mes") if c in base.columns]
+    recentes = base.sort_values(ordem, kind="stable") if ordem else base
+    identificacao = recentes[colunas].drop_duplicates("cisp", keep="last")
+    for coluna in colunas:
+        if isinstance(identificacao[coluna].dtype, pd.CategoricalDtype):
+            identificacao[coluna] = identificacao[coluna].astype(str)
+    repetidas = [c for c in colunas if c != "cisp" and c in coordenadas.columns]
+    tabela = identificacao.merge(coordenadas.drop(columns=repetidas), on="cisp", how="left")
+    return tabela.sort_values("cisp", ignore_index=True)
+
+
+class IndiceEspacial:
+    def __init__(self, geodados, tamanho_celula_km=2.0):
+        # Só entram as delegacias com coordenada
+        self.tabela = geodados.dropna(subset=["latitude", "longitude"]).reset_index(drop=True)
+        self.celula = tamanho_celula_km
+        latitudes = self.tabela["latitude"].to_numpy(dtype=np.float64)
+        longitudes = self.tabela["longitude"].to_numpy(dtype=np.float64)
+        # Projeção equiretangular na latitude média: no tamanho do estado, erro desprezível
+        self.cos_referencia = math.cos(math.radians(latitudes.mean())) if len(latitudes) else 1.0
+        self.x, self.y = self._projetar(latitudes, longitudes)
+
+        colunas = np.floor(self.x / self.celula).astype(np.int64)
+        linhas = np.floor(self.y / self.celula).astype(np.int64)
+        if len(colunas):
+            self.coluna_min, self.coluna_max = colunas.min(), colunas.max()
+            self.linha_min, self.linha_max = linhas.min(), linhas.max()
+        else:
+            self.coluna_min = self.linha_min = 0
+            self.coluna_max = self.linha_max = -1
+        self.n_linhas = self.linha_max - self.linha_min + 1
+        chaves = self._chave(colunas, linhas)
+        self.ordem = np.argsort(chaves, kind="stable")
+        self.chaves = chaves[self.ordem]
+
+    def _projetar(self, latitudes, longitudes):
+        x = RAIO_TERRA_KM * np.radians(longitudes) * self.cos_referencia
+        y = RAIO_TERRA_KM * np.radians(latitudes)
+        return x, y
+
+    def _chave(self, colunas, linhas):
+        return (colunas - self.coluna_min) * self.n_linhas + (linhas - self.linha_min)
+
+    def _no_retangulo(self, coluna_ini, coluna_fim, linha_ini, linha_fim):
+        # Posições (na tabela) dos pontos nas células do retângulo: em cada coluna da grade,
+        # as linhas de linha_ini a linha_fim são um intervalo contíguo das chaves ordenadas
+        coluna_ini, coluna_fim = max(coluna_ini, self.coluna_min), min(coluna_fim, self.coluna_max)
+        linha_ini, linha_fim = max(linha_ini, self.linha_min), min(linha_fim, self.linha_max)
+        if coluna_ini > coluna_fim or linha_ini > linha_fim:
+            return np.empty(0, dtype=np.int64)
+        colunas = np.arange(coluna_ini, coluna_fim + 1)
+        inicios = np.searchsorted(self.chaves, self._chave(colunas, linha_ini), side="left")
+        fins = np.searchsorted(self.chaves, self._chave(colunas, linha_fim), side="right")
+        return np.concatenate([self.ordem[a:b] for a, b in zip(inicios, fins)])
+
+    def _celula(self, latitude, longitude):
+        x, y = self._projetar(latitude, longitude)
+        return int(math.floor(x / self.celula)), int(math.floor(y / self.celula)), x, y
+
+    def na_janela(self, sul, norte, oeste, leste):
+        """Delegacias dentro do retângulo de latitudes [sul, norte] e longitudes [oeste, leste]."""
+        coluna_ini, linha_ini, _, _ = self._celula(sul, oeste)
+        coluna_fim, linha_fim, _, _ = self._celula(norte, leste)
+        candidatos = np.sort(self._no_retangulo(coluna_ini, coluna_fim, linha_ini, linha_fim))
+        latitudes = self.tabela["latitude"].to_numpy()[candidatos]
+        longitudes = self.tabela["longitude"].to_numpy()[candidatos]
+        dentro = (latitudes >= sul) & (latitudes <= norte) & (longitudes >= oeste) & (longitudes <= leste)
+        return self.tabela.take(candidatos[dentro])
+
+    def mais_proximo(self, latitude, longitude):
+        """(linha da tabela, distância em km) da delegacia mais perto do ponto; None sem pontos."""
+        if not len(self.tabela):
+            return None
+        coluna, linha, x, y = self._celula(latitude, longitude)
+        # Anéis de células em volta do ponto: um ponto fora do anel r está a mais de
+        # r células de distância, então basta parar quando o melhor já está mais perto
+        raio = max(0, self.coluna_min - coluna, coluna - self.coluna_max,
+                   self.linha_min - linha, linha - self.linha_max)
+        while True:
+            candidatos = self._no_retangulo(coluna - raio, coluna + raio, linha - raio, linha + raio)
+            if len(candidatos):
+                distancias = np.hypot(self.x[candidatos] - x, self.y[candidatos] - y)
+                melhor = int(np.argmin(distancias))
+                if distancias[melhor] <= raio * self.celula or len(candidatos) == len(self.tabela):
+                    return self.tabela.iloc[candidatos[melhor]], float(distancias[melhor])
+            raio += 1
@@ -0,0 +1,349 @@
+# Atualização incremental (mês a mês) das bases mensais do ISP
+# O ISP republica o histórico inteiro a cada mês (desde 2003 por CISP, 2007 por UPP).
+# Aqui cada linha do CSV ganha um hash e cada (ano, mes) uma soma de verificação
+# (quantidade de linhas + soma dos hashes). A cada atualização:
+#   - meses novos depois da marca d'água (último ano/mês ingerido): só essas linhas
+#     são convertidas (esquema compacto), gravadas como mais partes em Parquet e
+#     somadas ao cubo, aos totais por unidade e aos momentos de cada indicador
+#   - algum mês já ingerido mudou, sumiu ou apareceu antes da marca: reconstrução completa
+#   - nada novo: só os validadores do download (ETag/Last-Modified) são atualizados
+# O CSV é lido em blocos de TAMANHO_BLOCO linhas, em duas passadas: a primeira só
+# calcula as somas de verificação, a segunda converte e soma só as linhas dos meses
+# novos. A tabela inteira nunca fica na memória, nem na carga inicial; o download
+# de uma URL também é gravado em blocos num arquivo temporário.
+# No modo offline (DADOS_OFFLINE=1) uma base já ingerida é usada como está.
+# Os scripts e relatórios leem daqui: carregar_cubo_cisp() (cubo_isp.py) e
+# totais_atualizados() atualizam a base e devolvem os agregados guardados.
+#
+# Uso pela linha de comando:
+#   python -m ferramentas.incremental_isp atualizar cisp upp
+#   python -m ferramentas.incremental_isp estatisticas upp
+# pip install pyarrow requests
+import argparse
+import glob
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from ferramentas.cache_http import modo_offline
+from ferramentas.cache_isp import PASTA_CACHE, URL_CISP, URL_UPP, baixar_se_mudou
+from ferramentas.cubo_isp import DIMENSOES_CISP, CuboISP, construir_cubo
+from ferramentas.esquema_isp import ESQUEMA_CISP, ESQUEMA_UPP, VERSAO_ESQUEMA, aplicar_esquema, tipos_leitura
+from ferramentas.instrumentacao import etapa
+from ferramentas.leitura_em_blocos import TAMANHO_BLOCO
+from ferramentas.momentos import Momentos
+
+PASTA_INCREMENTAL = os.path.join(PASTA_CACHE, "incremental")
+ARQUIVO_ESTADO = "estado.json"
+# Acima disso as partes pequenas (meses ingeridos um a um) são juntadas em blocos
+MAXIMO_PARTES = 24
+# Muda quando o cálculo das somas de verificação muda (força uma reconstrução)
+VERSAO_SOMAS = 2
+
+BASES = {
+    "cisp": {"endereco": URL_CISP, "esquema": ESQUEMA_CISP, "dimensoes": DIMENSOES_CISP, "unidade": "cisp"},
+    "upp": {"endereco": URL_UPP, "esquema": ESQUEMA_UPP, "dimensoes": ["upp", "ano", "mes"], "unidade": "upp"},
+}
+
+
+def _pasta(nome):
+    return os.path.join(PASTA_INCREMENTAL, nome)
+
+
+def _ler_estado(nome):
+    caminho = os.path.join(_pasta(nome), ARQUIVO_ESTADO)
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _gravar_estado(nome, estado):
+    caminho = os.path.join(_pasta(nome), ARQUIVO_ESTADO)
+    temporario = caminho + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(estado, f, indent=2, ensure_ascii=False)
+    os.replace(temporario, caminho)
+
+
+def _gravar_parquet(df, destino):
+    # Colunas de texto com tipos misturados não são aceitas pelo Parquet
+    for coluna in df.columns[df.dtypes == object]:
+        df[coluna] = df[coluna].astype("string")
+    temporario = destino + ".tmp"
+    df.to_parquet(temporario, index=False)
+    os.replace(temporario, destino)
+
+
+def _chave_mes(bloco):
+    return bloco["ano"].astype("int64").to_numpy() * 100 + bloco["mes"].astype("int64").to_numpy()
+
+
+def somas_por_mes(fonte, sep=";", encoding="iso-8859-1", tamanho_bloco=TAMANHO_BLOCO):
+    """Colunas do CSV, quantidade de linhas e {"AAAAMM": "quantidade-soma dos hashes"} de cada mês.
+
+    As linhas são lidas em blocos, como texto; a soma não depende da ordem das linhas.
+    """
+    colunas = list(pd.read_csv(fonte, sep=sep, encoding=encoding, nrows=0).columns)
+    if "ano" not in colunas or "mes" not in colunas:
+        raise ValueError("CSV sem as colunas ano e mes")
+    quantidades, somas, linhas = {}, {}, 0
+    blocos = pd.read_csv(fonte, sep=sep, encoding=encoding, dtype=str, keep_default_na=False,
+                         chunksize=tamanho_bloco)
+    for bloco in blocos:
+        if bloco.empty:
+            continue
+        linhas += len(bloco)
+        meses = _chave_mes(bloco)
+        hashes = pd.util.hash_pandas_object(bloco, index=False).to_numpy()
+        ordem = np.argsort(meses, kind="stable")
+        ordenados = meses[ordem]
+        inicio = np.flatnonzero(np.r_[True, ordenados[1:] != ordenados[:-1]])
+        # Soma em uint64 dá a volta (módulo 2**64), o que para a verificação é o que se quer
+        parciais = np.add.reduceat(hashes[ordem], inicio)
+        contagens = np.diff(np.r_[inicio, len(ordenados)])
+        for mes, quantidade, soma in zip(ordenados[inicio].tolist(), contagens.tolist(), parciais.tolist()):
+            quantidades[mes] = quantidades.get(mes, 0) + quantidade
+            somas[mes] = (somas.get(mes, 0) + soma) % 2**64
+    return colunas, linhas, {str(m): f"{quantidades[m]}-{somas[m]:016x}" for m in sorted(quantidades)}
+
+
+def _partes(nome):
+    return sorted(glob.glob(os.path.join(_pasta(nome), "partes", "parte_*.parquet")))
+
+
+def _normalizar_cubo(cubo, dimensoes):
+    # Depois de juntar cubos com categorias diferentes as dimensões voltam como texto
+    for coluna in dimensoes:
+        if coluna in cubo.columns and not isinstance(cubo[coluna].dtype, pd.CategoricalDtype) \
+                and not pd.api.types.is_numeric_dtype(cubo[coluna]):
+            cubo[coluna] = cubo[coluna].astype("category")
+    return cubo
+
+
+def _nova_parte(nome, estado, df):
+    estado["partes"] += 1
+    _gravar_parquet(df, os.path.join(_pasta(nome), "partes", f"parte_{estado['partes']:05d}.parquet"))
+
+
+def _ingerir(nome, base, estado, fonte, novos, sep, encoding):
+    """Lê em blocos as linhas dos meses `novos`, grava como partes e soma nos agregados guardados."""
+    pasta = _pasta(nome)
+    os.makedirs(os.path.join(pasta, "partes"), exist_ok=True)
+    dimensoes, unidade, esquema = base["dimensoes"], base["unidade"], base["esquema"]
+    selecionados = np.array(novos, dtype=np.int64)
+    cubos, totais, momentos, linhas = [], None, {}, 0
+
+    # Leitura, conversão e soma acontecem juntas, bloco a bloco: é uma etapa só
+    with etapa("agregacao", nome, origem="incremental em blocos") as registro:
+        blocos = pd.read_csv(fonte, sep=sep, encoding=encoding, dtype=tipos_leitura(esquema),
+                             chunksize=TAMANHO_BLOCO)
+        for bloco in blocos:
+            bloco = bloco[np.isin(_chave_mes(bloco), selecionados)]
+            if bloco.empty:
+                continue
+            df = aplicar_esquema(bloco.reset_index(drop=True), esquema)
+            linhas += len(df)
+
+            cubos.append(construir_cubo(df, dimensoes))
+            medidas = [c for c in cubos[-1].columns if c not in dimensoes]
+            parcial = df.groupby(unidade, observed=True)[medidas].sum().astype("float64")
+            # As categorias mudam de um bloco para outro: o índice vira texto comum
+            parcial.index = parcial.index.astype(object)
+            totais = parcial if totais is None else totais.add(parcial, fill_value=0)
+            for medida in medidas:
+                if medida not in momentos:
+                    momentos[medida] = Momentos.de_estado(estado["momentos"].get(medida, {}))
+                momentos[medida].adicionar(df[medida].to_numpy(dtype=np.float64, na_value=np.nan))
+            _nova_parte(nome, estado, df)
+        registro["linhas"] = linhas
+
+    if not cubos:
+        return 0
+    # Um mês pode cair em dois blocos: os cubos parciais são somados de novo no mesmo grão
+    cubo = construir_cubo(pd.concat(cubos, ignore_index=True), dimensoes)
+    caminho_cubo = os.path.join(pasta, "cubo.parquet")
+    if os.path.exists(caminho_cubo):
+        # O grão do cubo inclui ano e mes: as linhas novas nunca coincidem com as antigas
+        cubo = pd.concat([pd.read_parquet(caminho_cubo), cubo], ignore_index=True)
+        cubo = cubo.sort_values([d for d in dimensoes if d in cubo.columns], ignore_index=True)
+    _gravar_parquet(_normalizar_cubo(cubo, dimensoes), caminho_cubo)
+
+    caminho_totais = os.path.join(pasta, "totais.parquet")
+    if os.path.exists(caminho_totais):
+        totais = pd.read_parquet(caminho_totais).set_index(unidade).add(totais, fill_value=0)
+    totais.index.name = unidade
+    _gravar_parquet(totais.sort_index().reset_index(), caminho_totais)
+
+    for medida, acumulador in momentos.items():
+        estado["momentos"][medida] = acumulador.estado()
+    estado["linhas"] += linhas
+    _juntar_partes(nome, estado)
+    return linhas
+
+
+def _juntar_partes(nome, estado):
+    # Muitas partes pequenas deixam a leitura lenta: são juntadas em partes de até
+    # TAMANHO_BLOCO linhas, lendo poucas de cada vez
+    import pyarrow.parquet as pq
+
+    pequenas = [(p, pq.ParquetFile(p).metadata.num_rows) for p in _partes(nome)]
+    pequenas = [(p, n) for p, n in pequenas if n < TAMANHO_BLOCO]
+    if len(pequenas) <= MAXIMO_PARTES:
+        return
+    esquema = {**BASES[nome]["esquema"], "obrigatorias": []}
+    grupo, linhas = [], 0
+    for i, (parte, n) in enumerate(pequenas):
+        grupo.append(parte)
+        linhas += n
+        if linhas >= TAMANHO_BLOCO or i == len(pequenas) - 1:
+            df = pd.concat([pd.read_parquet(p) for p in grupo], ignore_index=True)
+            _nova_parte(nome, estado, aplicar_esquema(df, esquema))
+            for p in grupo:
+                os.remove(p)
+            grupo, linhas = [], 0
+
+
+def _estado_vazio(endereco, colunas):
+    return {"endereco": endereco, "esquema": VERSAO_ESQUEMA, "somas": VERSAO_SOMAS, "colunas": colunas,
+            "marca": None, "meses": {}, "linhas": 0, "partes": 0, "momentos": {}}
+
+
+def atualizar(nome, endereco=None, sep=";", encoding="iso-8859-1"):
+    """Ingere só os meses novos da base `nome` ("cisp" ou "upp") e devolve o resumo da atualização."""
+    base = BASES[nome]
+    endereco = endereco or base["endereco"]
+    estado = _ler_estado(nome)
+    if estado is not None and estado.get("endereco") != endereco:
+        estado = None
+    if estado is not None and modo_offline():
+        return {"base": nome, "modo": "offline", "marca": estado["marca"], "linhas_novas": 0}
+
+    os.makedirs(PASTA_INCREMENTAL, exist_ok=True)
+    download = os.path.join(PASTA_INCREMENTAL, f"{nome}.csv.download")
+    try:
+        with etapa("download", nome, endereco=endereco) as registro:
+            validadores_antigos = (estado.get("etag"), estado.get("last_modified")) if estado else (None, None)
+            fonte, validadores = baixar_se_mudou(endereco, *validadores_antigos, destino=download)
+            registro["bytes"] = os.path.getsize(fonte) if fonte is not None else 0
+        if fonte is None:
+            return {"base": nome, "modo": "sem_mudanca", "marca": estado["marca"], "linhas_novas": 0}
+
+        with etapa("leitura", nome, origem="ano e mes") as registro:
+            colunas, linhas, somas = somas_por_mes(fonte, sep, encoding)
+            registro["linhas"] = linhas
+
+        motivo = None
+        if estado is None:
+            modo, motivo = "inicial", "sem ingestão anterior"
+        elif estado["esquema"] != VERSAO_ESQUEMA or estado["colunas"] != colunas:
+            modo, motivo = "reconstrucao", "colunas ou versão do esquema mudaram"
+        elif estado.get("somas") != VERSAO_SOMAS:
+            modo, motivo = "reconstrucao", "cálculo das somas de verificação mudou"
+        else:
+            alterados = sorted(m for m, soma in estado["meses"].items() if somas.get(m) != soma)
+            novos = sorted(m for m in somas if m not in estado["meses"])
+            marca = estado["marca"][0] * 100 + estado["marca"][1] if estado["marca"] else 0
+            if alterados:
+                modo, motivo = "reconstrucao", f"meses já ingeridos mudaram: {alterados[:12]}"
+            elif any(int(m) <= marca for m in novos):
+                modo, motivo = "reconstrucao", "meses novos anteriores à marca d'água"
+            elif novos:
+                modo = "incremental"
+            else:
+                modo = "sem_mudanca"
+
+        if modo in ("inicial", "reconstrucao"):
+            shutil.rmtree(_pasta(nome), ignore_errors=True)
+            os.makedirs(_pasta(nome))
+            estado = _estado_vazio(endereco, colunas)
+            novos = sorted(somas)
+
+        linhas_novas = 0
+        if novos and modo != "sem_mudanca":
+            linhas_novas = _ingerir(nome, base, estado, fonte, novos, sep, encoding)
+            ultimo = int(novos[-1])
+            estado["marca"] = [ultimo // 100, ultimo % 100]
+            estado["meses"].update({m: somas[m] for m in novos})
+    finally:
+        if os.path.exists(download):
+            os.remove(download)
+
+    estado["etag"], estado["last_modified"] = validadores.get("etag"), validadores.get("last_modified")
+    _gravar_estado(nome, estado)
+    return {"base": nome, "modo": modo, "motivo": motivo, "marca": estado["marca"],
+            "meses_novos": len(novos) if modo != "sem_mudanca" else 0,
+            "linhas_novas": linhas_novas,
+            "linhas_total": estado["linhas"]}
+
+
+def carregar_base(nome, colunas=None):
+    """Todas as linhas já ingeridas da base, com os tipos do esquema."""
+    partes = _partes(nome)
+    if not partes:
+        raise FileNotFoundError(f"Base {nome} ainda não foi ingerida (use atualizar('{nome}'))")
+    df = pd.concat([pd.read_parquet(p, columns=colunas) for p in partes], ignore_index=True)
+    return aplicar_esquema(df, {**BASES[nome]["esquema"], "obrigatorias": []})
+
+
+def carregar_cubo(nome):
+    base = BASES[nome]
+    return CuboISP(pd.read_parquet(os.path.join(_pasta(nome), "cubo.parquet")), base["dimensoes"])
+
+
+def carregar_totais(nome):
+    """Soma de cada indicador por unidade (CISP ou UPP), atualizada a cada mês novo."""
+    totais = pd.read_parquet(os.path.join(_pasta(nome), "totais.parquet"))
+    for coluna in totais.columns[1:]:
+        if np.all(np.mod(totais[coluna].to_numpy(), 1) == 0):
+            totais[coluna] = totais[coluna].astype("int64")
+    return totais
+
+
+def totais_atualizados(nome, valores, endereco=None):
+    """Ingere os meses novos e devolve a unidade e a soma de `valores` (como somar_upp)."""
+    atualizar(nome, endereco)
+    valores = [valores] if isinstance(valores, str) else list(valores)
+    return carregar_totais(nome)[[BASES[nome]["unidade"], *valores]]
+
+
+def estatisticas(nome, amostral=False):
+    """Média, variância, assimetria... das linhas mensais de cada indicador (uma linha por indicador)."""
+    estado = _ler_estado(nome)
+    if estado is None:
+        raise FileNotFoundError(f"Base {nome} ainda não foi ingerida (use atualizar('{nome}'))")
+    resumo = {medida: Momentos.de_estado(m).resumo(amostral) for medida, m in estado["momentos"].items()}
+    return pd.DataFrame.from_dict(resumo, orient="index")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Atualização incremental das bases mensais do ISP")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_atualizar = sub.add_parser("atualizar", help="ingere só os meses novos")
+    p_atualizar.add_argument("bases", nargs="*", help=f"padrão: todas ({', '.join(sorted(BASES))})")
+    p_atualizar.add_argument("--endereco", help="URL ou caminho do CSV (só com uma base)")
+
+    p_estatisticas = sub.add_parser("estatisticas", help="momentos de cada indicador, mantidos por delta")
+    p_estatisticas.add_argument("base", choices=sorted(BASES))
+    p_estatisticas.add_argument("--amostral", action="store_true")
+
+    args = parser.parse_args()
+    if args.comando == "atualizar":
+        if args.endereco and len(args.bases) != 1:
+            parser.error("--endereco só pode ser usado com uma base")
+        for nome in args.bases or sorted(BASES):
+            if nome not in BASES:
+                parser.error(f"base desconhecida: {nome}")
+            resumo = atualizar(nome, args.endereco)
+            print(f"{nome}: {resumo['modo']} (marca {resumo['marca']}, {resumo['linhas_novas']} linhas novas)"
+                  + (f" - {resumo['motivo']}" if resumo.get("motivo") else ""))
+    else:
+        print(estatisticas(args.base, args.amostral).to_string())
+
+
+if __name__ == "__main__":
+    main()
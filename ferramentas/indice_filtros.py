@@ -0,0 +1,84 @@
+# Índice pré-calculado para os filtros de ano × CISP do dashboard
+# As linhas ficam ordenadas por (ano, cisp, mes) e, para cada par (ano, cisp), guarda-se
+# o intervalo [início, fim) das linhas dele; as somas de cada coluna de valor ficam num
+# array denso (ano × cisp × mês). Métricas, série mensal e ranking de qualquer filtro
+# saem só desse array pequeno (anos × CISPs × 12), sem varrer as linhas: o tempo de uma
+# interação não cresce com o histórico. As linhas do filtro (ex.: para o mapa) saem dos
+# intervalos, sem máscara booleana sobre a base inteira.
+import numpy as np
+import pandas as pd
+
+
+def _contagens(somas):
+    # Somas de contagens voltam como inteiros (como no groupby da base)
+    return somas.astype(np.int64) if np.all(np.mod(somas, 1) == 0) else somas
+
+
+class IndiceFiltros:
+    def __init__(self, df, valores, ano="ano", unidade="cisp", mes="mes"):
+        self.valores = list(valores)
+        self.ano, self.unidade = ano, unidade
+
+        df = df.dropna(subset=[ano, unidade, mes])
+        self.df = df.sort_values([ano, unidade, mes], kind="stable").reset_index(drop=True)
+        codigos_ano, self.anos = pd.factorize(self.df[ano], sort=True)
+        codigos_unidade, self.unidades = pd.factorize(self.df[unidade], sort=True)
+        n_anos, n_unidades = len(self.anos), len(self.unidades)
+
+        # Com as linhas ordenadas a chave (ano, cisp) só cresce: o intervalo de cada par
+        # é uma busca binária pelo código dele
+        chave = codigos_ano.astype(np.int64) * n_unidades + codigos_unidade
+        limites = np.searchsorted(chave, np.arange(n_anos * n_unidades + 1))
+        self.inicio = limites[:-1].reshape(n_anos, n_unidades)
+        self.fim = limites[1:].reshape(n_anos, n_unidades)
+
+        posicao = chave * 12 + (self.df[mes].to_numpy(dtype=np.int64) - 1)
+        tamanho = n_anos * n_unidades * 12
+        self.contagem = np.bincount(posicao, minlength=tamanho).reshape(n_anos, n_unidades, 12)
+        self.parciais = np.empty((len(self.valores), n_anos, n_unidades, 12))
+        for i, coluna in enumerate(self.valores):
+            pesos = np.nan_to_num(self.df[coluna].to_numpy(dtype=np.float64, na_value=np.nan))
+            self.parciais[i] = np.bincount(posicao, weights=pesos, minlength=tamanho).reshape(
+                n_anos, n_unidades, 12)
+
+    def _selecao(self, anos, unidades):
+        # Posições dos anos/CISPs escolhidos (os que não existem na base são ignorados)
+        ia = self.anos.get_indexer(pd.Index(np.atleast_1d(anos)).unique())
+        iu = self.unidades.get_indexer(pd.Index(np.atleast_1d(unidades)).unique())
+        return np.sort(ia[ia >= 0]), np.sort(iu[iu >= 0])
+
+    def linhas(self, anos, unidades):
+        """Linhas da base do filtro, na ordem (ano, cisp, mes)."""
+        ia, iu = self._selecao(anos, unidades)
+        inicios = self.inicio[np.ix_(ia, iu)].ravel()
+        tamanhos = self.fim[np.ix_(ia, iu)].ravel() - inicios
+        # Concatena os intervalos [início, fim) sem laço: início de cada um repetido + deslocamento
+        deslocamentos = np.arange(tamanhos.sum()) - np.repeat(np.cumsum(tamanhos) - tamanhos, tamanhos)
+        return self.df.take(np.repeat(inicios, tamanhos) + deslocamentos)
+
+    def totais(self, anos, unidades):
+        """Soma de cada coluna de valor no filtro."""
+        ia, iu = self._selecao(anos, unidades)
+        somas = self.parciais[:, ia][:, :, iu].sum(axis=(1, 2, 3))
+        return pd.Series(_contagens(somas), index=self.valores)
+
+    def serie_mensal(self, anos, unidades, coluna="data"):
+        """Soma mensal de cada coluna de valor no filtro (só os meses com registro)."""
+        ia, iu = self._selecao(anos, unidades)
+        somas = self.parciais[:, ia][:, :, iu].sum(axis=2).reshape(len(self.valores), -1)
+        presentes = self.contagem[ia][:, iu].sum(axis=1).ravel() > 0
+        datas = pd.to_datetime({"year": np.repeat(np.asarray(self.anos[ia]), 12),
+                                "month": np.tile(np.arange(1, 13), len(ia)), "day": 1})
+        serie = pd.DataFrame(_contagens(somas.T), columns=self.valores)
+        serie.insert(0, coluna, datas)
+        return serie[presentes].reset_index(drop=True)
+
+    def ranking(self, anos, unidades, ordenar_por=None):
+        """Soma de cada coluna de valor por CISP no filtro, da maior para a menor."""
+        ia, iu = self._selecao(anos, unidades)
+        somas = self.parciais[:, ia][:, :, iu].sum(axis=(1, 3))
+        presentes = self.contagem[ia][:, iu].sum(axis=(0, 2)) > 0
+        ranking = pd.DataFrame(_contagens(somas.T), columns=self.valores)
+        ranking.insert(0, self.unidade, np.asarray(self.unidades[iu]))
+        ranking = ranking[presentes]
+        return ranking.sort_values(ordenar_por or self.valores[0], ascending=False, kind="stable")
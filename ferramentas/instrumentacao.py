@@ -0,0 +1,263 @@
+# Medição por etapa (download, leitura, agregação, cálculo, renderização) dos pipelines
+# CISP, UPP, CEAPS e deputados: tempo de relógio, tempo de CPU, linhas processadas e
+# pico de memória residente (RSS) de cada etapa.
+#
+#   with etapa("leitura", pipeline="cisp") as registro:
+#       df = ...
+#       registro["linhas"] = len(df)
+#
+#   @instrumentar("calculo", linhas="entrada")   # linhas = len() do 1º argumento
+#   def estatisticas(df, ...): ...                # (padrão: len() do resultado)
+#
+# Desligado por padrão (a etapa não mede nem grava nada). Variáveis de ambiente:
+#   ISP_INSTRUMENTACAO=arquivo.jsonl  uma linha JSON por etapa (".csv": uma linha CSV;
+#                                     "-" ou "1": JSON na saída de erro)
+#   ISP_PERFIL=cprofile,tracemalloc   perfil das etapas de primeiro nível: .prof do cProfile
+#                                     em ISP_PERFIL_DIR (padrão: ./perfis) e/ou pico e maiores
+#                                     alocações vivas do tracemalloc no próprio registro
+# Etapas aninhadas herdam o pipeline da etapa de fora (ou o de configurar(pipeline=...)) e
+# o pico de memória da etapa de fora inclui o das internas. No Linux o pico é zerado a cada
+# etapa (/proc/self/clear_refs); nos outros sistemas fica o pico do processo inteiro até ali.
+import csv
+import datetime
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SAIDA = os.environ.get("ISP_INSTRUMENTACAO", "")
+PERFIL = {p.strip().lower() for p in os.environ.get("ISP_PERFIL", "").split(",") if p.strip()}
+PASTA_PERFIS = os.environ.get("ISP_PERFIL_DIR", "perfis")
+PIPELINE = None
+MAIORES_ALOCACOES = 5
+
+CAMPOS_CSV = ["inicio", "script", "pid", "pipeline", "etapa", "nivel", "segundos", "cpu_segundos",
+              "linhas", "pico_rss_mb", "erro", "detalhes"]
+
+_local = threading.local()
+_trava = threading.Lock()
+_contador = 0
+
+
+# === Memória residente (RSS)
+
+def _ler_status(campo):
+    try:
+        with open("/proc/self/status") as f:
+            for linha in f:
+                if linha.startswith(campo + ":"):
+                    return int(linha.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def zerar_pico_rss():
+    """Zera o pico de RSS do processo; False quando o sistema não permite."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def rss_atual():
+    """Memória residente atual do processo, em bytes (None se não der para ler)."""
+    atual = _ler_status("VmRSS")
+    if atual is None:
+        try:
+            import psutil
+            atual = psutil.Process().memory_info().rss
+        except ImportError:
+            pass
+    return atual
+
+
+def pico_rss():
+    """Maior memória residente do processo (desde o último zerar_pico_rss), em bytes."""
+    pico = _ler_status("VmHWM")
+    if pico is None and resource is not None:
+        maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss vem em KB no Linux e em bytes no macOS
+        pico = maximo if sys.platform == "darwin" else maximo * 1024
+    if pico is None:
+        try:
+            import psutil
+            pico = psutil.Process().memory_info().peak_wset  # Windows
+        except (ImportError, AttributeError):
+            pass
+    return pico
+
+
+# === Configuração e gravação
+
+def configurar(saida=None, perfil=None, pasta_perfis=None, pipeline=None):
+    """Liga/desliga a instrumentação sem variáveis de ambiente (ex.: pela linha de comando).
+
+    `pipeline` é o usado pelas etapas sem pipeline próprio e fora de outra etapa.
+    """
+    global SAIDA, PERFIL, PASTA_PERFIS, PIPELINE
+    if saida is not None:
+        SAIDA = saida
+    if perfil is not None:
+        PERFIL = {perfil} if isinstance(perfil, str) else set(perfil)
+    if pasta_perfis is not None:
+        PASTA_PERFIS = pasta_perfis
+    if pipeline is not None:
+        PIPELINE = pipeline
+
+
+def ativo():
+    return bool(SAIDA or PERFIL)
+
+
+def _script():
+    return os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else "python"
+
+
+def _gravar(registro):
+    with _trava:
+        if SAIDA in ("-", "1") or (not SAIDA and PERFIL):
+            print(json.dumps(registro, ensure_ascii=False, default=str), file=sys.stderr)
+            return
+        pasta = os.path.dirname(SAIDA)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        if SAIDA.lower().endswith(".csv"):
+            novo = not os.path.exists(SAIDA) or os.path.getsize(SAIDA) == 0
+            fixos = {c: registro.get(c) for c in CAMPOS_CSV if c != "detalhes"}
+            extras = {c: v for c, v in registro.items() if c not in fixos}
+            with open(SAIDA, "a", encoding="utf-8", newline="") as f:
+                escritor = csv.DictWriter(f, fieldnames=CAMPOS_CSV)
+                if novo:
+                    escritor.writeheader()
+                escritor.writerow({**fixos, "detalhes": json.dumps(extras, ensure_ascii=False, default=str)
+                                   if extras else ""})
+        else:
+            with open(SAIDA, "a", encoding="utf-8") as f:
+                f.write(json.dumps(registro, ensure_ascii=False, default=str) + "\n")
+
+
+def _pilha():
+    if not hasattr(_local, "pilha"):
+        _local.pilha = []
+    return _local.pilha
+
+
+def _iniciar_perfis(estado):
+    global _contador
+    if "tracemalloc" in PERFIL:
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+    if "cprofile" in PERFIL:
+        import cProfile
+        with _trava:
+            _contador += 1
+            estado["numero"] = _contador
+        estado["perfilador"] = cProfile.Profile()
+        estado["perfilador"].enable()
+
+
+def _encerrar_perfis(estado, registro):
+    perfilador = estado.get("perfilador")
+    if perfilador is not None:
+        perfilador.disable()
+        os.makedirs(PASTA_PERFIS, exist_ok=True)
+        nome = f"{os.path.splitext(registro['script'])[0]}_{registro['pipeline'] or 'geral'}_" \
+               f"{registro['etapa']}_{registro['pid']}_{estado['numero']}.prof"
+        caminho = os.path.join(PASTA_PERFIS, nome)
+        perfilador.dump_stats(caminho)
+        registro["perfil"] = caminho
+    if "tracemalloc" in PERFIL:
+        import tracemalloc
+        registro["pico_tracemalloc_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 3)
+        # As alocações do próprio perfilador não interessam
+        foto = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, "*cProfile.py"),
+                                                          tracemalloc.Filter(False, tracemalloc.__file__)])
+        estatisticas = foto.statistics("lineno")[:MAIORES_ALOCACOES]
+        registro["maiores_alocacoes"] = [f"{e.traceback[0].filename}:{e.traceback[0].lineno} "
+                                         f"{e.size / 2**20:.3f} MB" for e in estatisticas]
+
+
+@contextmanager
+def etapa(nome, pipeline=None, linhas=None, **campos):
+    """Mede o bloco como a etapa `nome`; o registro devolvido aceita "linhas" e outros campos."""
+    if not ativo():
+        yield {"linhas": linhas, **campos}
+        return
+
+    pilha = _pilha()
+    pai = pilha[-1] if pilha else None
+    estado = {"pico": 0}
+    if pai is not None:
+        # O pico da etapa de fora até aqui não pode se perder ao zerar o contador
+        pai["pico"] = max(pai["pico"], pico_rss() or 0)
+    zerar_pico_rss()
+    registro = {
+        "inicio": datetime.datetime.now().isoformat(timespec="milliseconds"),
+        "script": _script(),
+        "pid": os.getpid(),
+        "pipeline": pipeline or (pai["registro"]["pipeline"] if pai else PIPELINE),
+        "etapa": nome,
+        "nivel": len(pilha),
+        "linhas": linhas,
+        **campos,
+    }
+    estado["registro"] = registro
+    if pai is None:
+        _iniciar_perfis(estado)
+    pilha.append(estado)
+    relogio, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield registro
+    except BaseException as e:
+        registro["erro"] = type(e).__name__
+        raise
+    finally:
+        registro["segundos"] = round(time.perf_counter() - relogio, 6)
+        registro["cpu_segundos"] = round(time.process_time() - cpu, 6)
+        pilha.pop()
+        pico = max(pico_rss() or 0, estado["pico"])
+        registro["pico_rss_mb"] = round(pico / 2**20, 3) if pico else None
+        if pai is not None:
+            pai["pico"] = max(pai["pico"], pico)
+        else:
+            _encerrar_perfis(estado, registro)
+        _gravar(registro)
+
+
+def _contar_linhas(resultado):
+    if isinstance(resultado, (str, bytes)) or not hasattr(resultado, "__len__"):
+        return None
+    return len(resultado)
+
+
+def instrumentar(nome, pipeline=None, linhas="resultado"):
+    """Decorador: cada chamada da função vira uma etapa.
+
+    `linhas` diz o que contar: "resultado" (len() do retorno) ou "entrada" (len() do
+    primeiro argumento, ex.: o DataFrame processado).
+    """
+    def decorar(funcao):
+        @functools.wraps(funcao)
+        def medida(*args, **kwargs):
+            with etapa(nome, pipeline, funcao=funcao.__qualname__) as registro:
+                if linhas == "entrada" and args:
+                    registro["linhas"] = _contar_linhas(args[0])
+                resultado = funcao(*args, **kwargs)
+                if registro.get("linhas") is None:
+                    registro["linhas"] = _contar_linhas(resultado)
+                return resultado
+        return medida
+    return decorar
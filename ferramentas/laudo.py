@@ -0,0 +1,90 @@
+# Laudo de eficiência parlamentar (deputados, senadores, vereadores)
+# A classificação é uma tabela de regras avaliada com np.select sobre as colunas
+# inteiras: a primeira regra verdadeira decide a categoria, como no if/elif antigo.
+# As linhas do laudo também são montadas coluna a coluna, sem iterrows().
+import numpy as np
+import pandas as pd
+
+from ferramentas.instrumentacao import instrumentar
+
+COL_PROJETOS = "Projetos de Lei"
+COL_GASTOS = "Gastos Cota Parlamentar (R$)"
+COL_CUSTO = "Custo por Projeto (R$)"
+
+# Limites das regras; troque passando outro dicionário em `limites`
+LIMITES_PADRAO = {
+    "projetos_eficiente": 20,         # >= projetos ...
+    "custo_maximo_eficiente": 10000,  # ... e custo por projeto abaixo disso
+    "projetos_baixa_producao": 5,     # <= projetos ...
+    "gastos_elevados": 100000,        # ... e gastos acima disso
+}
+
+EFICIENTE = "🟢 Altamente Eficiente"
+GASTOS_ELEVADOS = "🔴 Gastos Elevados, Baixa Produção"
+INOPERANTE = "⚫ Inoperante"
+REGULAR = "🟡 Regular"
+CATEGORIAS = [EFICIENTE, GASTOS_ELEVADOS, INOPERANTE, REGULAR]
+
+
+def _regras(projetos, gastos, custo, limites):
+    # (categoria, condição) na ordem de prioridade
+    return [
+        (EFICIENTE, (projetos >= limites["projetos_eficiente"])
+         & ~np.isnan(custo) & (custo < limites["custo_maximo_eficiente"])),
+        (GASTOS_ELEVADOS, (projetos <= limites["projetos_baixa_producao"])
+         & (gastos > limites["gastos_elevados"])),
+        (INOPERANTE, projetos == 0),
+    ]
+
+
+def _numeros(df, coluna):
+    return pd.to_numeric(df[coluna], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+@instrumentar("calculo", linhas="entrada")
+def classificar(df, limites=None, col_gastos=COL_GASTOS):
+    """Retorna a categoria de cada parlamentar (Series categórica alinhada ao df)."""
+    limites = {**LIMITES_PADRAO, **(limites or {})}
+    projetos = _numeros(df, COL_PROJETOS)
+    gastos = _numeros(df, col_gastos)
+    custo = _numeros(df, COL_CUSTO) if COL_CUSTO in df.columns else np.full(len(df), np.nan)
+
+    categorias, condicoes = zip(*_regras(projetos, gastos, custo, limites))
+    codigos = np.select(list(condicoes), list(range(len(categorias))), default=CATEGORIAS.index(REGULAR))
+    return pd.Series(pd.Categorical.from_codes(codigos, CATEGORIAS), index=df.index, name="Categoria")
+
+
+def _formatar_reais(valores):
+    # Equivalente vetorizado de f"{x:.2f}": inteiros em centavos -> "reais.centavos"
+    valores = np.asarray(valores, dtype=np.float64)
+    ausente = np.isnan(valores)
+    centavos = np.round(np.abs(np.where(ausente, 0, valores)) * 100).astype(np.int64)
+    reais = pd.Series(centavos // 100).astype(str)
+    resto = pd.Series(centavos % 100).astype(str).str.zfill(2)
+    sinal = pd.Series(np.where(valores < 0, "-", ""))
+    texto = sinal + reais + "." + resto
+    return texto.where(~ausente, "nan").to_numpy()
+
+
+def linhas_laudo(df, limites=None, col_gastos=COL_GASTOS, identificacao=("UF", "Partido"), categorias=None):
+    """Monta as linhas do laudo ("Nome (UF/Partido): categoria | Projetos: ..., Gasto: ..., Custo/Projeto: ...")."""
+    if categorias is None:
+        categorias = classificar(df, limites, col_gastos)
+    ident = df[identificacao[0]].astype(str)
+    for coluna in identificacao[1:]:
+        ident = ident + "/" + df[coluna].astype(str)
+
+    custo = _numeros(df, COL_CUSTO) if COL_CUSTO in df.columns else np.full(len(df), np.nan)
+    custo_fmt = np.where(np.isnan(custo), "N/A", "R$ " + _formatar_reais(custo))
+
+    return (df["Nome"].astype(str) + " (" + ident + "): " + categorias.astype(str)
+            + " | Projetos: " + df[COL_PROJETOS].astype(str)
+            + ", Gasto: R$ " + _formatar_reais(_numeros(df, col_gastos))
+            + ", Custo/Projeto: " + custo_fmt)
+
+
+def salvar_laudo(linhas, caminho):
+    """Grava todas as linhas de uma vez só."""
+    texto = "\n".join(linhas)
+    with open(caminho, "w", encoding="utf-8") as f:
+        f.write(texto + "\n" if texto else "")
@@ -0,0 +1,88 @@
+# Soma por grupo lendo o CSV do ISP em blocos (streaming)
+# Só as colunas usadas são lidas (usecols), o grupo com o tipo compacto do esquema e
+# as contagens em float64 (inteiros exatos até 2**53, aceita células vazias), e cada
+# bloco é somado e acumulado num total por grupo, também em float64. A tabela
+# completa nunca fica inteira na memória: o pico depende do número de grupos
+# (UPPs, municípios), não do número de linhas mensais do histórico.
+# descrever_em_blocos() faz o mesmo com as medidas descritivas das linhas mensais:
+# quartis e limites pelo esboço de quantis, momentos pelo acumulador Momentos.
+import numpy as np
+import pandas as pd
+
+from ferramentas.cache_isp import URL_CISP, URL_UPP
+from ferramentas.esboco_quantis import EsbocoQuantis
+from ferramentas.esquema_isp import ESQUEMA_CISP, ESQUEMA_UPP, tipo_com_nulos
+from ferramentas.estatisticas import medidas_de_resumos
+from ferramentas.instrumentacao import etapa
+from ferramentas.momentos import Momentos
+
+TAMANHO_BLOCO = 50_000
+
+
+def _tipo_grupo(grupo, esquema):
+    # Tipo declarado no esquema do ISP (ex.: cisp int16); inteiros na versão que aceita nulos
+    tipo = esquema["tipos"].get(grupo, "category") if esquema else "category"
+    return tipo if tipo == "category" else tipo_com_nulos(tipo)
+
+
+def somar_por_grupo_em_blocos(endereco, grupo, valores, sep=";", encoding="iso-8859-1",
+                              tamanho_bloco=TAMANHO_BLOCO, esquema=None):
+    """Retorna um DataFrame com `grupo` e a soma de cada coluna de `valores`, ordenado por `grupo`."""
+    valores = [valores] if isinstance(valores, str) else list(valores)
+    tipos = {grupo: _tipo_grupo(grupo, esquema), **{coluna: "float64" for coluna in valores}}
+
+    total = None
+    # Leitura e soma acontecem juntas, bloco a bloco: é uma etapa só
+    with etapa("agregacao", esquema.get("nome") if esquema else None, origem="csv em blocos") as registro:
+        registro["linhas"] = 0
+        blocos = pd.read_csv(endereco, sep=sep, encoding=encoding, usecols=[grupo, *valores],
+                             dtype=tipos, chunksize=tamanho_bloco)
+        for bloco in blocos:
+            registro["linhas"] += len(bloco)
+            parcial = bloco.groupby(grupo, observed=True)[valores].sum()
+            # As categorias mudam de um bloco para outro: o índice vira texto comum
+            if isinstance(parcial.index.dtype, pd.CategoricalDtype):
+                parcial.index = parcial.index.astype(object)
+            total = parcial if total is None else total.add(parcial, fill_value=0)
+
+    if total is None:
+        return pd.DataFrame(columns=[grupo, *valores])
+
+    total = total.sort_index()
+    total.index.name = grupo
+    # Contagens voltam como inteiros, como no groupby().sum() da tabela inteira
+    for coluna in valores:
+        if np.all(np.mod(total[coluna].to_numpy(), 1) == 0):
+            total[coluna] = total[coluna].astype("int64")
+    return total.reset_index()
+
+
+def somar_upp(valores="recuperacao_veiculos", endereco=URL_UPP, **opcoes):
+    return somar_por_grupo_em_blocos(endereco, "upp", valores, esquema=ESQUEMA_UPP, **opcoes)
+
+
+def somar_cisp(grupo, valores, endereco=URL_CISP, **opcoes):
+    return somar_por_grupo_em_blocos(endereco, grupo, valores, esquema=ESQUEMA_CISP, **opcoes)
+
+
+def descrever_em_blocos(endereco, coluna, erro=0.01, metodo="linear", corrigida=True, sep=";",
+                        encoding="iso-8859-1", tamanho_bloco=TAMANHO_BLOCO, esquema=None):
+    """Medidas descritivas de `coluna` sobre as linhas mensais brutas, lidas em blocos.
+
+    Cada bloco alimenta um EsbocoQuantis (quartis e limites, com erro de rank `erro`) e
+    um Momentos; as linhas nunca ficam todas na memória. Devolve a Series de
+    descrever_distribuicao (as quantidades de outliers são estimadas pelo esboço).
+    """
+    esboco = EsbocoQuantis.com_erro(erro, semente=0)
+    momentos = Momentos()
+    with etapa("calculo", esquema.get("nome") if esquema else None, origem="csv em blocos") as registro:
+        registro["linhas"] = 0
+        blocos = pd.read_csv(endereco, sep=sep, encoding=encoding, usecols=[coluna],
+                             dtype={coluna: "float64"}, chunksize=tamanho_bloco)
+        for bloco in blocos:
+            registro["linhas"] += len(bloco)
+            valores = bloco[coluna].to_numpy()
+            esboco.adicionar(valores)
+            momentos.adicionar(valores)
+    inteiros = momentos.n > 0 and momentos.minimo % 1 == 0 and momentos.maximo % 1 == 0
+    return medidas_de_resumos(momentos, esboco, metodo, corrigida, inteiros=inteiros, nome=coluna)
@@ -0,0 +1,66 @@
+# Camada de marcadores do mapa do dashboard: um marcador por CISP, não por linha mensal
+# Os totais do filtro chegam já somados por CISP (IndiceFiltros.ranking) e as coordenadas
+# entram por um merge só; a camada é uma FeatureCollection GeoJSON com um ponto por CISP,
+# desenhada pelo folium como marcadores (com popup) dentro do MarkerCluster. O HTML do
+# mapa cresce com o número de CISPs, não com o número de meses do filtro.
+# CISPs dos totais sem coordenada ficam fora da camada, mas não em silêncio: vão para
+# colecao["ausentes"] e a quantidade sai num aviso (warnings).
+#   colecao = camada_cisp(totais, coordenadas, ["letalidade_violenta", ...])
+#   html = renderizar_mapa(colecao, rotulos={"letalidade_violenta": "Letalidade"})
+# Pendência: ferramentas/dados/cisp_geodados.csv só tem coordenadas de 10 CISPs (amostra);
+# falta carregar as de todas as delegacias da base para o mapa ficar completo.
+import warnings
+
+import numpy as np
+
+CENTRO_RJ = [-22.9, -43.2]
+
+
+def camada_cisp(totais, coordenadas, colunas, unidade="cisp"):
+    """FeatureCollection com um ponto por CISP dos totais que tem coordenada.
+
+    `coordenadas` é um DataFrame com a coluna `unidade`, latitude e longitude. As CISPs
+    dos totais sem coordenada ficam na lista "ausentes" da coleção.
+    """
+    pontos = totais.merge(coordenadas[[unidade, "latitude", "longitude"]], on=unidade, how="left")
+    sem_coordenada = pontos["latitude"].isna().to_numpy() | pontos["longitude"].isna().to_numpy()
+    ausentes = pontos.loc[sem_coordenada, unidade].tolist()
+    if ausentes:
+        warnings.warn(f"{len(ausentes)} de {len(pontos)} CISPs sem coordenada ficaram fora do mapa",
+                      stacklevel=2)
+    pontos = pontos[~sem_coordenada]
+    propriedades = pontos[[unidade] + list(colunas)]
+    # Inteiros do NumPy não são serializáveis em JSON: tolist() devolve tipos do Python
+    registros = [dict(zip(propriedades.columns, linha)) for linha in propriedades.to_numpy(dtype=object).tolist()]
+    posicoes = np.column_stack([pontos["longitude"].to_numpy(dtype=float),
+                                pontos["latitude"].to_numpy(dtype=float)]).tolist()
+    return {
+        "type": "FeatureCollection",
+        "features": [{"type": "Feature", "geometry": {"type": "Point", "coordinates": posicao},
+                      "properties": registro}
+                     for posicao, registro in zip(posicoes, registros)],
+        "ausentes": ausentes,
+    }
+
+
+def montar_mapa(colecao, rotulos=None, centro=CENTRO_RJ, zoom=11):
+    """folium.Map com a camada de CISPs agrupada num MarkerCluster."""
+    import folium
+    from folium.plugins import MarkerCluster
+
+    mapa = folium.Map(location=centro, zoom_start=zoom)
+    agrupador = MarkerCluster().add_to(mapa)
+    if colecao["features"]:
+        campos = list(colecao["features"][0]["properties"])
+        rotulos = rotulos or {}
+        folium.GeoJson(
+            colecao,
+            marker=folium.Marker(icon=folium.Icon(color="red", icon="info-sign")),
+            popup=folium.GeoJsonPopup(fields=campos, aliases=[f"{rotulos.get(c, c)}:" for c in campos]),
+        ).add_to(agrupador)
+    return mapa
+
+
+def renderizar_mapa(colecao, rotulos=None, centro=CENTRO_RJ, zoom=11):
+    """HTML completo do mapa (para guardar em cache e mostrar sem remontar)."""
+    return montar_mapa(colecao, rotulos, centro, zoom).get_root().render()
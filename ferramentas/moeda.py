@@ -0,0 +1,80 @@
+# Conversão vetorizada de valores monetários no formato brasileiro
+# Aceita "1.234,56", "R$ 1.234,56", "1234,56", "1234.56", "-1.234,56", "(1.234,56)",
+# "1.234,56-", "null", "" e valores já numéricos. Toda a coluna é tratada de uma vez
+# com as funções de texto do Arrow (pyarrow.compute), sem laço em Python.
+# pip install pyarrow
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = pc = None
+
+_NUMERO = r"^\d+(\.\d+)?$"
+_MILHAR_COM_PONTO = r"^\d{1,3}(\.\d{3})+$"
+
+
+def _limpar_arrow(texto):
+    # texto: pyarrow.StringArray -> (texto só com dígitos e ponto decimal, máscara de negativos)
+    texto = pc.replace_substring_regex(texto, r"R\$|\s", "")
+    negativo = pc.or_(
+        pc.or_(pc.starts_with(texto, "-"), pc.ends_with(texto, "-")),
+        pc.and_(pc.starts_with(texto, "("), pc.ends_with(texto, ")")),
+    )
+    texto = pc.replace_substring_regex(texto, r"[()+\-]", "")
+
+    # Com vírgula: ponto é separador de milhar. Sem vírgula: ponto só é milhar
+    # quando separa grupos de três dígitos ("1.234"), senão é decimal ("1234.5")
+    ponto_milhar = pc.or_(
+        pc.match_substring(texto, ","),
+        pc.match_substring_regex(texto, _MILHAR_COM_PONTO),
+    )
+    sem_milhar = pc.replace_substring(texto, ".", "")
+    texto = pc.if_else(ponto_milhar, sem_milhar, texto)
+    texto = pc.replace_substring(texto, ",", ".")
+
+    # "null", "-", "" e qualquer texto que não seja número viram nulo
+    texto = pc.if_else(pc.match_substring_regex(texto, _NUMERO), texto, pa.scalar(None, pa.string()))
+    return texto, negativo
+
+
+def _limpar_pandas(texto):
+    # Mesmo tratamento com os métodos .str do pandas (sem pyarrow instalado)
+    texto = texto.str.replace(r"R\$|\s", "", regex=True)
+    negativo = (texto.str.startswith("-") | texto.str.endswith("-")
+                | (texto.str.startswith("(") & texto.str.endswith(")")))
+    texto = texto.str.replace(r"[()+\-]", "", regex=True)
+    ponto_milhar = texto.str.contains(",", regex=False) | texto.str.match(_MILHAR_COM_PONTO)
+    texto = texto.where(~ponto_milhar.fillna(False).astype(bool), texto.str.replace(".", "", regex=False))
+    texto = texto.str.replace(",", ".", regex=False)
+    texto = texto.where(texto.str.match(_NUMERO).fillna(False).astype(bool))
+    return texto, negativo.fillna(False).astype(bool)
+
+
+def converter_moeda_br(serie, centavos=False):
+    """Converte uma coluna de valores em reais para float64 (ou centavos em Int64).
+
+    Valores ausentes ou inválidos viram NaN (ou <NA> em centavos).
+    """
+    if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+        valores = serie.to_numpy(dtype=np.float64, na_value=np.nan)
+    elif pc is not None:
+        texto = pa.array(serie, type=pa.string(), from_pandas=True) \
+            if not isinstance(serie.dtype, pd.ArrowDtype) else pa.array(serie.array)
+        if texto.type != pa.string():
+            texto = pc.cast(texto, pa.string())
+        texto, negativo = _limpar_arrow(texto)
+        valores = pc.cast(texto, pa.float64()).to_numpy(zero_copy_only=False)
+        sinal = np.where(negativo.to_numpy(zero_copy_only=False), -1.0, 1.0)
+        valores = valores * sinal
+    else:
+        texto, negativo = _limpar_pandas(serie.astype("string"))
+        valores = pd.to_numeric(texto, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        valores = np.where(negativo.to_numpy(), -valores, valores)
+
+    if centavos:
+        inteiros = pd.array(np.round(valores * 100), dtype="Float64").astype("Int64")
+        return pd.Series(inteiros, index=serie.index, name=serie.name)
+    return pd.Series(valores, index=serie.index, name=serie.name)
@@ -0,0 +1,152 @@
+# Acumulador dos quatro primeiros momentos (média, variância, assimetria e curtose)
+# em um único passe pelos dados. Cada bloco é resumido de forma vetorizada e os
+# resumos são combinados com as fórmulas de Welford/Pébay, então o acumulador pode
+# ser alimentado em blocos e mesclado entre processos sem guardar os valores.
+#
+# Os estimadores são explícitos:
+#   variancia() / desvio_padrao()        populacional (np.var, np.std)
+#   variancia(amostral=True)             amostral, ddof=1 (Series.var, Series.std)
+#   assimetria() / curtose()             com viés (scipy.stats.skew, kurtosis)
+#   assimetria(corrigida=True) / curtose(corrigida=True)
+#                                        sem viés (Series.skew, Series.kurtosis)
+#
+# de_segmentos() resume vários grupos de uma vez (valores agrupados em segmentos
+# contíguos, como em estatisticas_por_grupo): os campos viram arrays, um item por grupo,
+# e os estimadores devolvem arrays. mesclar() e estado() são de um grupo só.
+import numpy as np
+
+
+def _escalar(valor):
+    # Um grupo só: float comum; vários grupos: o array
+    return float(valor) if np.ndim(valor) == 0 else valor
+
+
+class Momentos:
+    def __init__(self):
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0  # somas dos desvios em relação à média, elevados a 2, 3 e 4
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.minimo = np.inf
+        self.maximo = -np.inf
+
+    @classmethod
+    def de_valores(cls, valores):
+        return cls().adicionar(valores)
+
+    @classmethod
+    def de_segmentos(cls, valores, inicio, tamanho):
+        """Momentos de cada segmento valores[inicio:inicio + tamanho] (sem NaN, nenhum vazio)."""
+        valores = np.asarray(valores, dtype=np.float64)
+        momentos = cls()
+        momentos.n = np.asarray(tamanho, dtype=np.int64)
+        momentos.media = np.add.reduceat(valores, inicio) / momentos.n
+        desvio = valores - np.repeat(momentos.media, momentos.n)
+        desvio2 = desvio * desvio
+        momentos.m2 = np.add.reduceat(desvio2, inicio)
+        momentos.m3 = np.add.reduceat(desvio2 * desvio, inicio)
+        momentos.m4 = np.add.reduceat(desvio2 * desvio2, inicio)
+        momentos.minimo = np.minimum.reduceat(valores, inicio)
+        momentos.maximo = np.maximum.reduceat(valores, inicio)
+        return momentos
+
+    @classmethod
+    def de_estado(cls, estado):
+        """Recria o acumulador gravado por estado() (ex.: em JSON)."""
+        momentos = cls()
+        momentos.__dict__.update(estado)
+        return momentos
+
+    def estado(self):
+        return {chave: float(valor) if chave != "n" else int(valor) for chave, valor in self.__dict__.items()}
+
+    def adicionar(self, valores):
+        valores = np.asarray(valores, dtype=np.float64).ravel()
+        valores = valores[~np.isnan(valores)]
+        if valores.size == 0:
+            return self
+        bloco = Momentos()
+        bloco.n = valores.size
+        bloco.media = valores.mean()
+        desvio = valores - bloco.media
+        desvio2 = desvio * desvio
+        bloco.m2 = desvio2.sum()
+        bloco.m3 = (desvio2 * desvio).sum()
+        bloco.m4 = (desvio2 * desvio2).sum()
+        bloco.minimo = valores.min()
+        bloco.maximo = valores.max()
+        return self.mesclar(bloco)
+
+    def mesclar(self, outro):
+        """Combina os momentos de outro bloco/processo (fórmulas de Pébay)."""
+        if outro.n == 0:
+            return self
+        if self.n == 0:
+            self.__dict__.update(outro.__dict__)
+            return self
+        na, nb = float(self.n), float(outro.n)
+        n = na + nb
+        delta = outro.media - self.media
+        delta2 = delta * delta
+
+        m4 = (self.m4 + outro.m4
+              + delta2 * delta2 * na * nb * (na * na - na * nb + nb * nb) / n ** 3
+              + 6 * delta2 * (na * na * outro.m2 + nb * nb * self.m2) / n ** 2
+              + 4 * delta * (na * outro.m3 - nb * self.m3) / n)
+        m3 = (self.m3 + outro.m3
+              + delta2 * delta * na * nb * (na - nb) / n ** 2
+              + 3 * delta * (na * outro.m2 - nb * self.m2) / n)
+        m2 = self.m2 + outro.m2 + delta2 * na * nb / n
+
+        self.n = self.n + outro.n
+        self.media = self.media + delta * nb / n
+        self.m2, self.m3, self.m4 = m2, m3, m4
+        self.minimo = min(self.minimo, outro.minimo)
+        self.maximo = max(self.maximo, outro.maximo)
+        return self
+
+    def variancia(self, amostral=False):
+        ddof = 1 if amostral else 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return _escalar(np.where(self.n > ddof, np.float64(self.m2) / (self.n - ddof), np.nan))
+
+    def desvio_padrao(self, amostral=False):
+        return _escalar(np.sqrt(self.variancia(amostral)))
+
+    def coeficiente_variacao(self, amostral=False):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return _escalar(np.where(self.media != 0, self.desvio_padrao(amostral) / np.float64(self.media), np.nan))
+
+    def assimetria(self, corrigida=False):
+        n = np.asarray(self.n, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            g1 = np.sqrt(n) * self.m3 / np.float64(self.m2) ** 1.5
+            if corrigida:
+                g1 = g1 * np.sqrt(n * (n - 1)) / (n - 2)
+        g1 = np.where(self.m2 == 0, 0.0, g1)
+        return _escalar(np.where(n < (3 if corrigida else 1), np.nan, g1))
+
+    def curtose(self, corrigida=False):
+        """Curtose em excesso (normal = 0)."""
+        n = np.asarray(self.n, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            g2 = n * self.m4 / np.float64(self.m2) ** 2 - 3.0
+            if corrigida:
+                g2 = ((n + 1) * g2 + 6) * (n - 1) / ((n - 2) * (n - 3))
+        g2 = np.where(self.m2 == 0, 0.0, g2)
+        return _escalar(np.where(n < (4 if corrigida else 1), np.nan, g2))
+
+    def resumo(self, amostral=False):
+        """Medidas em dicionário; `amostral` escolhe os estimadores sem viés."""
+        return {
+            "n": self.n,
+            "media": self.media,
+            "minimo": self.minimo,
+            "maximo": self.maximo,
+            "variancia": self.variancia(amostral),
+            "desvio_padrao": self.desvio_padrao(amostral),
+            "coeficiente_variacao": self.coeficiente_variacao(amostral),
+            "assimetria": self.assimetria(corrigida=amostral),
+            "curtose": self.curtose(corrigida=amostral),
+        }
@@ -0,0 +1,203 @@
+# Painel 2x2 por região (boxplot, maiores/outliers superiores, menores/outliers
+# inferiores e quadro de medidas), usado pelo aula_21/exemplo3.py.
+#
+# desenhar_painel() só mexe na Figure recebida, então serve tanto para a tela
+# (plt.figure + plt.show) quanto para o modo em lote, que grava PNG/SVG sem
+# abrir janela (backend Agg) e distribui as regiões entre vários processos.
+# Cada processo cria uma única Figure e a limpa (clf) entre uma região e outra.
+# Maiores, menores e outliers chegam prontos (extremos_por_grupo): as barras dos
+# maiores saem dos 5 maiores já selecionados e ordenados (k_maiores) e o painel só
+# ordena os poucos menores/outliers inferiores que desenha.
+import json
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from ferramentas.estatisticas import extremos_do_grupo, extremos_por_grupo
+from ferramentas.instrumentacao import instrumentar
+
+REGIOES_POR_CISP = ['Capital', 'Grande Niterói']
+ARQUIVO_INDICE_PAINEIS = "indice.json"
+
+# Figure do processo trabalhador (criada uma vez no initializer)
+_FIGURA = None
+
+
+def _barras_com_nomes(ax, dados, coluna, valor):
+    # Colunas com o nome (município ou delegacia) escrito na vertical dentro da barra
+    colunas = ax.bar(dados[coluna].astype(str), dados[valor], color='gray')
+    ax.bar_label(colunas, label_type='edge', fontsize=8, padding=2)
+    ax.set_xticks([])
+    nomes = dados[coluna].astype(str).to_numpy()
+    for i, barra in enumerate(colunas):
+        ax.text(i, barra.get_height() * 0.03, nomes[i],
+                rotation=90, ha='center', va='bottom', fontsize=8, color='black')
+
+
+def desenhar_painel(fig, regiao, df_regiao, medidas, valor='roubo_veiculo', extremos=None):
+    """Desenha o painel da região na Figure `fig` (que é limpa antes).
+
+    `extremos` é o item da região em extremos_por_grupo; sem ele, é calculado aqui.
+    """
+    fig.clf()
+
+    # Capital e Grande Niterói são analisadas por delegacia; as demais por município
+    if regiao in REGIOES_POR_CISP:
+        cisp_or_munic = 'cisp'
+        titulo_maiores = 'Delegacias com Maiores Registros de Roubos'
+        titulo_menores = 'Delegacias com Menores Registros de Roubos'
+    else:
+        cisp_or_munic = 'munic'
+        titulo_maiores = 'Municípios com Maiores Roubos'
+        titulo_menores = 'Municípios com Menores Roubos'
+
+    if extremos is None:
+        extremos = extremos_do_grupo(df_regiao, valor, medidas)
+    serie = df_regiao[valor]
+    # Listas na ordem das linhas; k_maiores já vem em ordem decrescente
+    menores = extremos['menores']
+    maiores = extremos['maiores']
+    outliers_inferiores = extremos['outliers_inferiores']
+    outliers_superiores = extremos['outliers_superiores']
+    k_maiores = extremos['k_maiores']
+
+    eixos = fig.subplots(2, 2)
+    fig.suptitle(f'Análise - Região: {regiao}', fontsize=16, fontweight='bold')
+
+    # PLOT 1: Boxplot
+    eixos[0, 0].boxplot(np.asarray(serie), vert=False, showmeans=True)
+
+    # PLOT 2: outliers superiores, senão os 5 maiores, senão o único registro
+    ax = eixos[0, 1]
+    if not outliers_superiores.empty or len(maiores) > 1:
+        # Os 5 maiores da região que passam do limite superior (ou de Q3)
+        limite, cor, titulo = (medidas['limite_superior'], 'green', 'Outliers Superiores') \
+            if not outliers_superiores.empty else (medidas['q3'], 'red', titulo_maiores)
+        dados = k_maiores[k_maiores[valor] > limite].iloc[::-1]
+        barras = ax.barh(dados[cisp_or_munic].astype(str), dados[valor], color=cor)
+        ax.bar_label(barras, label_type='edge', fontsize=8, padding=2)
+        ax.set_title(titulo)
+    else:
+        linha = maiores.iloc[0] if len(maiores) == 1 else df_regiao.iloc[0]
+        ax.text(0.5, 0.5, f"Município: {linha[cisp_or_munic]}\nRoubos: {linha[valor]}",
+                ha='center', va='center', fontsize=12)
+        if len(maiores) != 1:
+            ax.set_xticks([])
+            ax.set_yticks([])
+            ax.set_title('Município com Maior Roubo')
+
+    # PLOT 3: outliers inferiores, senão os menores, senão todos os municípios
+    ax = eixos[1, 0]
+    if not outliers_inferiores.empty:
+        _barras_com_nomes(ax, outliers_inferiores.sort_values(by=valor, ascending=False, kind='stable'),
+                          cisp_or_munic, valor)
+        ax.set_title('Outliers Inferiores')
+    elif len(menores) > 1:
+        _barras_com_nomes(ax, menores.sort_values(by=valor, kind='stable'), cisp_or_munic, valor)
+        ax.set_title(titulo_menores)
+    else:
+        _barras_com_nomes(ax, df_regiao.sort_values(by=valor, ascending=False), cisp_or_munic, valor)
+        ax.set_title('Todos os Municípios')
+
+    # PLOT 4: quadro com as medidas (coordenadas relativas à área do gráfico)
+    ax = eixos[1, 1]
+    ax.set_title('Medidas Estatísticas')
+    textos = [
+        (0.1, 0.9, f"Limite inferior: {medidas['limite_inferior']}"),
+        (0.1, 0.8, f"Menor valor: {medidas['minimo']}"),
+        (0.1, 0.7, f"Q1: {medidas['q1']}"),
+        (0.1, 0.6, f"Mediana: {medidas['mediana']}"),
+        (0.1, 0.5, f"Q3: {medidas['q3']}"),
+        (0.1, 0.4, f"Média: {medidas['media']:.3f}"),
+        (0.1, 0.3, f"Maior valor: {medidas['maximo']}"),
+        (0.1, 0.2, f"Limite superior: {medidas['limite_superior']}"),
+        (0.5, 0.9, f"Distância Média e Mediana: {medidas['distancia_media_mediana']:.4f}"),
+        (0.5, 0.8, f"IQR: {medidas['iqr']}"),
+        (0.5, 0.7, f"Amplitude Total: {medidas['amplitude_total']}"),
+        (0.5, 0.6, f"Variância: {medidas['variancia']:.5f}"),
+        (0.5, 0.5, f"Desvio Padrão: {medidas['desvio_padrao']:.5f}"),
+        (0.5, 0.4, f"Distância Média para Variância: {medidas['distancia_variancia_media']:.5f}"),
+        (0.5, 0.3, f"Coeficiente de Variação: {medidas['coeficiente_variacao']:.5f}"),
+        (0.5, 0.2, f"Assimetria: {medidas['assimetria']:.5f}"),
+        (0.5, 0.1, f"Curtose: {medidas['curtose']:.5f}"),
+    ]
+    for x, y, texto in textos:
+        ax.text(x, y, texto, fontsize=10)
+    ax.set_xticks([])
+    ax.set_yticks([])
+
+    fig.tight_layout()
+    return fig
+
+
+def _nome_arquivo(regiao):
+    # "Baixada Fluminense" -> "baixada_fluminense" (acentos são mantidos)
+    return re.sub(r"\W+", "_", str(regiao).strip().lower()).strip("_") or "regiao"
+
+
+def _iniciar_trabalhador(tamanho, dpi):
+    # Figure própria do processo, sem pyplot: canvas Agg, nenhuma janela é aberta
+    global _FIGURA
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    _FIGURA = Figure(figsize=tamanho, dpi=dpi)
+    FigureCanvasAgg(_FIGURA)
+
+
+def _renderizar(regiao, df_regiao, medidas, extremos, pasta, formatos, valor):
+    inicio = time.perf_counter()
+    desenhar_painel(_FIGURA, regiao, df_regiao, medidas, valor, extremos)
+    arquivos = []
+    for formato in formatos:
+        caminho = os.path.join(pasta, f"{_nome_arquivo(regiao)}.{formato}")
+        _FIGURA.savefig(caminho, format=formato)
+        arquivos.append(caminho)
+    return arquivos, time.perf_counter() - inicio
+
+
+@instrumentar("renderizacao")
+def renderizar_paineis(df, estatisticas, pasta, grupo='regiao', valor='roubo_veiculo',
+                       formatos=("png",), processos=None, tamanho=(18, 10), dpi=100):
+    """Grava o painel de cada região em `pasta` e devolve o índice dos arquivos gerados.
+
+    `estatisticas` é a tabela de estatisticas_por_grupo (uma linha por região).
+    O índice também é gravado em `pasta`/indice.json.
+    """
+    os.makedirs(pasta, exist_ok=True)
+    indice = []
+    # Maiores, menores e outliers de todas as regiões numa passada só, antes de distribuir
+    extremos = extremos_por_grupo(df, grupo, valor, estatisticas)
+    # "fork" evita que os processos reexecutem o script chamador (os exemplos não têm
+    # if __name__ == "__main__"); onde não existe (Windows), fica o padrão
+    metodos = multiprocessing.get_all_start_methods()
+    contexto = multiprocessing.get_context("fork") if "fork" in metodos else None
+    with ProcessPoolExecutor(max_workers=processos, mp_context=contexto,
+                             initializer=_iniciar_trabalhador, initargs=(tamanho, dpi)) as executor:
+        futuros = {}
+        for regiao, df_regiao in df.groupby(grupo, sort=False):
+            if regiao not in estatisticas.index:
+                continue
+            medidas = estatisticas.loc[regiao].to_dict()
+            futuro = executor.submit(_renderizar, regiao, df_regiao, medidas, extremos.get(regiao),
+                                     pasta, tuple(formatos), valor)
+            futuros[futuro] = regiao
+
+        for futuro in as_completed(futuros):
+            regiao = futuros[futuro]
+            try:
+                arquivos, segundos = futuro.result()
+                indice.append({"regiao": regiao, "arquivos": arquivos, "segundos": round(segundos, 3)})
+                print(f"✔ {regiao}: {', '.join(arquivos)}")
+            except Exception as e:
+                indice.append({"regiao": regiao, "arquivos": [], "erro": str(e)})
+                print(f"Erro plotar painel ({regiao}): {e}")
+
+    indice.sort(key=lambda item: str(item["regiao"]))
+    with open(os.path.join(pasta, ARQUIVO_INDICE_PAINEIS), "w", encoding="utf-8") as f:
+        json.dump({"gerado_em": time.strftime("%Y-%m-%d %H:%M:%S"), "paineis": indice},
+                  f, indent=2, ensure_ascii=False)
+    return indice
@@ -0,0 +1,176 @@
+# Séries mensais dos indicadores do ISP como arrays densos do NumPy
+# Cada indicador vira uma matriz (unidade × mês) – CISP ou UPP nas linhas, todos os
+# meses do período nas colunas, NaN onde a unidade não tem registro –, empilhadas
+# num array (indicador × unidade × mês). Montado uma vez, tudo o mais são operações
+# sobre o array inteiro, para todos os indicadores e todas as unidades de uma vez:
+#   movel()                 somas/médias móveis (somas acumuladas, sem laço por janela)
+#   variacao_anual()        diferença (ou variação %) para o mesmo mês do ano anterior
+#   decompor()              tendência (média móvel centrada 2×12), sazonalidade e resíduo
+#   tendencia()             inclinação da reta de mínimos quadrados por unidade
+import warnings
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+INDICADORES_CRIMES = [
+    'hom_doloso', 'lesao_corp_morte', 'latrocinio', 'cvli', 'hom_por_interv_policial',
+    'letalidade_violenta', 'roubo_veiculo', 'roubo_celular', 'roubo_transeunte',
+    'furto_veiculos', 'furto_celular', 'estupro', 'sequestro', 'extorsao', 'estelionato',
+]
+
+Decomposicao = namedtuple("Decomposicao", ["tendencia", "sazonal", "residuo"])
+
+
+def _ordinal_mes(df, ano, mes, data):
+    # Meses contados a partir de jan/1970 (o mesmo ordinal do pd.Period mensal)
+    if data is not None:
+        datas = df[data]
+        if not isinstance(datas.dtype, pd.PeriodDtype):
+            if not pd.api.types.is_datetime64_any_dtype(datas):
+                # "2003m01" (mes_ano da base do ISP) ou qualquer texto que o pandas entenda
+                datas = pd.to_datetime(datas.astype(str).str.replace("m", "-", regex=False), errors="coerce")
+            datas = datas.dt.to_period("M")
+        return datas.array.asi8
+    return (df[ano].to_numpy(dtype=np.int64) - 1970) * 12 + df[mes].to_numpy(dtype=np.int64) - 1
+
+
+def _soma_movel(valores, janela):
+    # Soma das últimas `janela` posições do último eixo; NaN sem a janela completa
+    validos = ~np.isnan(valores)
+    acumulado = np.cumsum(np.where(validos, valores, 0.0), axis=-1)
+    contagem = np.cumsum(validos, axis=-1)
+    zeros = np.zeros(valores.shape[:-1] + (1,))
+    acumulado = np.concatenate([zeros, acumulado], axis=-1)
+    contagem = np.concatenate([zeros, contagem], axis=-1)
+    soma = acumulado[..., janela:] - acumulado[..., :-janela]
+    completos = (contagem[..., janela:] - contagem[..., :-janela]) == janela
+    resultado = np.full(valores.shape, np.nan)
+    resultado[..., janela - 1:] = np.where(completos, soma, np.nan)
+    return resultado
+
+
+class SeriesMensais:
+    def __init__(self, valores, indicadores, unidades, meses):
+        self.valores = valores            # (indicador × unidade × mês), float64
+        self.indicadores = list(indicadores)
+        self.unidades = np.asarray(unidades)
+        self.meses = meses                # pd.PeriodIndex mensal, sem buracos
+
+    @classmethod
+    def de_tabela(cls, df, indicadores=None, unidade="cisp", ano="ano", mes="mes", data=None):
+        """Monta o array a partir das linhas mensais (ou do cubo); linhas repetidas são somadas.
+
+        O mês vem de `ano` e `mes` ou, com `data`, de uma coluna de datas/períodos
+        (ex.: mes_ano no formato "2003m01").
+        """
+        indicadores = INDICADORES_CRIMES if indicadores is None else list(indicadores)
+        ordinais = _ordinal_mes(df, ano, mes, data)
+        validos = ordinais != np.iinfo(np.int64).min  # NaT
+        codigos, unidades = pd.factorize(df[unidade], sort=True)
+        validos &= codigos >= 0
+        codigos, ordinais = codigos[validos], ordinais[validos]
+
+        inicio = ordinais.min()
+        n_meses = int(ordinais.max() - inicio + 1)
+        posicao = codigos * n_meses + (ordinais - inicio)
+        tamanho = len(unidades) * n_meses
+
+        presente = np.bincount(posicao, minlength=tamanho) > 0
+        valores = np.empty((len(indicadores), tamanho))
+        for i, indicador in enumerate(indicadores):
+            coluna = df[indicador].to_numpy(dtype=np.float64, na_value=np.nan)[validos]
+            # Mês sem registro do indicador (NaN) conta como zero dentro da soma do mês
+            valores[i] = np.bincount(posicao, weights=np.nan_to_num(coluna), minlength=tamanho)
+        valores[:, ~presente] = np.nan
+
+        meses = pd.period_range(pd.Period(ordinal=int(inicio), freq="M"), periods=n_meses, freq="M")
+        return cls(valores.reshape(len(indicadores), len(unidades), n_meses), indicadores,
+                   np.asarray(unidades), meses)
+
+    # === Acesso
+
+    def _indice(self, indicador):
+        return self.indicadores.index(indicador)
+
+    def total(self):
+        """Soma de todas as unidades em cada mês (indicador × mês); NaN nos meses sem registro."""
+        presentes = (~np.isnan(self.valores)).any(axis=1)
+        return np.where(presentes, np.nansum(self.valores, axis=1), np.nan)
+
+    def tabela(self, array, indicador):
+        """DataFrame unidade × mês de um indicador, a partir de um array no formato de `valores`."""
+        return pd.DataFrame(array[self._indice(indicador)], index=self.unidades, columns=self.meses)
+
+    def serie(self, indicador, unidade=None, array=None):
+        """Série mensal de um indicador (de uma unidade ou, sem `unidade`, do total)."""
+        if array is None:
+            array = self.valores if unidade is not None else self.total()
+        linha = array[self._indice(indicador)]
+        if unidade is not None:
+            linha = linha[np.flatnonzero(self.unidades == unidade)[0]]
+        return pd.Series(linha, index=self.meses, name=indicador)
+
+    # === Operações vetorizadas (último eixo = meses; servem para valores ou total())
+
+    def movel(self, janela=12, media=False, array=None):
+        """Soma (ou média) móvel das últimas `janela` meses; NaN sem a janela completa."""
+        array = self.valores if array is None else array
+        soma = _soma_movel(array, janela)
+        return soma / janela if media else soma
+
+    def variacao_anual(self, relativa=False, array=None):
+        """Valor do mês menos o do mesmo mês do ano anterior (ou a variação relativa)."""
+        array = self.valores if array is None else array
+        resultado = np.full(array.shape, np.nan)
+        atual, anterior = array[..., 12:], array[..., :-12]
+        if relativa:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                resultado[..., 12:] = np.where(anterior != 0, atual / anterior - 1, np.nan)
+        else:
+            resultado[..., 12:] = atual - anterior
+        return resultado
+
+    def decompor(self, array=None, periodo=12):
+        """Decomposição clássica aditiva: tendência (média móvel centrada 2×periodo),
+        sazonalidade (média de cada mês do ano sem a tendência, somando zero) e resíduo."""
+        array = self.valores if array is None else array
+        # Média móvel de `periodo` meses seguida de uma de 2 meses, centrada no mês
+        dupla = _soma_movel(_soma_movel(array, periodo), 2) / (2 * periodo)
+        tendencia = np.full(array.shape, np.nan)
+        deslocamento = periodo // 2
+        tendencia[..., :-deslocamento] = dupla[..., deslocamento:]
+
+        sem_tendencia = array - tendencia
+        # Mês do calendário de cada coluna (0 = janeiro)
+        mes_calendario = np.asarray(self.meses.month) - 1 if periodo == 12 else np.arange(array.shape[-1]) % periodo
+        indices = np.full(array.shape[:-1] + (periodo,), np.nan)
+        with warnings.catch_warnings():
+            # Mês do calendário sem nenhum valor (unidade nova) dá NaN, sem aviso
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            for m in range(periodo):
+                indices[..., m] = np.nanmean(sem_tendencia[..., mes_calendario == m], axis=-1)
+            indices -= np.nanmean(indices, axis=-1, keepdims=True)
+        sazonal = indices[..., mes_calendario]
+        sazonal = np.where(np.isnan(array), np.nan, sazonal)
+        return Decomposicao(tendencia, sazonal, array - tendencia - sazonal)
+
+    def tendencia(self, array=None, ultimos=None):
+        """Inclinação (casos por mês) da reta de mínimos quadrados de cada série, nos `ultimos` meses."""
+        array = self.valores if array is None else array
+        if ultimos:
+            array = array[..., -ultimos:]
+        validos = ~np.isnan(array)
+        t = np.where(validos, np.arange(array.shape[-1], dtype=np.float64), 0.0)
+        y = np.where(validos, array, 0.0)
+        n = validos.sum(axis=-1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            media_t = t.sum(axis=-1) / n
+            media_y = y.sum(axis=-1) / n
+            desvio_t = np.where(validos, t - media_t[..., None], 0.0)
+            inclinacao = (desvio_t * (y - media_y[..., None])).sum(axis=-1) / (desvio_t ** 2).sum(axis=-1)
+        return np.where(n >= 2, inclinacao, np.nan)
+
+    def tendencias_por_unidade(self, ultimos=None):
+        """DataFrame unidade × indicador com a inclinação de cada série (casos/mês)."""
+        return pd.DataFrame(self.tendencia(ultimos=ultimos).T, index=self.unidades, columns=self.indicadores)
@@ -1,8 +1,9 @@
-import pandas as pd
 import numpy as np
 from tabulate import tabulate
 import matplotlib.pyplot as plt
-from scipy.stats import skew, kurtosis, norm
+from scipy.stats import norm
+from ferramentas.estatisticas import descrever_distribuicao
+from ferramentas.incremental_isp import totais_atualizados
 
 def exibir_tabela(dados, headers, titulo=None):
     if titulo: print(f"\n{titulo}")
@@ -10,9 +11,7 @@ def exibir_tabela(dados, headers, titulo=None):
 
 try:
     print("Obtendo dados...")
-    df = pd.read_csv("https://www.ispdados.rj.gov.br/Arquivos/UppEvolucaoMensalDetitulos.csv",
-                     sep=';', encoding='iso-8859-1')[['upp', 'recuperacao_veiculos']]
-    df_total = df.groupby('upp', as_index=False).sum(numeric_only=True)
+    df_total = totais_atualizados('upp', 'recuperacao_veiculos')  # só os meses novos são somados
     exibir_tabela(df_total.head(), headers='keys', titulo="Dados iniciais (TOP 5 UPPs)")
 except Exception as e:
     print(f"Erro ao obter dados: {e}")
@@ -21,11 +20,14 @@ except Exception as e:
 try:
     print("\nCalculando estatísticas...")
     v = df_total['recuperacao_veiculos'].to_numpy()
-    media, mediana = np.mean(v), np.median(v)
-    q1, q2, q3 = np.quantile(v, [0.25, 0.5, 0.75])
-    iqr, dist, minimo, maximo = q3 - q1, abs((media - mediana)/mediana), v.min(), v.max()
-    lim_inf, lim_sup, amplitude = q1 - 1.5*iqr, q3 + 1.5*iqr, maximo - minimo
-    assimetria, curt = skew(v), kurtosis(v)
+    # Quartis exatos sobre os valores ordenados e momentos pelo Momentos
+    # (assimetria/curtose com viés, como no scipy)
+    med = descrever_distribuicao(df_total['recuperacao_veiculos'], corrigida=False)
+    media, mediana, dist = med['media'], med['mediana'], med['distancia_media_mediana']
+    q1, q2, q3, iqr = med['q1'], med['q2'], med['q3'], med['iqr']
+    minimo, maximo, amplitude = med['minimo'], med['maximo'], med['amplitude_total']
+    lim_inf, lim_sup = med['limite_inferior'], med['limite_superior']
+    assimetria, curt = med['assimetria'], med['curtose']
 
     exibir_tabela([["Média", media], ["Mediana", mediana], ["Distância (média-mediana)", dist]],
                   headers=["Métrica", "Valor"], titulo="Medidas de tendência central")
@@ -90,7 +92,7 @@ try:
 
     axs2[0].hist(v, bins=15, color='lightgreen', edgecolor='black', density=True, alpha=0.6)
     x = np.linspace(*axs2[0].get_xlim(), 100)
-    axs2[0].plot(x, norm.pdf(x, media, np.std(v)), 'k', linewidth=2)
+    axs2[0].plot(x, norm.pdf(x, media, med['desvio_padrao']), 'k', linewidth=2)
     axs2[0].set_title(f'Histograma com Curva Normal\nAssimetria: {assimetria:.2f}')
 
     axs2[1].violinplot(v, showmeans=True, showmedians=True)
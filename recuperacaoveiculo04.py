@@ -1,7 +1,7 @@
-import pandas as pd
-import numpy as np
 from tabulate import tabulate
 import matplotlib.pyplot as plt
+from ferramentas.estatisticas import descrever_distribuicao
+from ferramentas.incremental_isp import totais_atualizados
 
 def exibir_tabela(dados, headers, titulo=None):
     if titulo:
@@ -11,9 +11,8 @@ def exibir_tabela(dados, headers, titulo=None):
 try:
     print("Obtendo dados...")
     URL = "https://www.ispdados.rj.gov.br/Arquivos/UppEvolucaoMensalDetitulos.csv"
-    df = pd.read_csv(URL, sep=';', encoding='iso-8859-1')
-    df = df[['upp', 'recuperacao_veiculos']]
-    df_total = df.groupby('upp', as_index=False).sum(numeric_only=True)
+    # Totais por UPP da ingestão incremental: o CSV é lido em blocos e só os meses novos são somados
+    df_total = totais_atualizados('upp', 'recuperacao_veiculos', endereco=URL)
     exibir_tabela(df_total.head(), headers='keys', titulo="Dados iniciais (TOP 5 UPPs)")
 except Exception as e:
     print(f"Erro ao obter dados: {e}")
@@ -24,17 +23,14 @@ try:
 
     valores = df_total['recuperacao_veiculos'].to_numpy()
 
-    media = np.mean(valores)
-    mediana = np.median(valores)
-    distancia = abs((media - mediana) / mediana)
-
-    q1, q2, q3 = np.quantile(valores, [0.25, 0.50, 0.75])
-    iqr = q3 - q1
-    limite_inf = q1 - 1.5 * iqr
-    limite_sup = q3 + 1.5 * iqr
-    minimo = np.min(valores)
-    maximo = np.max(valores)
-    amplitude_total = maximo - minimo
+    # Todas as medidas num só passe vetorizado, guardadas pela impressão digital dos dados
+    medidas = descrever_distribuicao(df_total['recuperacao_veiculos'])
+    media, mediana, distancia = medidas['media'], medidas['mediana'], medidas['distancia_media_mediana']
+
+    q1, q2, q3, iqr = medidas['q1'], medidas['q2'], medidas['q3'], medidas['iqr']
+    limite_inf = medidas['limite_inferior']
+    limite_sup = medidas['limite_superior']
+    minimo, maximo, amplitude_total = medidas['minimo'], medidas['maximo'], medidas['amplitude_total']
 
     outliers_inf = df_total[df_total['recuperacao_veiculos'] < limite_inf]
     outliers_sup = df_total[df_total['recuperacao_veiculos'] > limite_sup]
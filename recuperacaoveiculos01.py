@@ -1,7 +1,8 @@
 # import re
 # import unicodedata
-import pandas as pd
 import numpy as np
+from ferramentas.estatisticas import descrever_distribuicao
+from ferramentas.incremental_isp import totais_atualizados
 
 
 try:
@@ -12,17 +13,13 @@ try:
     # encoding='iso-8859-1' - Codificação dos caracteres com acentuação
     # outras opções: utf-8, iso-8859-1, latin1, cp1252
     # encodings principais: https://docs.python.org/3/library/codecs.html#standard-encodings
-    df_ocorrencias = pd.read_csv(ENDERECO_DADOS, sep=';', encoding='iso-8859-1')
 
-    
     # Demilitando somente as variáveis do Exemplo01: UPP e recuperação de_veiculos
     # Dados sendo obtidos do ISP (Istituto de Segurança Pública - rj.gov.br no Período de 01/2007 a 06/2021).
-    df_ocorrencias = df_ocorrencias[['upp', 'recuperacao_veiculos']]
-
     # Totalizar recuperação de veiculo por UPP (agrupar e somar)
-    # reset_index(), traz de volta os índeces que numera as colunas, pois eles se perdem
-    # nesta operação
-    df_recuperacao_veiculos = df_ocorrencias.groupby('upp').sum(['recuperacao_veiculos']).reset_index()
+    # Os totais por UPP ficam guardados pela ingestão incremental: a cada execução o CSV
+    # é lido em blocos e só os meses novos são somados (a tabela inteira não vai para a memória)
+    df_recuperacao_veiculos = totais_atualizados('upp', 'recuperacao_veiculos', endereco=ENDERECO_DADOS)
 
     # Printando as linhas iniciais com o método head() apenas para ver se os dados
     # foram obtidos corretamente
@@ -50,13 +47,17 @@ try:
     # Uso do array significa ganho computacional
     array_recuperacao_veiculos = np.array(df_recuperacao_veiculos['recuperacao_veiculos'])
 
+    # Todas as medidas saem de um só passe vetorizado (ferramentas/estatisticas.py),
+    # com os quartis pelo método 'weibull'
+    medidas = descrever_distribuicao(df_recuperacao_veiculos['recuperacao_veiculos'], metodo='weibull')
+
     # Obtendo média de recuperação de veiculos
-    media_recuperacao_veiculos = np.mean(array_recuperacao_veiculos)
+    media_recuperacao_veiculos = medidas['media']
 
     # Obtendo mediana de rrecuperação de veiculos
     # Mediana é o valor que divide a distribuição em duas partes iguais
     # (50% dos dados estão abaixo e 50% acima)
-    mediana_recuperacao_veiculos = np.median(array_recuperacao_veiculos)
+    mediana_recuperacao_veiculos = medidas['mediana']
 
     # Distânicia entre média e mediana
     # A distância entre a média e a mediana é uma medida de assimetria
@@ -72,7 +73,7 @@ try:
     # influência de valores extremos. Se a distância for maior que 0.25, a
     # distribuição tende a ser assimétrica forte. A tendência é, que nestes 
     # caso, a média esteja sofrendo influência de valores extremos.
-    distancia = abs((media_recuperacao_veiculos-mediana_recuperacao_veiculos) / mediana_recuperacao_veiculos)
+    distancia = medidas['distancia_media_mediana']
 
     # Medidas de tendência central
     # Se a média for muito diferente da mediana, distribuição é assimétrica. 
@@ -101,9 +102,9 @@ try:
     # q1 = np.quantile(array_roubo_veiculo, 0.25)
     # q2 = np.quantile(array_roubo_veiculo, 0.50)
     # q3 = np.quantile(array_roubo_veiculo, 0.75)
-    q1 = np.quantile(array_recuperacao_veiculos, 0.25, method='weibull') # Q1 é 25% 
-    q2 = np.quantile(array_recuperacao_veiculos, 0.50, method='weibull') # Q2 é 50% (mediana)
-    q3 = np.quantile(array_recuperacao_veiculos, 0.75, method='weibull') # Q3 é 75%
+    q1 = medidas['q1'] # Q1 é 25% 
+    q2 = medidas['q2'] # Q2 é 50% (mediana)
+    q3 = medidas['q3'] # Q3 é 75%
 
     print('\nMedidas de posição: ')
     print(60*'-')
@@ -132,15 +133,15 @@ try:
     # Não sofre a interferência dos valores extremos.
     # Quanto mais próximo de zero, mais homogêneo são os dados.
     # Quanto mais próximo do q3, mais heterogêneo são os dados.
-    iqr = q3 - q1
+    iqr = medidas['iqr']
 
     # Limite superior
     # Vai identificar os outliers acima de q3
-    limite_superior = q3 + (1.5 * iqr)
+    limite_superior = medidas['limite_superior']  # q3 + (1.5 * iqr)
 
     # Limite inferior
     # Vai identificar os outliers abaixo de q1
-    limite_inferior = q1 - (1.5 * iqr)
+    limite_inferior = medidas['limite_inferior']  # q1 - (1.5 * iqr)
 
     print('\nLimites - Medidas de Posição')
     print(60*'-')
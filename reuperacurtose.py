@@ -1,8 +1,9 @@
-import pandas as pd
 import numpy as np
 from tabulate import tabulate
 import matplotlib.pyplot as plt
-from scipy.stats import skew, kurtosis, norm
+from scipy.stats import norm
+from ferramentas.estatisticas import descrever_distribuicao
+from ferramentas.incremental_isp import totais_atualizados
 
 def exibir_tabela(dados, headers, titulo=None):
     if titulo:
@@ -12,9 +13,8 @@ def exibir_tabela(dados, headers, titulo=None):
 try:
     print("Obtendo dados...")
     URL = "https://www.ispdados.rj.gov.br/Arquivos/UppEvolucaoMensalDetitulos.csv"
-    df = pd.read_csv(URL, sep=';', encoding='iso-8859-1')
-    df = df[['upp', 'recuperacao_veiculos']]
-    df_total = df.groupby('upp', as_index=False).sum(numeric_only=True)
+    # Totais por UPP da ingestão incremental: o CSV é lido em blocos e só os meses novos são somados
+    df_total = totais_atualizados('upp', 'recuperacao_veiculos', endereco=URL)
     exibir_tabela(df_total.head(), headers='keys', titulo="Dados iniciais (TOP 5 UPPs)")
 except Exception as e:
     print(f"Erro ao obter dados: {e}")
@@ -25,20 +25,23 @@ try:
 
     valores = df_total['recuperacao_veiculos'].to_numpy()
 
-    media = np.mean(valores)
-    mediana = np.median(valores)
-    distancia = abs((media - mediana) / mediana)
+    # Quartis exatos sobre os valores ordenados e momentos pelo Momentos, guardados
+    # pela impressão digital dos dados (assimetria e curtose com viés, como no scipy.stats)
+    medidas = descrever_distribuicao(df_total['recuperacao_veiculos'], corrigida=False)
 
-    q1, q2, q3 = np.quantile(valores, [0.25, 0.50, 0.75])
-    iqr = q3 - q1
-    limite_inf = q1 - 1.5 * iqr
-    limite_sup = q3 + 1.5 * iqr
-    minimo = np.min(valores)
-    maximo = np.max(valores)
-    amplitude_total = maximo - minimo
+    media = medidas['media']
+    mediana = medidas['mediana']
+    distancia = medidas['distancia_media_mediana']
 
-    assimetria = skew(valores)
-    curtose_val = kurtosis(valores)
+    q1, q2, q3, iqr = medidas['q1'], medidas['q2'], medidas['q3'], medidas['iqr']
+    limite_inf = medidas['limite_inferior']
+    limite_sup = medidas['limite_superior']
+    minimo = medidas['minimo']
+    maximo = medidas['maximo']
+    amplitude_total = medidas['amplitude_total']
+
+    assimetria = medidas['assimetria']
+    curtose_val = medidas['curtose']
 
     outliers_inf = df_total[df_total['recuperacao_veiculos'] < limite_inf]
     outliers_sup = df_total[df_total['recuperacao_veiculos'] > limite_sup]
@@ -134,7 +137,7 @@ try:
     axs2[0].hist(valores, bins=15, color='lightgreen', edgecolor='black', density=True, alpha=0.6)
     xmin, xmax = axs2[0].get_xlim()
     x = np.linspace(xmin, xmax, 100)
-    p = norm.pdf(x, media, np.std(valores))
+    p = norm.pdf(x, media, medidas['desvio_padrao'])
     axs2[0].plot(x, p, 'k', linewidth=2)
     axs2[0].set_title(f'Histograma com Curva Normal\nAssimetria: {assimetria:.2f}')
 
@@ -1,30 +1,27 @@
 # Mantendo a estrutura do código Calcule a correlação entre as variáveis recuperadas e roubadas, e gere gráficos de dispersão para visualização. 
 
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from scipy.stats import skew, kurtosis, norm
+from scipy.stats import norm
 from tabulate import tabulate
+from ferramentas.cubo_isp import carregar_cubo_cisp
+from ferramentas.incremental_isp import totais_atualizados
+from ferramentas.estatisticas import descrever_distribuicao
 
 def exibir_tabela(dados, headers, titulo=None):
     if titulo: print(f"\n{titulo}")
     print(tabulate(dados, headers=headers, tablefmt="grid", floatfmt=".2f"))
 
-# URLs de dados
+# URL de dados
 URL_REC = "https://www.ispdados.rj.gov.br/Arquivos/UppEvolucaoMensalDetitulos.csv"
-URL_ROU = "https://www.ispdados.rj.gov.br/Arquivos/BaseDPEvolucaoMensalCisp.csv"
 
 # -------------------------------
 # 1. Carregar e agregar dados
 # -------------------------------
-df_rec = pd.read_csv(URL_REC, sep=';', encoding='iso-8859-1')
-df_rec = df_rec[['upp', 'recuperacao_veiculos']]
-df_rec_agg = df_rec.groupby('upp', as_index=False).sum(numeric_only=True)
-
-df_rou = pd.read_csv(URL_ROU, sep=';', encoding='iso-8859-1')
-df_rou = df_rou[['munic', 'roubo_veiculo']]
-df_rou_agg = df_rou.groupby('munic', as_index=False).sum(numeric_only=True)
+# Agregados da ingestão incremental: a cada execução só os meses novos são somados
+df_rec_agg = totais_atualizados('upp', 'recuperacao_veiculos', endereco=URL_REC)
+df_rou_agg = carregar_cubo_cisp().agregar('munic', 'roubo_veiculo')
 
 # Merge será por região diferente (tem que ajustar se quiser cruzar UPP↔Município juntos)
 # Aqui vamos tratar separadamente
@@ -33,23 +30,24 @@ df_rou_agg = df_rou.groupby('munic', as_index=False).sum(numeric_only=True)
 # 2. Estatísticas da recuperação
 # -------------------------------
 val_rec = df_rec_agg['recuperacao_veiculos'].values
+# Quartis exatos sobre os valores ordenados e momentos pelo Momentos
+# (assimetria/curtose com viés, como no scipy)
+med_rec = descrever_distribuicao(df_rec_agg['recuperacao_veiculos'], corrigida=False)
 stats_rec = {
-    'média': np.mean(val_rec),
-    'mediana': np.median(val_rec),
-    'dist_rel (|m-mdn|/mdn)': abs((np.mean(val_rec) - np.median(val_rec)) / np.median(val_rec)),
-    'q1,q2,q3': np.quantile(val_rec, [0.25,0.5,0.75]),
-    'iqr': np.ptp(np.quantile(val_rec, [0.25,0.75])),
-    'mín,max,range': (np.min(val_rec), np.max(val_rec), np.ptp(val_rec)),
-    'skewness': skew(val_rec),
-    'kurtosis': kurtosis(val_rec)
+    'média': med_rec['media'],
+    'mediana': med_rec['mediana'],
+    'dist_rel (|m-mdn|/mdn)': med_rec['distancia_media_mediana'],
+    'q1,q2,q3': med_rec[['q1', 'q2', 'q3']].to_numpy(dtype=float),
+    'iqr': med_rec['iqr'],
+    'mín,max,range': (med_rec['minimo'], med_rec['maximo'], med_rec['amplitude_total']),
+    'skewness': med_rec['assimetria'],
+    'kurtosis': med_rec['curtose']
 }
 
 # Outliers
-q1_r, q2_r, q3_r = np.quantile(val_rec,[0.25,0.5,0.75])
-iqr_r = q3_r - q1_r
-lim_inf_r = q1_r - 1.5*iqr_r
-lim_sup_r = q3_r + 1.5*iqr_r
-
+q1_r, q2_r, q3_r, iqr_r = med_rec['q1'], med_rec['q2'], med_rec['q3'], med_rec['iqr']
+lim_inf_r = med_rec['limite_inferior']
+lim_sup_r = med_rec['limite_superior']
 out_rec_inf = df_rec_agg[df_rec_agg['recuperacao_veiculos'] < lim_inf_r]
 out_rec_sup = df_rec_agg[df_rec_agg['recuperacao_veiculos'] > lim_sup_r]
 
@@ -57,24 +55,26 @@ out_rec_sup = df_rec_agg[df_rec_agg['recuperacao_veiculos'] > lim_sup_r]
 # 3. Estatísticas do roubo
 # -------------------------------
 val_rou = df_rou_agg['roubo_veiculo'].values
+# Variância/desvio populacionais (np.var); assimetria/curtose sem viés (Series.skew)
+med_rou = descrever_distribuicao(df_rou_agg['roubo_veiculo'])
 stats_rou = {
-    'média': np.mean(val_rou),
-    'mediana': np.median(val_rou),
-    'dist_rel': abs((np.mean(val_rou) - np.median(val_rou)) / np.median(val_rou)),
-    'q1,q2,q3': np.quantile(val_rou, [0.25,0.5,0.75]),
-    'iqr': np.ptp(np.quantile(val_rou, [0.25,0.75])),
-    'mín,max,range': (np.min(val_rou), np.max(val_rou), np.ptp(val_rou)),
-    'var': np.var(val_rou),
-    'std': np.std(val_rou),
-    'coef_var': np.std(val_rou)/np.mean(val_rou),
-    'skew': df_rou_agg['roubo_veiculo'].skew(),
-    'kurt': df_rou_agg['roubo_veiculo'].kurtosis()
+    'média': med_rou['media'],
+    'mediana': med_rou['mediana'],
+    'dist_rel': med_rou['distancia_media_mediana'],
+    'q1,q2,q3': med_rou[['q1', 'q2', 'q3']].to_numpy(dtype=float),
+    'iqr': med_rou['iqr'],
+    'mín,max,range': (med_rou['minimo'], med_rou['maximo'], med_rou['amplitude_total']),
+    'var': med_rou['variancia'],
+    'std': med_rou['desvio_padrao'],
+    'coef_var': med_rou['coeficiente_variacao'],
+    'skew': med_rou['assimetria'],
+    'kurt': med_rou['curtose']
 }
 
 q1_v, q2_v, q3_v = stats_rou['q1,q2,q3']
 iqr_v = stats_rou['iqr']
-lim_inf_v = q1_v - 1.5*iqr_v
-lim_sup_v = q3_v + 1.5*iqr_v
+lim_inf_v = med_rou['limite_inferior']
+lim_sup_v = med_rou['limite_superior']
 out_rou_inf = df_rou_agg[df_rou_agg['roubo_veiculo'] < lim_inf_v]
 out_rou_sup = df_rou_agg[df_rou_agg['roubo_veiculo'] > lim_sup_v]
 
@@ -102,12 +102,12 @@ fig.suptitle("Comparativo Recuperações vs Roubos de Veículos")
 
 axs[0,0].hist(val_rec, bins=15, color='skyblue', edgecolor='black', alpha=0.7, density=True)
 x= np.linspace(min(val_rec), max(val_rec),100)
-axs[0,0].plot(x, norm.pdf(x, np.mean(val_rec), np.std(val_rec)), 'k')
+axs[0,0].plot(x, norm.pdf(x, med_rec['media'], med_rec['desvio_padrao']), 'k')
 axs[0,0].set_title("Recuperações por UPP (hist + curva normal)")
 
 axs[0,1].hist(val_rou, bins=15, color='salmon', edgecolor='black', alpha=0.7, density=True)
 x2 = np.linspace(min(val_rou), max(val_rou),100)
-axs[0,1].plot(x2, norm.pdf(x2, np.mean(val_rou), np.std(val_rou)), 'k')
+axs[0,1].plot(x2, norm.pdf(x2, med_rou['media'], med_rou['desvio_padrao']), 'k')
 axs[0,1].set_title("Roubos por Município (hist + curva normal)")
 
 # Boxplots
@@ -3,8 +3,10 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from tabulate import tabulate
-import time
 import json
+from ferramentas.cache_http import CacheHTTP
+from ferramentas.coletor_http import LimitadorTaxa, criar_sessao
+from ferramentas.laudo import linhas_laudo
 
 with open("despesas_ceaps_senadores.json", encoding="utf-8") as f:
     dados = json.load(f)
@@ -17,10 +19,23 @@ for despesa in dados:
             print(f"  → {obj['descricaoObjeto']} ({obj['quantidade']} x {obj['valorUnitario']:.2f}) = {obj['valorTotal']:
 sns.set(style="whitegrid")
 
+# Sessão keep-alive e cache em disco das respostas (validade em segundos por endpoint).
+# Com DADOS_OFFLINE=1 tudo é servido do cache, sem acessar a rede.
+SESSAO = criar_sessao()
+LIMITADOR = LimitadorTaxa(2)  # substitui o time.sleep(0.5); só espera quando vai à rede
+CACHE = CacheHTTP(ttl_por_endpoint={
+    r"/senador/lista/atual": 24 * 3600,
+    r"/autorias$": 12 * 3600,
+    r"/gastos$": 12 * 3600,
+})
+
+def buscar(url):
+    return CACHE.get(SESSAO, url, limitador=LIMITADOR)
+
 # === 1. Obter lista de senadores
 def get_senadores():
     url = "https://legis.senado.leg.br/dadosabertos/senador/lista/atual.json"
-    r = requests.get(url)
+    r = buscar(url)
     r.raise_for_status()
     data = r.json()
     parlamentares = data['ListaParlamentarEmExercicio']['Parlamentares']['Parlamentar']
@@ -40,7 +55,7 @@ def get_senadores():
 def get_projetos_senador(codigo):
     url = f"https://legis.senado.leg.br/dadosabertos/senador/{codigo}/autorias"
     try:
-        r = requests.get(url)
+        r = buscar(url)
         if r.status_code == 200:
             try:
                 dados = r.json().get('AutoriaMateria', {}).get('Materias', {}).get('Materia', [])
@@ -57,7 +72,7 @@ def get_projetos_senador(codigo):
 # === 3. Gastos com CEAPS (últimos 12 meses, por exemplo)
 def get_gastos_ceaps(codigo):
     url = f"https://legis.senado.leg.br/dadosabertos/senador/{codigo}/gastos"
-    r = requests.get(url)
+    r = buscar(url)
     if r.status_code == 200:
         data = r.json()
         despesas = data.get("GastosParlamentares", {}).get("GastoParlamentar", [])
@@ -74,7 +89,6 @@ def montar_df_senadores():
 
     for _, row in senadores.iterrows():
         print(f"Processando: {row['NomeParlamentar']}")
-        time.sleep(0.5)
         projetos = get_projetos_senador(row['CodigoParlamentar'])
         gastos = get_gastos_ceaps(row['CodigoParlamentar'])
         lista.append({
@@ -119,18 +133,7 @@ def analise_estatistica(df):
 # === 6. Geração de parecer
 def gerar_laudo(df):
     print("\n🔍 PARECER FINAL SOBRE SENADORES:\n")
-    for _, row in df.iterrows():
-        if row['Projetos de Lei'] >= 20 and row['Custo por Projeto (R$)'] and row['Custo por Projeto (R$)'] < 10000:
-            categoria = '🟢 Altamente Eficiente'
-        elif row['Projetos de Lei'] <= 5 and row['Gastos Cota Parlamentar (R$)'] > 100000:
-            categoria = '🔴 Gastos Elevados, Baixa Produção'
-        elif row['Projetos de Lei'] == 0:
-            categoria = '⚫ Inoperante'
-        else:
-            categoria = '🟡 Regular'
-
-        custo_str = f"R$ {row['Custo por Projeto (R$)']:.2f}" if row['Custo por Projeto (R$)'] else "N/A"
-        print(f"{row['Nome']} ({row['UF']}/{row['Partido']}): {categoria} | Projetos: {row['Projetos de Lei']}, Gasto: R$ {row['Gastos Cota Parlamentar (R$)']:.2f}, Custo/Projeto: {custo_str}")
+    print("\n".join(linhas_laudo(df)))
 
 # === Execução principal
 if __name__ == "__main__":
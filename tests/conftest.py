@@ -0,0 +1,76 @@
+# Servidor HTTP local (http.server em 127.0.0.1) para testar os coletores sem internet
+# Cada teste programa as rotas e depois confere as requisições que chegaram:
+#   servidor.rotas["/deputados"] = lambda requisicao: (200, {"ETag": '"v1"'}, {"dados": []})
+#   servidor.requisicoes  ->  [Requisicao(caminho, consulta, cabecalhos, instante), ...]
+import json
+import os
+import sys
+import threading
+import time
+from collections import namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+# Permite importar o pacote ferramentas, que fica na raiz do repositório
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+Requisicao = namedtuple("Requisicao", ["caminho", "consulta", "cabecalhos", "instante"])
+
+
+class _Manipulador(BaseHTTPRequestHandler):
+    # HTTP/1.1 mantém a conexão aberta entre requisições (keep-alive da sessão)
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        endereco = urlparse(self.path)
+        consulta = {chave: valores[-1] for chave, valores in parse_qs(endereco.query).items()}
+        requisicao = Requisicao(endereco.path, consulta, dict(self.headers), time.monotonic())
+        servidor = self.server.stub
+        with servidor.trava:
+            servidor.requisicoes.append(requisicao)
+
+        rota = servidor.rotas.get(endereco.path)
+        status, cabecalhos, corpo = rota(requisicao) if rota else (404, {}, b"")
+        if isinstance(corpo, (dict, list)):
+            corpo = json.dumps(corpo).encode("utf-8")
+            cabecalhos = {"Content-Type": "application/json", **cabecalhos}
+        self.send_response(status)
+        for nome, valor in cabecalhos.items():
+            self.send_header(nome, valor)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+class ServidorStub:
+    def __init__(self):
+        self.rotas = {}
+        self.requisicoes = []
+        self.trava = threading.Lock()
+        self._http = ThreadingHTTPServer(("127.0.0.1", 0), _Manipulador)
+        self._http.daemon_threads = True
+        self._http.stub = self
+        self.url = f"http://127.0.0.1:{self._http.server_address[1]}"
+
+    def do_caminho(self, caminho):
+        return [r for r in self.requisicoes if r.caminho == caminho]
+
+    def iniciar(self):
+        threading.Thread(target=self._http.serve_forever, daemon=True).start()
+
+    def parar(self):
+        self._http.shutdown()
+        self._http.server_close()
+
+
+@pytest.fixture
+def servidor():
+    stub = ServidorStub()
+    stub.iniciar()
+    yield stub
+    stub.parar()
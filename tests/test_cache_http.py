@@ -0,0 +1,115 @@
+import glob
+import os
+
+import pytest
+import requests
+
+from ferramentas.cache_http import CacheHTTP, RespostaForaDoCache
+from ferramentas.coletor_http import ColetorHTTP
+
+
+@pytest.fixture
+def sessao():
+    with requests.Session() as s:
+        yield s
+
+
+def _rota_com_etag(servidor, caminho, etag='"v1"', corpo=None):
+    # 304 quando o cliente já tem a versão atual (If-None-Match)
+    corpo = {"dados": [1, 2, 3]} if corpo is None else corpo
+
+    def responder(requisicao):
+        if requisicao.cabecalhos.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, b""
+        return 200, {"ETag": etag}, corpo
+
+    servidor.rotas[caminho] = responder
+
+
+def test_ttl_por_endpoint(servidor, sessao, tmp_path):
+    _rota_com_etag(servidor, "/deputados")
+    _rota_com_etag(servidor, "/proposicoes")
+    cache = CacheHTTP(pasta=str(tmp_path), ttl_padrao=0, ttl_por_endpoint={r"/deputados$": 3600})
+
+    for _ in range(3):
+        assert cache.get(sessao, f"{servidor.url}/deputados").json() == {"dados": [1, 2, 3]}
+        assert cache.get(sessao, f"{servidor.url}/proposicoes").json() == {"dados": [1, 2, 3]}
+
+    # Dentro do prazo a resposta sai do disco; sem prazo, toda vez vai à rede (condicional)
+    assert len(servidor.do_caminho("/deputados")) == 1
+    assert len(servidor.do_caminho("/proposicoes")) == 3
+
+
+def test_chave_inclui_os_parametros(servidor, sessao, tmp_path):
+    servidor.rotas["/proposicoes"] = lambda requisicao: (200, {}, {"autor": requisicao.consulta["autor"]})
+    cache = CacheHTTP(pasta=str(tmp_path), ttl_padrao=3600)
+
+    assert cache.get(sessao, f"{servidor.url}/proposicoes", params={"autor": 1}).json() == {"autor": "1"}
+    assert cache.get(sessao, f"{servidor.url}/proposicoes", params={"autor": 2}).json() == {"autor": "2"}
+    assert len(servidor.requisicoes) == 2
+
+
+def test_revalidacao_com_etag(servidor, sessao, tmp_path):
+    _rota_com_etag(servidor, "/deputados")
+    cache = CacheHTTP(pasta=str(tmp_path))
+
+    primeira = cache.get(sessao, f"{servidor.url}/deputados")
+    segunda = cache.get(sessao, f"{servidor.url}/deputados")
+
+    assert "X-Cache" not in primeira.headers
+    assert segunda.status_code == 200
+    assert segunda.headers["X-Cache"] == "HIT"
+    assert segunda.json() == primeira.json()
+    assert servidor.requisicoes[1].cabecalhos["If-None-Match"] == '"v1"'
+
+
+def test_revalidacao_com_last_modified(servidor, sessao, tmp_path):
+    data = "Wed, 01 Oct 2025 12:00:00 GMT"
+
+    def responder(requisicao):
+        if requisicao.cabecalhos.get("If-Modified-Since") == data:
+            return 304, {}, b""
+        return 200, {"Last-Modified": data}, b"ano;mes\n2025;9\n"
+
+    servidor.rotas["/base.csv"] = responder
+    cache = CacheHTTP(pasta=str(tmp_path))
+
+    assert cache.get(sessao, f"{servidor.url}/base.csv").content == b"ano;mes\n2025;9\n"
+    segunda = cache.get(sessao, f"{servidor.url}/base.csv")
+    assert segunda.content == b"ano;mes\n2025;9\n"
+    assert segunda.headers["X-Cache"] == "HIT"
+    assert servidor.requisicoes[1].cabecalhos["If-Modified-Since"] == data
+
+
+def test_conteudo_novo_substitui_o_guardado(servidor, sessao, tmp_path):
+    _rota_com_etag(servidor, "/deputados", etag='"v1"', corpo={"versao": 1})
+    cache = CacheHTTP(pasta=str(tmp_path))
+    cache.get(sessao, f"{servidor.url}/deputados")
+
+    _rota_com_etag(servidor, "/deputados", etag='"v2"', corpo={"versao": 2})
+    assert cache.get(sessao, f"{servidor.url}/deputados").json() == {"versao": 2}
+    assert cache.get(sessao, f"{servidor.url}/deputados").headers["X-Cache"] == "HIT"
+
+
+def test_modo_offline_so_responde_do_cache(servidor, sessao, tmp_path, monkeypatch):
+    _rota_com_etag(servidor, "/deputados")
+    CacheHTTP(pasta=str(tmp_path)).get(sessao, f"{servidor.url}/deputados")
+    servidor.requisicoes.clear()
+
+    monkeypatch.setenv("DADOS_OFFLINE", "1")
+    offline = CacheHTTP(pasta=str(tmp_path))
+    assert offline.get(sessao, f"{servidor.url}/deputados").json() == {"dados": [1, 2, 3]}
+    with pytest.raises(RespostaForaDoCache):
+        offline.get(sessao, f"{servidor.url}/proposicoes")
+    assert servidor.requisicoes == []
+
+
+def test_threads_gravando_a_mesma_url(servidor, sessao, tmp_path):
+    servidor.rotas["/deputados"] = lambda requisicao: (200, {}, {"dados": list(range(1000))})
+    cache = CacheHTTP(pasta=str(tmp_path))
+    with ColetorHTTP(servidor.url, max_workers=8, requisicoes_por_segundo=0, cache=cache) as coletor:
+        respostas = [r for _, r in coletor.mapear(lambda i: coletor.get("deputados"), range(32))]
+
+    assert all(r.json() == {"dados": list(range(1000))} for r in respostas)
+    assert glob.glob(os.path.join(str(tmp_path), "*", "*.tmp")) == []
+    assert cache.get(sessao, f"{servidor.url}/deputados").json() == {"dados": list(range(1000))}
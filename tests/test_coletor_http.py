@@ -0,0 +1,133 @@
+import time
+
+from ferramentas.coletor_http import ColetorHTTP, iterar_paginas
+
+
+def _intervalos(requisicoes):
+    instantes = [r.instante for r in requisicoes]
+    return [b - a for a, b in zip(instantes, instantes[1:])]
+
+
+def test_limitador_espaca_requisicoes_de_todas_as_threads(servidor):
+    servidor.rotas["/item"] = lambda requisicao: (200, {}, {"ok": True})
+    with ColetorHTTP(servidor.url, max_workers=4, requisicoes_por_segundo=20) as coletor:
+        list(coletor.mapear(lambda i: coletor.get("item", params={"i": i}).status_code, range(6)))
+
+    # 6 requisições a 20/s: a primeira sai na hora e as outras 5, a cada 50 ms
+    instantes = sorted(r.instante for r in servidor.requisicoes)
+    assert len(instantes) == 6
+    assert instantes[-1] - instantes[0] >= 5 * 0.05 * 0.9
+
+
+def test_novas_tentativas_em_429_e_5xx(servidor):
+    respostas = iter([(429, {"Retry-After": "0"}, b""), (503, {}, b""), (200, {}, {"ok": True})])
+    servidor.rotas["/instavel"] = lambda requisicao: next(respostas)
+    with ColetorHTTP(servidor.url, requisicoes_por_segundo=0, tentativas=3, fator_espera=0.01) as coletor:
+        resposta = coletor.get("instavel")
+
+    assert resposta.status_code == 200
+    assert resposta.json() == {"ok": True}
+    assert len(servidor.requisicoes) == 3
+
+
+def test_espera_exponencial_entre_tentativas(servidor):
+    respostas = iter([(500, {}, b""), (502, {}, b""), (200, {}, {"ok": True})])
+    servidor.rotas["/instavel"] = lambda requisicao: next(respostas)
+    with ColetorHTTP(servidor.url, requisicoes_por_segundo=0, tentativas=3, fator_espera=0.1) as coletor:
+        assert coletor.get("instavel").status_code == 200
+
+    # urllib3: a 1ª nova tentativa sai na hora, a 2ª espera fator * 2
+    assert _intervalos(servidor.requisicoes)[1] >= 0.2 * 0.9
+
+
+def test_tentativas_esgotadas_devolvem_o_ultimo_erro(servidor):
+    servidor.rotas["/fora"] = lambda requisicao: (503, {}, b"")
+    with ColetorHTTP(servidor.url, requisicoes_por_segundo=0, tentativas=2, fator_espera=0) as coletor:
+        assert coletor.get("fora").status_code == 503
+    assert len(servidor.requisicoes) == 3
+
+
+def test_novas_tentativas_respeitam_o_limitador(servidor):
+    respostas = iter([(503, {}, b""), (503, {}, b""), (200, {}, {"ok": True})])
+    servidor.rotas["/instavel"] = lambda requisicao: next(respostas)
+    with ColetorHTTP(servidor.url, requisicoes_por_segundo=10, tentativas=3, fator_espera=0) as coletor:
+        assert coletor.get("instavel").status_code == 200
+
+    # Sem espera exponencial, só o limitador (10/s) separa as tentativas
+    assert all(intervalo >= 0.1 * 0.9 for intervalo in _intervalos(servidor.requisicoes))
+
+
+def test_mapear_devolve_cada_item_com_o_seu_resultado_na_ordem_de_chegada(servidor):
+    def lento(requisicao):
+        time.sleep(float(requisicao.consulta["espera"]))
+        return 200, {}, {"espera": requisicao.consulta["espera"]}
+
+    servidor.rotas["/lento"] = lento
+    with ColetorHTTP(servidor.url, max_workers=3, requisicoes_por_segundo=0) as coletor:
+        resultado = list(coletor.mapear(
+            lambda espera: coletor.get("lento", params={"espera": espera}).json()["espera"],
+            ["0.4", "0.0", "0.2"]))
+
+    assert [item for item, _ in resultado] == ["0.0", "0.2", "0.4"]
+    assert all(item == valor for item, valor in resultado)
+
+
+def _rota_paginada(servidor, caminho, paginas, itens_por_pagina=3):
+    # Padrão da API da Câmara: {"dados": [...], "links": [{"rel": "next", "href": ...}, ...]}
+    def pagina(requisicao):
+        numero = int(requisicao.consulta.get("pagina", 1))
+        links = [{"rel": "self", "href": f"{servidor.url}{caminho}?pagina={numero}"},
+                 {"rel": "last", "href": f"{servidor.url}{caminho}?itens={itens_por_pagina}&pagina={paginas}"}]
+        if numero < paginas:
+            links.append({"rel": "next", "href": f"{servidor.url}{caminho}?pagina={numero + 1}"})
+        dados = [{"pagina": numero, "item": i} for i in range(itens_por_pagina)]
+        return 200, {}, {"dados": dados, "links": links}
+
+    servidor.rotas[caminho] = pagina
+
+
+def test_paginas_seguem_o_link_next(servidor):
+    _rota_paginada(servidor, "/deputados/1/despesas", paginas=4)
+    with ColetorHTTP(servidor.url, requisicoes_por_segundo=0) as coletor:
+        paginas = list(iterar_paginas(coletor, "deputados/1/despesas", params={"itens": 3}))
+
+    assert [dados[0]["pagina"] for dados in paginas] == [1, 2, 3, 4]
+    assert sum(len(dados) for dados in paginas) == 12
+    assert len(servidor.requisicoes) == 4
+
+
+def test_paginas_em_paralelo_pelo_link_last(servidor):
+    _rota_paginada(servidor, "/deputados/1/despesas", paginas=5)
+    with ColetorHTTP(servidor.url, max_workers=4, requisicoes_por_segundo=0) as coletor:
+        paginas = list(iterar_paginas(coletor, "deputados/1/despesas", params={"itens": 3}, paralelo=True))
+
+    assert sorted(dados[0]["pagina"] for dados in paginas) == [1, 2, 3, 4, 5]
+    # Depois da primeira, as páginas 2..5 são pedidas pelo número (mantendo os parâmetros)
+    pedidas = sorted(int(r.consulta["pagina"]) for r in servidor.requisicoes if "pagina" in r.consulta)
+    assert pedidas == [2, 3, 4, 5]
+    assert all(r.consulta["itens"] == "3" for r in servidor.requisicoes)
+
+
+def test_paginas_em_paralelo_dentro_do_mapear_usam_um_pool_so(servidor, monkeypatch):
+    import ferramentas.coletor_http as coletor_http
+
+    pools = []
+
+    class PoolContado(coletor_http.ThreadPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            pools.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(coletor_http, "ThreadPoolExecutor", PoolContado)
+    for deputado in (1, 2, 3):
+        _rota_paginada(servidor, f"/deputados/{deputado}/despesas", paginas=3)
+
+    def despesas(deputado):
+        paginas = iterar_paginas(coletor, f"deputados/{deputado}/despesas", paralelo=True)
+        return sum(len(dados) for dados in paginas)
+
+    with ColetorHTTP(servidor.url, max_workers=2, requisicoes_por_segundo=0) as coletor:
+        totais = dict(coletor.mapear(despesas, [1, 2, 3]))
+
+    assert totais == {1: 9, 2: 9, 3: 9}
+    assert len(pools) == 1
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import ferramentas.incremental_isp as incremental
+from ferramentas.leitura_em_blocos import somar_upp
+
+
+@pytest.fixture
+def pasta(tmp_path, monkeypatch):
+    # Blocos pequenos: cada mês se espalha por mais de um bloco
+    monkeypatch.setattr(incremental, "PASTA_INCREMENTAL", str(tmp_path / "incremental"))
+    monkeypatch.setattr(incremental, "TAMANHO_BLOCO", 7)
+    return tmp_path
+
+
+def _base_upp(meses, upps=("Alemão", "Borel", "Cidade de Deus", "Rocinha"), semente=0):
+    gerador = np.random.default_rng(semente)
+    linhas = [{"cod_upp": i, "upp": upp, "ano": ano, "mes": mes,
+               "recuperacao_veiculos": int(gerador.integers(0, 20)), "roubo_veiculo": int(gerador.integers(0, 50))}
+              for ano, mes in meses for i, upp in enumerate(upps)]
+    return pd.DataFrame(linhas)
+
+
+def _gravar(df, caminho):
+    df.to_csv(caminho, sep=";", encoding="iso-8859-1", index=False)
+    return str(caminho)
+
+
+def test_meses_novos_somados_em_blocos(pasta):
+    meses = [(2024, m) for m in range(1, 13)]
+    completo = _base_upp(meses)
+    caminho = pasta / "upp.csv"
+
+    resumo = incremental.atualizar("upp", _gravar(completo[completo["mes"] <= 10], caminho))
+    assert resumo["modo"] == "inicial"
+    for ultimo in (11, 12):
+        resumo = incremental.atualizar("upp", _gravar(completo[completo["mes"] <= ultimo], caminho))
+        assert resumo["modo"] == "incremental"
+        assert resumo["linhas_novas"] == 4
+    assert incremental.atualizar("upp", str(caminho))["modo"] == "sem_mudanca"
+
+    esperado = somar_upp(["recuperacao_veiculos", "roubo_veiculo"], endereco=str(caminho))
+    totais = incremental.totais_atualizados("upp", ["recuperacao_veiculos", "roubo_veiculo"], endereco=str(caminho))
+    pd.testing.assert_frame_equal(totais.astype({"upp": str}), esperado.astype({"upp": str}))
+
+    cubo = incremental.carregar_cubo("upp").agregar("mes", "roubo_veiculo")
+    assert cubo["roubo_veiculo"].tolist() == completo.groupby("mes")["roubo_veiculo"].sum().tolist()
+    assert len(incremental.carregar_base("upp")) == len(completo)
+    media = incremental.estatisticas("upp").loc["roubo_veiculo", "media"]
+    assert media == pytest.approx(completo["roubo_veiculo"].mean())
+
+
+def test_mes_antigo_alterado_reconstroi(pasta):
+    completo = _base_upp([(2024, m) for m in range(1, 7)])
+    caminho = _gravar(completo, pasta / "upp.csv")
+    incremental.atualizar("upp", caminho)
+
+    completo.loc[0, "roubo_veiculo"] += 1
+    resumo = incremental.atualizar("upp", _gravar(completo, pasta / "upp.csv"))
+    assert resumo["modo"] == "reconstrucao"
+    assert "202401" in resumo["motivo"]
+    assert incremental.carregar_totais("upp")["roubo_veiculo"].sum() == completo["roubo_veiculo"].sum()
+
+
+def test_partes_pequenas_sao_juntadas(pasta, monkeypatch):
+    monkeypatch.setattr(incremental, "MAXIMO_PARTES", 3)
+    completo = _base_upp([(2024, m) for m in range(1, 13)], upps=("Borel",))
+    caminho = pasta / "upp.csv"
+    for ultimo in range(1, 13):
+        incremental.atualizar("upp", _gravar(completo[completo["mes"] <= ultimo], caminho))
+
+    # 12 meses de 1 linha: sem a junção seriam 12 partes
+    assert len(incremental._partes("upp")) <= incremental.MAXIMO_PARTES
+    base = incremental.carregar_base("upp")
+    assert sorted(base["mes"].tolist()) == list(range(1, 13))
+
+
+def test_download_de_url_gravado_em_arquivo(servidor, pasta):
+    corpo = _base_upp([(2024, 1), (2024, 2)]).to_csv(sep=";", index=False).encode("iso-8859-1")
+    servidor.rotas["/upp.csv"] = lambda requisicao: (200, {"ETag": '"v1"'}, corpo)
+
+    resumo = incremental.atualizar("upp", f"{servidor.url}/upp.csv")
+    assert resumo["linhas_total"] == 8
+    # O arquivo temporário do download não fica na pasta
+    assert sorted(p.name for p in (pasta / "incremental").iterdir()) == ["upp"]